@@ -8,9 +8,38 @@ cd /app
 npx @tailwindcss/cli \
    -i gastos_personales/static/css/src/input.css \
    -o gastos_personales/static/css/src/output.css \
+   --minify \
    || echo "Warning: CSS build fallido, la app carga igual via CDN"
 
 # Django desde su directorio para que manage.py resuelva paths correctamente
 cd /app/gastos_personales
+
+# SERVER_MODE elige cómo se sirve la app:
+#   dev (default) -> runserver con autoreload
+#   production    -> gunicorn (gunicorn.conf.py) con master.settings_production
+#   asgi          -> uvicorn sobre master.asgi (las lecturas async viven en /api/async/)
+SERVER_MODE="${SERVER_MODE:-dev}"
+
+if [ "$SERVER_MODE" = "production" ]; then
+    export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:-master.settings_production}"
+    # Estáticos con hash en el nombre + versiones .gz/.br (ver settings_production.py).
+    # input.css es la fuente de Tailwind (@import "tailwindcss"), no un asset
+    python manage.py collectstatic --noinput --ignore input.css
+fi
+
 python manage.py migrate
-exec python manage.py runserver 0.0.0.0:8000
+
+case "$SERVER_MODE" in
+    production)
+        exec gunicorn master.wsgi:application -c gunicorn.conf.py
+        ;;
+    asgi)
+        exec uvicorn master.asgi:application \
+            --host 0.0.0.0 --port 8000 \
+            --workers "${WEB_CONCURRENCY:-2}" \
+            --lifespan off
+        ;;
+    *)
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+esac
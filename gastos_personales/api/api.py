@@ -2,7 +2,12 @@ from ninja import NinjaAPI
 from apps.ingreso.api import router as ingreso_router
 from apps.gasto.api import router as gasto_router
 from apps.categoria.api import router as categoria_router
+from .async_api import router as async_router
+from .sync import router as sync_router
+from .bootstrap import router as bootstrap_router
+from .estadisticas import router as estadisticas_router
 from .auth import AuthBearer
+from .renderers import ORJSONRenderer
 
 # Crear la instancia principal de la API
 api = NinjaAPI(
@@ -10,7 +15,8 @@ api = NinjaAPI(
     version="1.0.0",
     description="API RESTful para gestionar gastos personales",
     docs_url="/docs",  # Swagger UI en /api/docs
-    auth=AuthBearer()
+    auth=AuthBearer(),
+    renderer=ORJSONRenderer(),
 )
 
 # Registrar los routers de cada modulo
@@ -18,6 +24,18 @@ api.add_router("/ingresos", ingreso_router)
 api.add_router("/gastos", gasto_router)
 api.add_router("/categorias", categoria_router)
 
+# Lecturas async (pensadas para servir bajo ASGI, ver master/asgi.py)
+api.add_router("/async", async_router)
+
+# Sincronización incremental para clientes offline
+api.add_router("/sync", sync_router)
+
+# Datos de arranque del cliente en una sola request
+api.add_router("/bootstrap", bootstrap_router)
+
+# Totales, saldo, variación y distribución calculados con agregados
+api.add_router("/estadisticas", estadisticas_router)
+
 @api.get("/health")
 def health_check(request):
     """Endpoint para verificar que la API está funcionando"""
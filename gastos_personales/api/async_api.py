@@ -0,0 +1,229 @@
+"""
+Endpoints de lectura async (list, detalle, estadísticas y tasas).
+
+Usan el ORM async de Django: bajo ASGI (uvicorn) cada worker atiende muchas
+lecturas concurrentes sin bloquear un hilo por request. La autenticación
+sync se ejecuta en un thread vía sync_to_async (lo hace Ninja), por eso
+acá se usa request.auth en lugar de request.user.
+
+Como en las rutas sync, las lecturas de datos del usuario responden con
+ETag y 304 (respuesta_condicional) y todas cuentan para el límite 'api'.
+"""
+from ninja import Router
+from ninja.decorators import decorate_view
+from typing import List, Optional
+from datetime import date
+from decimal import Decimal
+from asgiref.sync import sync_to_async
+from django.db.models import Sum
+from django.shortcuts import aget_object_or_404
+from apps.gasto.models import Gasto
+from apps.gasto.api import filtrar_gastos
+from apps.gasto.schemas import GastoOutSchema, SaldoSchema
+from apps.ingreso.models import Ingreso
+from apps.ingreso.api import filtrar_ingresos
+from apps.ingreso.schemas import IngresoOutSchema
+from apps.categoria.models import Categoria
+from apps.categoria.api import filtrar_categorias
+from apps.categoria.schemas import CategoriaOutSchema, CategoriaPaginatedResponse
+from apps.usuario.models import Moneda
+from apps.utils.archivo import obtener_con_archivo
+from apps.utils.currency_service import CurrencyService
+from apps.utils.limites import limitar
+from apps.utils.versionado import respuesta_condicional
+from .schemas import TasasSchema
+from .auth import session_auth, AuthBearer
+
+router = Router(tags=["Lecturas async"])
+
+
+async def _moneda_usuario(usuario):
+    """Abreviatura de la moneda del usuario sin acceder a la FK de forma sync."""
+    abreviatura = await Moneda.objects.filter(id=usuario.moneda_id).values_list(
+        'abreviatura', flat=True
+    ).afirst()
+    return abreviatura or 'ARS'
+
+
+def _version_saldo(request):
+    """Parte del ETag: el saldo es del mes en curso y depende de las tasas."""
+    return f'{date.today()}:{CurrencyService.rates_version()}'
+
+
+async def _total_mes_convertido(model, usuario, tasas, sin_convertir):
+    """
+    Total del mes actual agrupado por moneda en la base y convertido con un snapshot de tasas.
+    Los montos en monedas sin tasa no se suman (mezclar monedas falsearía el
+    saldo): la moneda se agrega a `sin_convertir`.
+    """
+    hoy = date.today()
+    filas = (
+        model.objects
+        .filter(usuario=usuario, fecha__year=hoy.year, fecha__month=hoy.month)
+        .values('moneda__abreviatura')
+        .annotate(total=Sum('monto'))
+        .order_by()
+    )
+    total = Decimal('0.00')
+    async for fila in filas:
+        abreviatura = fila['moneda__abreviatura'] or 'ARS'
+        tasa = tasas.get(abreviatura)
+        if not tasa:
+            sin_convertir.add(abreviatura)
+            continue
+        total += fila['total'] * tasa
+    return total
+
+
+# ==================== GASTOS ====================
+
+@router.get("/gastos/", response=List[GastoOutSchema], auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+async def listar_gastos_async(
+    request,
+    categoria: int = None,
+    fecha: str = None,
+    year: int = None,
+    search: str = None,
+    ordering: str = "-fecha"
+):
+    """Versión async de GET /api/gastos/."""
+    # sync_to_async: decidir si se lee el archivo puede consultar la base
+    queryset = await sync_to_async(filtrar_gastos)(request.auth, categoria, fecha, year, search, ordering)
+    return [gasto async for gasto in queryset]
+
+
+@router.get("/gastos/{gasto_id}", response=GastoOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+async def obtener_gasto_async(request, gasto_id: int):
+    """Versión async de GET /api/gastos/{id}."""
+    # Como la versión sync, también busca en el archivo
+    gasto, _ = await sync_to_async(obtener_con_archivo)(
+        Gasto, 'categoria', 'moneda', 'usuario', id=gasto_id, usuario=request.auth
+    )
+    return gasto
+
+
+# ==================== INGRESOS ====================
+
+@router.get("/ingresos/", response=List[IngresoOutSchema], auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+async def listar_ingresos_async(
+    request,
+    fuente: int = None,
+    fecha: str = None,
+    search: str = None,
+    ordering: str = "-fecha"
+):
+    """Versión async de GET /api/ingresos/."""
+    queryset = await sync_to_async(filtrar_ingresos)(request.auth, fuente, fecha, search, ordering)
+    return [ingreso async for ingreso in queryset]
+
+
+@router.get("/ingresos/{ingreso_id}", response=IngresoOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+async def obtener_ingreso_async(request, ingreso_id: int):
+    """Versión async de GET /api/ingresos/{id}."""
+    # Como la versión sync, también busca en el archivo
+    ingreso, _ = await sync_to_async(obtener_con_archivo)(
+        Ingreso, 'fuente', 'moneda', 'usuario', id=ingreso_id, usuario=request.auth
+    )
+    return ingreso
+
+
+# ==================== CATEGORIAS ====================
+
+@router.get("/categorias/", response=CategoriaPaginatedResponse, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+async def listar_categorias_async(
+    request,
+    nombre: Optional[str] = None,
+    icono: Optional[str] = None,
+    color: Optional[str] = None,
+    pageIndex: int = 0,
+    pageSize: int = 10
+):
+    """Versión async de GET /api/categorias/."""
+    queryset = filtrar_categorias(request.auth, nombre, icono, color)
+    total = await queryset.acount()
+
+    start = pageIndex * pageSize
+    items = [
+        CategoriaOutSchema(
+            id=c.id,
+            nombre=c.nombre,
+            icono=c.icono.icono if c.icono else None,
+            color=c.color.nombre if c.color else None
+        )
+        async for c in queryset[start:start + pageSize]
+    ]
+
+    return {
+        "items": items,
+        "total": total,
+        "totalPages": (total // pageSize) + (1 if total % pageSize else 0),
+        "pageIndex": pageIndex,
+        "pageSize": pageSize
+    }
+
+
+@router.get("/categorias/{categoria_id}", response=CategoriaOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+async def obtener_categoria_async(request, categoria_id: int):
+    """Versión async de GET /api/categorias/{id}."""
+    categoria = await aget_object_or_404(
+        Categoria.objects.select_related("icono", "color"),
+        id=categoria_id,
+        usuario=request.auth
+    )
+    return {
+        "id": categoria.id,
+        "nombre": categoria.nombre,
+        "icono": categoria.icono.icono if categoria.icono else None,
+        "color": categoria.color.codigo_hex if categoria.color else None
+    }
+
+
+# ==================== ESTADISTICAS Y TASAS ====================
+
+@router.get("/estadisticas/saldo", response=SaldoSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional(extra=_version_saldo))
+async def saldo_mensual_async(request):
+    """
+    Saldo del mes actual (ingresos - gastos) en la moneda del usuario.
+    Se resuelve con dos agregados agrupados por moneda. Las monedas sin tasa
+    quedan fuera de los totales y se informan en `sin_convertir`.
+    """
+    usuario = request.auth
+    moneda = await _moneda_usuario(usuario)
+    tasas = await sync_to_async(CurrencyService.get_rates_snapshot)(moneda)
+
+    sin_convertir = set()
+    total_ingresos = await _total_mes_convertido(Ingreso, usuario, tasas, sin_convertir)
+    total_gastos = await _total_mes_convertido(Gasto, usuario, tasas, sin_convertir)
+
+    return {
+        'total_ingresos': float(total_ingresos),
+        'total_gastos': float(total_gastos),
+        'saldo_restante': float(total_ingresos - total_gastos),
+        'moneda': moneda,
+        'sin_convertir': sorted(sin_convertir),
+    }
+
+
+@router.get("/tasas", response=TasasSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+async def tasas_async(request):
+    """Tasas de cambio vigentes desde ARS (cacheadas por CurrencyService)."""
+    rates = await sync_to_async(CurrencyService.get_all_rates)()
+    return {
+        'base': 'ARS',
+        'tasas': {moneda: float(tasa) for moneda, tasa in rates.items()}
+    }
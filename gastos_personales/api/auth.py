@@ -1,22 +1,30 @@
 from ninja.security import HttpBearer
-from django.contrib.auth import get_user_model
-from django.contrib.auth.models import AnonymousUser
+from apps.usuario.models import ApiToken
+from apps.utils.api_tokens import verificar_token
+
+METODOS_LECTURA = ('GET', 'HEAD', 'OPTIONS')
 
-User = get_user_model()
 
 class AuthBearer(HttpBearer):
     """
-    Autenticación basada en Token Bearer.
+    Autenticación basada en Token Bearer (ApiToken).
     El token debe enviarse en el header: Authorization: Bearer <token>
+    Las lecturas requieren el scope 'read' y las escrituras 'write',
+    salvo que se indique otro scope explícitamente.
     """
+    def __init__(self, scope=None):
+        super().__init__()
+        self.scope = scope
+
     def authenticate(self, request, token):
-        try:
-            user = User.objects.filter(auth_token__key=token).first()
-            if user:
-                return user
-        except:
-            pass
-        return None
+        scope = self.scope or (
+            ApiToken.SCOPE_READ if request.method in METODOS_LECTURA else ApiToken.SCOPE_WRITE
+        )
+        usuario = verificar_token(token, scope)
+        if usuario:
+            # Los endpoints leen el usuario de request.user, igual que con sesión
+            request.user = usuario
+        return usuario
 
 
 class SessionAuth:
@@ -25,4 +33,4 @@ class SessionAuth:
             return request.user
         return None
 
-session_auth =  SessionAuth()
\ No newline at end of file
+session_auth =  SessionAuth()
@@ -0,0 +1,80 @@
+"""
+Datos de arranque del cliente en un solo round-trip (GET /api/bootstrap).
+
+Categorías (con color e ícono), fuentes, monedas, moneda preferida, tasas
+vigentes y la primera página de gastos e ingresos recientes. Siempre son
+cinco consultas proyectadas con values_list() (más sesión/usuario y la
+versión de datos del ETag), sin importar cuántos datos tenga el usuario.
+"""
+from ninja import Router
+from ninja.decorators import decorate_view
+from apps.gasto.models import Gasto
+from apps.gasto.schemas import GASTO_OUT_CAMPOS
+from apps.ingreso.models import Ingreso, Fuente
+from apps.ingreso.schemas import INGRESO_OUT_CAMPOS
+from apps.categoria.models import Categoria
+from apps.usuario.models import Moneda
+from apps.utils.currency_service import CurrencyService
+from apps.utils.limites import limitar
+from apps.utils.serializacion import proyectar
+from apps.utils.sincronizacion import FUENTE_SYNC_CAMPOS
+from apps.utils.versionado import respuesta_condicional
+from .schemas import BootstrapSchema
+from .auth import session_auth, AuthBearer
+
+router = Router(tags=["Bootstrap"])
+
+BOOTSTRAP_RECIENTES = 20
+
+CATEGORIA_BOOTSTRAP_CAMPOS = {
+    'id': 'id',
+    'nombre': 'nombre',
+    'color': 'color__nombre',
+    'color_hex': 'color__codigo_hex',
+    'icono': 'icono__icono',
+}
+MONEDA_BOOTSTRAP_CAMPOS = {
+    'id': 'id',
+    'moneda': 'moneda',
+    'abreviatura': 'abreviatura',
+}
+
+
+def _version_tasas(request):
+    """Parte del ETag: las tasas cambian sin que cambien los datos del usuario."""
+    return CurrencyService.rates_version()
+
+
+@router.get("", response=BootstrapSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional(extra=_version_tasas))
+def bootstrap(request):
+    """
+    Devuelve todo lo que el cliente necesita para el primer render.
+    Los gastos e ingresos son los BOOTSTRAP_RECIENTES más recientes; el resto
+    se pide con /api/gastos/ y /api/ingresos/.
+    """
+    usuario = request.user
+    monedas = proyectar(Moneda.objects.filter(usuario=usuario).order_by('id'), MONEDA_BOOTSTRAP_CAMPOS)
+
+    datos = {
+        'moneda': next((m['abreviatura'] for m in monedas if m['id'] == usuario.moneda_id), None),
+        'tasas': {
+            'base': 'ARS',
+            'tasas': {moneda: float(tasa) for moneda, tasa in CurrencyService.get_all_rates().items()},
+        },
+        'categorias': proyectar(
+            Categoria.objects.filter(usuario=usuario).order_by('nombre'), CATEGORIA_BOOTSTRAP_CAMPOS
+        ),
+        'fuentes': proyectar(Fuente.objects.filter(usuario=usuario).order_by('nombre'), FUENTE_SYNC_CAMPOS),
+        'monedas': monedas,
+        'gastos': proyectar(
+            Gasto.objects.filter(usuario=usuario).order_by('-fecha', '-id')[:BOOTSTRAP_RECIENTES],
+            GASTO_OUT_CAMPOS,
+        ),
+        'ingresos': proyectar(
+            Ingreso.objects.filter(usuario=usuario).order_by('-fecha', '-id')[:BOOTSTRAP_RECIENTES],
+            INGRESO_OUT_CAMPOS,
+        ),
+    }
+    return router.api.create_response(request, datos, status=200)
@@ -0,0 +1,95 @@
+"""
+Estadísticas en la moneda del usuario (ver apps/utils/estadisticas.py).
+
+Todas se resuelven con consultas agregadas y los resúmenes mensuales del
+archivo: el cliente ya no necesita descargar el historial para calcularlas.
+"""
+from datetime import date
+from typing import Literal
+from ninja import Router
+from ninja.decorators import decorate_view
+from apps.gasto.models import Gasto
+from apps.gasto.schemas import SaldoSchema
+from apps.ingreso.models import Ingreso
+from apps.utils import estadisticas
+from apps.utils.currency_service import CurrencyService
+from apps.utils.limites import limitar
+from apps.utils.versionado import respuesta_condicional
+from .schemas import EstadisticaTotalSchema, VariacionMensualSchema, DistribucionSchema
+from .auth import session_auth, AuthBearer
+
+router = Router(tags=["Estadísticas"])
+
+MODELOS = {'gastos': Gasto, 'ingresos': Ingreso}
+
+
+def _moneda_usuario(usuario):
+    return usuario.moneda.abreviatura if usuario.moneda_id else 'ARS'
+
+
+def _version_estadisticas(request):
+    """Parte del ETag: los montos dependen de las tasas y la variación del mes en curso."""
+    return f'{date.today()}:{CurrencyService.rates_version()}'
+
+
+condicional = decorate_view(respuesta_condicional(extra=_version_estadisticas))
+
+
+@router.get("/total", response=EstadisticaTotalSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@condicional
+def total(request, tipo: Literal["gastos", "ingresos"] = "gastos", year: int = None, mes: int = None):
+    """
+    Total y cantidad de gastos o ingresos, de todo el historial o de un año/mes.
+
+    Parámetros de consulta:
+    - tipo: gastos | ingresos
+    - year / mes: Período (opcionales)
+    """
+    moneda = _moneda_usuario(request.user)
+    resultado = estadisticas.total(MODELOS[tipo], request.user, moneda, year, mes)
+    return {'tipo': tipo, 'moneda': moneda, **resultado}
+
+
+@router.get("/saldo", response=SaldoSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@condicional
+def saldo(request, year: int = None, mes: int = None):
+    """
+    Saldo restante (ingresos - gastos), de todo el historial o de un año/mes.
+    """
+    moneda = _moneda_usuario(request.user)
+    ingresos = estadisticas.total(Ingreso, request.user, moneda, year, mes)
+    gastos = estadisticas.total(Gasto, request.user, moneda, year, mes)
+    return {
+        'total_ingresos': ingresos['total'],
+        'total_gastos': gastos['total'],
+        'saldo_restante': ingresos['total'] - gastos['total'],
+        'moneda': moneda,
+        'sin_convertir': sorted(ingresos['sin_convertir'] | gastos['sin_convertir']),
+    }
+
+
+@router.get("/variacion", response=VariacionMensualSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@condicional
+def variacion(request, tipo: Literal["gastos", "ingresos"] = "gastos"):
+    """
+    Total del mes actual, del anterior y su variación porcentual.
+    """
+    moneda = _moneda_usuario(request.user)
+    resultado = estadisticas.variacion_mensual(MODELOS[tipo], request.user, moneda)
+    return {'tipo': tipo, 'moneda': moneda, **resultado}
+
+
+@router.get("/distribucion", response=DistribucionSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@condicional
+def distribucion(request, tipo: Literal["gastos", "ingresos"] = "gastos", year: int = None, mes: int = None):
+    """
+    Total por categoría (gastos) o fuente (ingresos) con su porcentaje,
+    de mayor a menor.
+    """
+    moneda = _moneda_usuario(request.user)
+    resultado = estadisticas.distribucion(MODELOS[tipo], request.user, moneda, year, mes)
+    return {'tipo': tipo, 'moneda': moneda, **resultado}
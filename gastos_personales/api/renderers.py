@@ -0,0 +1,21 @@
+"""
+Renderer JSON basado en orjson (registrado en api/api.py).
+
+orjson serializa en C dicts, listas, fechas y strings; lo que no conoce
+(Decimal, modelos pydantic, etc.) pasa por el mismo encoder que usa Ninja
+por defecto, así la salida es la misma que con el JSONRenderer estándar
+(los Decimal siguen saliendo como string).
+"""
+import orjson
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+
+    def __init__(self):
+        self._default = NinjaJSONEncoder().default
+
+    def render(self, request, data, *, response_status):
+        return orjson.dumps(data, default=self._default, option=orjson.OPT_UTC_Z)
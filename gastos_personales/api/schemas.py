@@ -0,0 +1,102 @@
+from ninja import Schema
+from typing import Dict, List, Optional
+from apps.gasto.schemas import GastoOutSchema
+from apps.ingreso.schemas import IngresoOutSchema, FuenteOutSchema
+from apps.categoria.schemas import CategoriaOutSchema
+
+
+# Schema para el detalle de una fila con error en una importación
+class ImportacionErrorSchema(Schema):
+    fila: int
+    error: str
+
+# Schema para el resultado de una importación de extracto
+class ImportacionResultSchema(Schema):
+    procesadas: int
+    creadas: int
+    duplicadas: int
+    errores: List[ImportacionErrorSchema]
+
+# Schema para el resultado de cada operación de un lote
+class BatchItemResultSchema(Schema):
+    indice: int
+    op: str
+    id: Optional[int] = None
+    ok: bool
+    error: Optional[str] = None
+
+# Schema para las tasas de cambio vigentes
+class TasasSchema(Schema):
+    base: str
+    tasas: Dict[str, float]
+
+# Schema para los ids eliminados por entidad en una sincronización
+class SyncEliminadosSchema(Schema):
+    gastos: List[int]
+    ingresos: List[int]
+    categorias: List[int]
+    fuentes: List[int]
+
+# Schema de GET /api/sync (las filas se renderizan ya proyectadas, sin validar)
+class SyncSchema(Schema):
+    cursor: str
+    completo: bool
+    gastos: List[GastoOutSchema]
+    ingresos: List[IngresoOutSchema]
+    categorias: List[CategoriaOutSchema]
+    fuentes: List[FuenteOutSchema]
+    eliminados: SyncEliminadosSchema
+
+# Categoría con color e ícono resueltos (GET /api/bootstrap)
+class BootstrapCategoriaSchema(Schema):
+    id: int
+    nombre: str
+    color: Optional[str] = None
+    color_hex: Optional[str] = None
+    icono: Optional[str] = None
+
+# Moneda del usuario (GET /api/bootstrap)
+class BootstrapMonedaSchema(Schema):
+    id: int
+    moneda: str
+    abreviatura: str
+
+# Schema de GET /api/bootstrap (las filas se renderizan ya proyectadas, sin validar)
+class BootstrapSchema(Schema):
+    moneda: Optional[str] = None
+    tasas: TasasSchema
+    categorias: List[BootstrapCategoriaSchema]
+    fuentes: List[FuenteOutSchema]
+    monedas: List[BootstrapMonedaSchema]
+    gastos: List[GastoOutSchema]
+    ingresos: List[IngresoOutSchema]
+
+# Schema para el total de gastos o ingresos (GET /api/estadisticas/total)
+class EstadisticaTotalSchema(Schema):
+    tipo: str
+    total: float
+    cantidad: int
+    moneda: Optional[str] = None
+
+# Schema para la variación mensual (GET /api/estadisticas/variacion)
+class VariacionMensualSchema(Schema):
+    tipo: str
+    total_mes_actual: float
+    total_mes_anterior: float
+    variacion_porcentual: float
+    moneda: Optional[str] = None
+
+# Schema para cada categoría/fuente de una distribución
+class DistribucionItemSchema(Schema):
+    id: Optional[int] = None  # None: sin categoría/fuente
+    nombre: str
+    total: float
+    cantidad: int
+    porcentaje: float
+
+# Schema para la distribución por categoría o fuente (GET /api/estadisticas/distribucion)
+class DistribucionSchema(Schema):
+    tipo: str
+    total: float
+    moneda: Optional[str] = None
+    items: List[DistribucionItemSchema]
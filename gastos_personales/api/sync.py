@@ -0,0 +1,25 @@
+"""
+Sincronización incremental para clientes offline (ver apps/utils/sincronizacion.py).
+"""
+from ninja import Router
+from ninja.decorators import decorate_view
+from apps.utils.limites import limitar
+from apps.utils.sincronizacion import cambios_desde
+from .schemas import SyncSchema
+from .auth import session_auth, AuthBearer
+
+router = Router(tags=["Sincronización"])
+
+
+@router.get("", response=SyncSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api_pesada'))
+def sincronizar(request, since: str = None):
+    """
+    Devuelve los gastos, ingresos, categorías y fuentes modificados desde `since`
+    y los ids eliminados. Sin `since` (o con un cursor vencido) devuelve todo
+    con `completo: true`.
+
+    Parámetros de consulta:
+    - since: Cursor devuelto por la sincronización anterior
+    """
+    return router.api.create_response(request, cambios_desde(request.user, since), status=200)
@@ -1,4 +1,6 @@
 from ninja import Router
+from ninja.decorators import decorate_view
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from .models import Categoria , Icono, Color
 from .schemas import (
@@ -11,22 +13,24 @@ from api.auth import AuthBearer
 from typing import Optional
 from typing import Optional
 from math import ceil
-from .schemas import CategoriaPaginatedResponse
+from .schemas import CategoriaPaginatedResponse, CategoriaBatchSchema
+from types import SimpleNamespace
+from typing import List
+from api.schemas import BatchItemResultSchema
+from apps.utils.batch import aplicar_lote
+from apps.utils.versionado import agrupar_versiones, marcar_cambio, respuesta_condicional
+from apps.utils.limites import limitar
+from apps.utils.idempotencia import idempotente
 
 router = Router(tags=["Categorias"])
 
 
-# ==================== LISTAR ====================
-@router.get("/", response=CategoriaPaginatedResponse, auth=[session_auth, AuthBearer()])
-def listar_categorias(
-    request,
-    nombre: Optional[str] = None,
-    icono: Optional[str] = None,
-    color: Optional[str] = None,
-    pageIndex: int = 0,
-    pageSize: int = 10
-):
-    queryset = Categoria.objects.filter(usuario=request.user).select_related(
+def filtrar_categorias(usuario, nombre=None, icono=None, color=None):
+    """
+    Construye el queryset de categorías del usuario con los filtros de la API.
+    Compartido entre los endpoints sync y async.
+    """
+    queryset = Categoria.objects.filter(usuario=usuario).select_related(
         "icono", "color"
     )
 
@@ -39,6 +43,23 @@ def listar_categorias(
     if color:
         queryset = queryset.filter(color__nombre__icontains=color)
 
+    return queryset
+
+
+# ==================== LISTAR ====================
+@router.get("/", response=CategoriaPaginatedResponse, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+def listar_categorias(
+    request,
+    nombre: Optional[str] = None,
+    icono: Optional[str] = None,
+    color: Optional[str] = None,
+    pageIndex: int = 0,
+    pageSize: int = 10
+):
+    queryset = filtrar_categorias(request.user, nombre, icono, color)
+
     total = queryset.count()
 
     start = pageIndex * pageSize
@@ -64,8 +85,70 @@ def listar_categorias(
     }
 
 
+# ==================== LOTE ====================
+@router.post("/batch", response=List[BatchItemResultSchema], auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api_pesada'))
+@decorate_view(idempotente)
+def lote_categorias(request, payload: CategoriaBatchSchema):
+    """
+    Aplica un lote de operaciones (create / update / delete) en una sola transacción.
+    Los íconos y colores se resuelven por nombre (o se crean) en bloque antes de
+    aplicar el lote. Como en actualizar_categoria, un color existente se reutiliza
+    tal cual: son compartidos entre usuarios y el lote no modifica su hex.
+    """
+    operaciones = payload.operaciones
+
+    with agrupar_versiones(), transaction.atomic():
+        # Íconos: una consulta para los existentes, un bulk_create para los nuevos
+        iconos_pedidos = {op.icono for op in operaciones if op.icono}
+        iconos = dict(Icono.objects.filter(icono__in=iconos_pedidos).values_list("icono", "id"))
+        nuevos_iconos = [Icono(icono=icono) for icono in iconos_pedidos - iconos.keys()]
+        for icono in Icono.objects.bulk_create(nuevos_iconos):
+            iconos[icono.icono] = icono.id
+
+        # Colores: se identifican por nombre; el hex solo se usa al crearlos
+        colores_pedidos = {
+            op.color_nombre: op.color_hex
+            for op in operaciones if op.color_nombre and op.color_hex
+        }
+        colores = dict(Color.objects.filter(nombre__in=colores_pedidos.keys()).values_list("nombre", "id"))
+        nuevos_colores = [
+            Color(nombre=nombre, codigo_hex=hex_)
+            for nombre, hex_ in colores_pedidos.items() if nombre not in colores
+        ]
+        for color in Color.objects.bulk_create(nuevos_colores):
+            colores[color.nombre] = color.id
+
+        # bulk_create no emite las señales de los datos compartidos
+        if nuevos_iconos or nuevos_colores:
+            marcar_cambio(None)
+
+        resueltas = [
+            SimpleNamespace(
+                op=op.op,
+                id=op.id,
+                nombre=op.nombre,
+                icono_id=iconos.get(op.icono),
+                color_id=colores.get(op.color_nombre),
+            )
+            for op in operaciones
+        ]
+
+        return aplicar_lote(
+            request.user,
+            resueltas,
+            Categoria,
+            campos={"nombre": "nombre", "icono_id": "icono_id", "color_id": "color_id"},
+            requeridos=["nombre"],
+            valores_fijos={"usuario": request.user},
+        )
+
+
+
 # ==================== OBTENER DETALLE ====================
 @router.get("/{categoria_id}", response=CategoriaOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
 def obtener_categoria(request, categoria_id: int):
     """
     Obtiene una categoría específica del usuario autenticado.
@@ -82,6 +165,8 @@ def obtener_categoria(request, categoria_id: int):
 
 # ==================== CREAR ====================
 @router.post("/", response=CategoriaOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(idempotente)
 def crear_categoria(request, payload: CategoriaCreateSchema):
     """
     Crea una categoría y sus relaciones (icono y color).
@@ -119,6 +204,7 @@ def crear_categoria(request, payload: CategoriaCreateSchema):
 
 # ==================== ACTUALIZAR ====================
 @router.put("/{categoria_id}", response=CategoriaOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
 def actualizar_categoria(request, categoria_id: int, payload: CategoriaUpdateSchema):
     """
     Actualiza una categoría existente del usuario autenticado.
@@ -159,6 +245,7 @@ def actualizar_categoria(request, categoria_id: int, payload: CategoriaUpdateSch
 
 # ==================== ELIMINAR ====================
 @router.delete("/{categoria_id}", auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
 def eliminar_categoria(request, categoria_id: int):
     """
     Elimina una categoría del usuario autenticado.
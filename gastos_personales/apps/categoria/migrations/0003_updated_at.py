@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categoria', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categoria',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -7,6 +7,7 @@ class Categoria(models.Model):
     usuario = models.ForeignKey('usuario.Usuario', on_delete=models.CASCADE , null=True, blank=True)
     color = models.ForeignKey('Color', on_delete=models.SET_NULL, null=True, blank=True)
     icono = models.ForeignKey('Icono', on_delete=models.SET_NULL, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.nombre
@@ -1,7 +1,8 @@
 # schemas.py
 from ninja import Schema
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from apps.utils.batch import MAX_OPERACIONES_LOTE
 
 class CategoriaCreateSchema(Schema):
     nombre: str
@@ -28,4 +29,16 @@ class CategoriaPaginatedResponse(BaseModel):
     total: int
     totalPages: int
     pageIndex: int
-    pageSize: int
\ No newline at end of file
+    pageSize: int
+
+class CategoriaBatchOperationSchema(Schema):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    nombre: Optional[str] = None
+    icono: Optional[str] = None
+    color_nombre: Optional[str] = None
+    color_hex: Optional[str] = None
+
+
+class CategoriaBatchSchema(Schema):
+    operaciones: List[CategoriaBatchOperationSchema] = Field(..., max_length=MAX_OPERACIONES_LOTE)
@@ -1,3 +1,43 @@
-from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from apps.categoria.models import Categoria, Color
+from apps.utils.versionado import version_compartida, version_datos
+from apps.utils.tests.base import ApiTestCase
 
-# Create your tests here.
+
+class CategoriaListViewTests(ApiTestCase):
+    def test_paginacion_por_cursor_nombre_e_id(self):
+        for i in range(12):
+            Categoria.objects.create(usuario=self.user, nombre=f'Extra {i:02d}')
+        nombres = list(Categoria.objects.filter(usuario=self.user).order_by('nombre', 'id').values_list('nombre', flat=True))
+        response = self.client.get(reverse('categorias'))
+        cursor = response.context['page_obj'].cursor_siguiente
+        response = self.client.get(reverse('categorias'), {'cursor': cursor, 'fragmento': 'tabla'})
+        self.assertTemplateUsed(response, 'categoria/categoria_tabla.html')
+        self.assertEqual([c['nombre'] for c in response.context['categorias']], nombres[10:20])
+
+
+class CategoriaLoteTests(ApiTestCase):
+    def test_lote_no_modifica_colores_compartidos(self):
+        rojo = Color.objects.create(nombre='Rojo', codigo_hex='#FF0000')
+        otro = get_user_model().objects.create_user(username='otro_color', password='12345')
+        Categoria.objects.create(usuario=otro, nombre='Auto', color=rojo)
+        version_otro = version_datos(otro.id)[0]
+        compartida = version_compartida()[0]
+
+        response = self.client.post('/api/categorias/batch', {
+            'operaciones': [
+                {'op': 'create', 'nombre': 'Ropa', 'icono': 'shirt', 'color_nombre': 'Rojo', 'color_hex': '#00FF00'},
+                {'op': 'create', 'nombre': 'Cine', 'icono': 'film', 'color_nombre': 'Violeta', 'color_hex': '#8000FF'},
+            ]
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['ok'] for r in response.json()], [True, True])
+
+        rojo.refresh_from_db()
+        self.assertEqual(rojo.codigo_hex, '#FF0000')
+        self.assertEqual(Categoria.objects.get(usuario=self.user, nombre='Ropa').color, rojo)
+        self.assertEqual(Categoria.objects.get(usuario=self.user, nombre='Cine').color.codigo_hex, '#8000FF')
+        # Se creó un color compartido: cambia la versión compartida, no la de cada usuario
+        self.assertGreater(version_compartida()[0], compartida)
+        self.assertEqual(version_datos(otro.id)[0], version_otro)
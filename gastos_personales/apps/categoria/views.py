@@ -3,13 +3,15 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.http import JsonResponse
 from django.shortcuts import redirect
 from decimal import Decimal
-from django.db.models import Q
 from .models import Categoria
 from .forms import CategoriaForm
 from django.urls import reverse_lazy
 from django.db.models import Sum
 from apps.utils.calculations import procesar_categorias
 from apps.utils.currency_mixins import CurrencyConversionMixin
+from apps.utils.filters import aplicar_busqueda
+from apps.utils.fragmentos import FragmentoListMixin
+from apps.utils.paginacion import KeysetPaginationMixin
 
 
 class UserCategoriaQuerysetMixin:
@@ -19,20 +21,23 @@ class UserCategoriaQuerysetMixin:
         return Categoria.objects.filter(usuario=self.request.user)
 
 
-class CategoriaListView(LoginRequiredMixin, UserCategoriaQuerysetMixin, CurrencyConversionMixin, ListView):
+class CategoriaListView(LoginRequiredMixin, UserCategoriaQuerysetMixin, FragmentoListMixin, KeysetPaginationMixin, CurrencyConversionMixin, ListView):
     model = Categoria
     template_name = 'categoria/categoria.html'
+    fragment_template_name = 'categoria/categoria_tabla.html'
     context_object_name = 'categorias'
     paginate_by = 10
+    keyset_ordering = ('nombre', 'id')
 
     def get_queryset(self):
+        # Página pedida por cursor (keyset)
+        return self.aplicar_cursor(self._filtrar()).order_by(*self.keyset_ordering)
+
+    def _filtrar(self):
+        """Categorías del usuario con la búsqueda aplicada (sin cursor)."""
         qs = super().get_queryset().select_related('icono', 'color')
-        search = self.request.GET.get('search', '').strip()
-        if search:
-            qs = qs.filter(
-                Q(nombre__icontains=search) | Q(descripcion__icontains=search)
-            )
-        return qs
+        # Pocas filas por usuario: sin índice de texto (icontains)
+        return aplicar_busqueda(qs, self.request, ['nombre', 'descripcion'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -43,8 +48,12 @@ class CategoriaListView(LoginRequiredMixin, UserCategoriaQuerysetMixin, Currency
         # Procesar solo la página actual (ya paginada por ListView)
         context["categorias"] = procesar_categorias(list(context["categorias"]))
 
+        # Filtro o página nueva: solo la tabla, sin el top del mes
+        if self.es_fragmento():
+            return context
+
         # Top categorías usa el queryset completo filtrado (no paginado)
-        full_qs = self.get_queryset()
+        full_qs = self._filtrar()
         top_categorias_qs = (
             full_qs
             .annotate(total=Sum('gasto__monto'))
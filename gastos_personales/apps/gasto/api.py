@@ -1,29 +1,101 @@
-from ninja import Router
-from typing import List
-from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from .models import Gasto
+from ninja import Router, File
+from ninja.files import UploadedFile
+from ninja.decorators import decorate_view
+from ninja.errors import HttpError
+from typing import List, Literal
+from datetime import date
+from .models import Gasto, GastoArchivado
+from apps.categoria.models import Categoria
 from .schemas import (
     GastoCreateSchema,
     GastoUpdateSchema,
     GastoOutSchema,
+    GastoBatchSchema,
+    GASTO_OUT_CAMPOS,
+    GASTO_COLUMNAS,
+    GASTO_DICCIONARIOS,
 )
+from api.schemas import ImportacionResultSchema, BatchItemResultSchema
 from api.auth import session_auth
 from api.auth import AuthBearer
+from apps.utils.currency_service import CurrencyService
+from apps.utils.export import exportar_queryset
+from apps.utils.importacion import leer_extracto, importar_transacciones
+from apps.utils.batch import aplicar_lote
+from apps.utils.busqueda import ORDEN_RELEVANCIA, buscar, ordenar_por_relevancia
+from apps.utils.archivo import alcanza_archivo, obtener_con_archivo, unir_archivo
+from apps.utils.versionado import respuesta_condicional
+from apps.utils.limites import limitar
+from apps.utils.idempotencia import idempotente
+from apps.utils.serializacion import (
+    campos_pedidos,
+    columnar,
+    fast_path_activo,
+    formato_columnar,
+    respuesta_columnar,
+    respuesta_proyectada,
+)
 
 # Crear router para gastos
 router = Router(tags=["Gastos"])
 
 # ==================== ENDPOINTS DE GASTOS ====================
 
+def filtrar_gastos(usuario, categoria=None, fecha=None, year=None, search=None, ordering="-fecha"):
+    """
+    Construye el queryset de gastos del usuario con los filtros de la API.
+    Compartido entre los endpoints sync y async.
+    Incluye los gastos archivados solo si el filtro de fechas llega a ese rango.
+    """
+    def filtrar(model):
+        queryset = model.objects.filter(usuario=usuario).select_related(
+            'categoria', 'moneda', 'usuario'
+        )
+        
+        # Aplicar filtros
+        if categoria:
+            queryset = queryset.filter(categoria_id=categoria)
+        
+        if fecha:
+            queryset = queryset.filter(fecha=fecha)
+        
+        if year:
+            queryset = queryset.filter(fecha__year=year)
+        
+        if search:
+            queryset = buscar(queryset, search, ['descripcion', 'categoria__nombre'])
+        return queryset
+    
+    queryset = filtrar(Gasto)
+    
+    # La relevancia sale del índice de búsqueda, que el archivo no tiene
+    relevancia = ordering == ORDEN_RELEVANCIA
+    if relevancia:
+        ordering = "-fecha"
+    
+    if alcanza_archivo(GastoArchivado, fecha=fecha, year=year):
+        return unir_archivo(queryset, filtrar(GastoArchivado), ordering)
+    
+    if relevancia and search:
+        return ordenar_por_relevancia(queryset, search, ordering, "-id")
+    
+    # Aplicar ordenamiento
+    queryset = queryset.order_by(ordering)
+    
+    return queryset
+
+
 @router.get("/", response=List[GastoOutSchema], auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
 def listar_gastos(
     request,
     categoria: int = None,
     fecha: str = None,
     year: int = None,
     search: str = None,
-    ordering: str = "-fecha"
+    ordering: str = "-fecha",
+    fields: str = None
 ):
     """
     Lista todos los gastos del usuario autenticado.
@@ -33,49 +105,156 @@ def listar_gastos(
     - fecha: Filtrar por fecha exacta (formato: YYYY-MM-DD)
     - year: Filtrar por año
     - search: Buscar en descripción
-    - ordering: Ordenar resultados (fecha, -fecha, monto, -monto)
+    - ordering: Ordenar resultados (fecha, -fecha, monto, -monto, o relevancia junto con search)
+    - fields: Campos a devolver separados por comas (p. ej. id,fecha,monto)
+
+    Con `Accept: application/vnd.spendwise.columnar+json` (o application/x-msgpack)
+    responde en formato columnar: una lista por columna, montos en centavos y
+    los nombres en tablas {id: nombre}. En ese formato `fields` no aplica.
     """
-    queryset = Gasto.objects.filter(usuario=request.user).select_related(
-        'categoria', 'moneda', 'usuario'
-    )
-    
-    # Aplicar filtros
-    if categoria:
-        queryset = queryset.filter(categoria_id=categoria)
+    seleccion = campos_pedidos(fields, GASTO_OUT_CAMPOS)
+    queryset = filtrar_gastos(request.user, categoria, fecha, year, search, ordering)
+
+    formato = formato_columnar(request)
+    if formato:
+        datos = columnar(queryset, GASTO_COLUMNAS, GASTO_DICCIONARIOS)
+        return respuesta_columnar(router, request, datos, formato)
+
+    if seleccion or fast_path_activo():
+        return respuesta_proyectada(router, request, queryset, seleccion or GASTO_OUT_CAMPOS)
+    return list(queryset)
+
+
+@router.get("/export", auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api_pesada'))
+def exportar_gastos(
+    request,
+    formato: Literal["csv", "ndjson"] = "csv",
+    convertir: bool = False,
+    categoria: int = None,
+    desde: date = None,
+    hasta: date = None
+):
+    """
+    Exporta el historial de gastos del usuario en streaming (CSV o NDJSON).
     
-    if fecha:
-        queryset = queryset.filter(fecha=fecha)
+    Parámetros de consulta:
+    - formato: csv o ndjson
+    - convertir: Agrega la columna monto_convertido en la moneda del usuario
+    - categoria: Filtrar por ID de categoría
+    - desde / hasta: Rango de fechas (inclusive); si llega al rango archivado
+      también se exportan los gastos archivados
+    """
+    def filtrar(model):
+        queryset = model.objects.filter(usuario=request.user)
+        
+        if categoria:
+            queryset = queryset.filter(categoria_id=categoria)
+        if desde:
+            queryset = queryset.filter(fecha__gte=desde)
+        if hasta:
+            queryset = queryset.filter(fecha__lte=hasta)
+        return queryset
     
-    if year:
-        queryset = queryset.filter(fecha__year=year)
+    queryset = filtrar(Gasto)
+    if alcanza_archivo(GastoArchivado, desde=desde, hasta=hasta):
+        queryset = unir_archivo(queryset, filtrar(GastoArchivado))
     
-    if search:
-        queryset = queryset.filter(
-            Q(descripcion__icontains=search) | 
-            Q(categoria__nombre__icontains=search)
-        )
+    tasas = None
+    if convertir:
+        user_currency = request.user.moneda.abreviatura if request.user.moneda else 'ARS'
+        tasas = CurrencyService.get_rates_snapshot(user_currency)
     
-    # Aplicar ordenamiento
-    queryset = queryset.order_by(ordering)
+    return exportar_queryset(
+        queryset.order_by('fecha', 'id'),
+        [
+            ('id', 'id'),
+            ('fecha', 'fecha'),
+            ('categoria_id', 'categoria_id'),
+            ('categoria__nombre', 'categoria_nombre'),
+            ('moneda__abreviatura', 'moneda'),
+            ('monto', 'monto'),
+            ('descripcion', 'descripcion'),
+        ],
+        'gastos',
+        formato=formato,
+        tasas=tasas,
+    )
+
+
+@router.post("/import", response=ImportacionResultSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api_pesada'))
+def importar_gastos(
+    request,
+    archivo: UploadedFile = File(...),
+    formato: Literal["csv", "ofx"] = "csv",
+    categoria_defecto: str = "Sin categoría"
+):
+    """
+    Importa gastos desde un extracto bancario (CSV u OFX).
     
-    return list(queryset)
+    - CSV: columnas fecha, monto, descripcion, categoria
+    - OFX: se toman los débitos y se asignan a categoria_defecto
+    Los gastos ya cargados (misma fecha, categoría y monto) se omiten.
+    """
+    return importar_transacciones(
+        request.user,
+        leer_extracto(archivo, formato, signo=-1),
+        Gasto,
+        Categoria,
+        'categoria',
+        categoria_defecto,
+    )
+
+
+@router.post("/batch", response=List[BatchItemResultSchema], auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api_pesada'))
+@decorate_view(idempotente)
+def lote_gastos(request, payload: GastoBatchSchema):
+    """
+    Aplica un lote de operaciones (create / update / delete) en una sola transacción.
+    Devuelve un resultado por operación, en el mismo orden recibido.
+    """
+    return aplicar_lote(
+        request.user,
+        payload.operaciones,
+        Gasto,
+        campos={
+            'categoria': 'categoria_id',
+            'fecha': 'fecha',
+            'monto': 'monto',
+            'descripcion': 'descripcion',
+        },
+        requeridos=['categoria', 'fecha', 'monto'],
+        relaciones={'categoria': Categoria.objects.filter(usuario=request.user)},
+        valores_fijos={'usuario': request.user, 'moneda': request.user.moneda},
+    )
 
 
 @router.get("/{gasto_id}", response=GastoOutSchema, auth=[session_auth, AuthBearer()])
-def obtener_gasto(request, gasto_id: int):
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+def obtener_gasto(request, gasto_id: int, fields: str = None):
     """
     Obtiene el detalle de un gasto específico.
     Solo si pertenece al usuario autenticado.
+    Con `fields` devuelve solo esos campos (ver listar_gastos).
     """
-    gasto = get_object_or_404(
-        Gasto,
-        id=gasto_id,
-        usuario=request.user
-    )
+    seleccion = campos_pedidos(fields, GASTO_OUT_CAMPOS)
+    if seleccion:
+        queryset = Gasto.objects.filter(id=gasto_id, usuario=request.user)
+        if not queryset.exists():
+            queryset = GastoArchivado.objects.filter(id=gasto_id, usuario=request.user)
+        return respuesta_proyectada(router, request, queryset, seleccion, detalle=True)
+
+    # Los gastos archivados también se pueden consultar
+    gasto, _ = obtener_con_archivo(Gasto, id=gasto_id, usuario=request.user)
     return gasto
 
 
 @router.post("/", response=GastoOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(idempotente)
 def crear_gasto(request, payload: GastoCreateSchema):
     """
     Crea un nuevo gasto para el usuario autenticado.
@@ -93,16 +272,15 @@ def crear_gasto(request, payload: GastoCreateSchema):
 
 
 @router.put("/{gasto_id}", response=GastoOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
 def actualizar_gasto(request, gasto_id: int, payload: GastoUpdateSchema):
     """
     Actualiza un gasto existente.
     Solo si pertenece al usuario autenticado.
     """
-    gasto = get_object_or_404(
-        Gasto,
-        id=gasto_id,
-        usuario=request.user
-    )
+    gasto, archivado = obtener_con_archivo(Gasto, id=gasto_id, usuario=request.user)
+    if archivado:
+        raise HttpError(409, "Los gastos archivados son de solo lectura")
     
     # Actualizar campos proporcionados
     if payload.categoria is not None:
@@ -127,60 +305,17 @@ def actualizar_gasto(request, gasto_id: int, payload: GastoUpdateSchema):
 
 
 @router.delete("/{gasto_id}", auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
 def eliminar_gasto(request, gasto_id: int):
     """
     Elimina un gasto existente.
     Solo si pertenece al usuario autenticado.
     """
-    gasto = get_object_or_404(
-        Gasto,
-        id=gasto_id,
-        usuario=request.user
-    )
+    gasto, archivado = obtener_con_archivo(Gasto, id=gasto_id, usuario=request.user)
+    if archivado:
+        raise HttpError(409, "Los gastos archivados son de solo lectura")
     gasto.delete()
     return {"success": True, "message": "Gasto eliminado correctamente"}
 
 
-# @router.get("/estadisticas/total", response=GastoTotalSchema, auth=[session_auth, AuthBearer()])
-# def total_gastos(request):
-#     """
-#     Calcula el total de gastos del usuario autenticado.
-#     """
-#     resultado = Gasto.objects.filter(usuario=request.user).aggregate(
-#         total=Sum('monto')
-#     )
-    
-#     cantidad = Gasto.objects.filter(usuario=request.user).count()
-    
-#     return {
-#         'total': float(resultado['total'] or 0),
-#         'cantidad': cantidad,
-#         'moneda': request.user.moneda.abreviatura if request.user.moneda else None
-#     }
-
-
-# @router.get("/estadisticas/saldo", response=SaldoSchema, auth=[session_auth, AuthBearer()])
-# def calcular_saldo(request):
-#     """
-#     Calcula el saldo restante: Total Ingresos - Total Gastos.
-#     Este es uno de los endpoints más importantes del sistema.
-#     """
-#     # Calcular total de ingresos
-#     total_ingresos = Ingreso.objects.filter(usuario=request.user).aggregate(
-#         total=Sum('monto')
-#     )['total'] or 0
-    
-#     # Calcular total de gastos
-#     total_gastos = Gasto.objects.filter(usuario=request.user).aggregate(
-#         total=Sum('monto')
-#     )['total'] or 0
-    
-#     # Calcular saldo
-#     saldo = total_ingresos - total_gastos
-    
-#     return {
-#         'total_ingresos': float(total_ingresos),
-#         'total_gastos': float(total_gastos),
-#         'saldo_restante': float(saldo),
-#         'moneda': request.user.moneda.abreviatura if request.user.moneda else None
-#     }
\ No newline at end of file
+# Estadísticas (total, saldo, variación, distribución): ver api/estadisticas.py
@@ -0,0 +1,17 @@
+# Particionado por fecha opcional (DB_PARTITIONING=year|month, solo Postgres).
+# En otros motores, o sin la variable, no hace nada. Ver apps/utils/particiones.py
+
+from django.db import migrations
+
+from apps.utils.particiones import particionar_modelo
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gasto', '0003_usuario_fecha_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(*particionar_modelo('gasto', 'Gasto')),
+    ]
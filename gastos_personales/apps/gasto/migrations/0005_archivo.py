@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categoria', '0002_initial'),
+        ('gasto', '0004_particionar'),
+        ('usuario', '0004_email_verification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GastoArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('fecha', models.DateField()),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('descripcion', models.TextField(blank=True, null=True)),
+                ('categoria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='categoria.categoria')),
+                ('moneda', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='usuario.moneda')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['usuario', 'fecha'], name='gasto_gasto_usuario_8a6306_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='GastoResumenMensual',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('cantidad', models.PositiveIntegerField()),
+                ('categoria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='categoria.categoria')),
+                ('moneda', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='usuario.moneda')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('usuario', 'mes', 'categoria', 'moneda'), name='gasto_resumen_mensual_unico')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:16
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categoria', '0003_updated_at'),
+        ('gasto', '0005_archivo'),
+        ('usuario', '0007_eliminacion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gasto',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='gastoarchivado',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='gasto',
+            index=models.Index(fields=['usuario', 'updated_at'], name='gasto_gasto_usuario_e10b3b_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Índice de búsqueda de texto: FTS5 + triggers en SQLite, tabla de tsvector
+# con GIN + triggers en Postgres. En otros motores no hace nada. Ver apps/utils/busqueda.py
+
+from django.db import migrations
+
+from apps.utils.busqueda import indice_busqueda
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categoria', '0003_updated_at'),
+        ('gasto', '0006_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(*indice_busqueda('gasto', 'Gasto')),
+    ]
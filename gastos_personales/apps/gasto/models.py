@@ -8,6 +8,51 @@ class Gasto(models.Model):
     fecha = models.DateField()
     monto = models.DecimalField(max_digits=10, decimal_places=2)
     descripcion = models.TextField(blank=True, null=True)
+    # Última modificación, para GET /api/sync (ver apps/utils/sincronizacion.py)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Todas las consultas filtran por usuario y rango de fechas
+        indexes = [
+            models.Index(fields=['usuario', 'fecha']),
+            models.Index(fields=['usuario', 'updated_at']),
+        ]
     
     def __str__(self):
-        return f"{self.categoria} - ${self.monto} - {self.fecha}"
\ No newline at end of file
+        return f"{self.categoria} - ${self.monto} - {self.fecha}"
+
+class GastoArchivado(models.Model):
+    """
+    Gastos antiguos movidos por `manage.py archivar_transacciones`.
+    Mismas columnas y en el mismo orden que Gasto para poder unir ambas
+    tablas en una consulta (ver apps/utils/archivo.py).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    usuario = models.ForeignKey('usuario.Usuario', on_delete=models.CASCADE, related_name='+')
+    categoria = models.ForeignKey('categoria.Categoria', on_delete=models.CASCADE, related_name='+')
+    moneda = models.ForeignKey('usuario.Moneda', on_delete=models.SET_NULL, null=True, related_name='+')
+    fecha = models.DateField()
+    monto = models.DecimalField(max_digits=10, decimal_places=2)
+    descripcion = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=['usuario', 'fecha'])]
+
+    def __str__(self):
+        return f"{self.categoria} - ${self.monto} - {self.fecha} (archivado)"
+
+
+class GastoResumenMensual(models.Model):
+    """Totales por mes, categoría y moneda de los gastos archivados."""
+    usuario = models.ForeignKey('usuario.Usuario', on_delete=models.CASCADE, related_name='+')
+    categoria = models.ForeignKey('categoria.Categoria', on_delete=models.CASCADE, related_name='+')
+    moneda = models.ForeignKey('usuario.Moneda', on_delete=models.SET_NULL, null=True, related_name='+')
+    mes = models.DateField()
+    total = models.DecimalField(max_digits=14, decimal_places=2)
+    cantidad = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['usuario', 'mes', 'categoria', 'moneda'], name='gasto_resumen_mensual_unico')
+        ]
@@ -1,7 +1,9 @@
 from ninja import Schema
+from pydantic import Field
 from datetime import date
-from typing import Optional
+from typing import List, Literal, Optional
 from decimal import Decimal
+from apps.utils.batch import MAX_OPERACIONES_LOTE
 
 # Schema para CREAR un gasto (input)
 class GastoCreateSchema(Schema):
@@ -45,6 +47,34 @@ class GastoOutSchema(Schema):
     def resolve_moneda_abreviatura(obj):
         return obj.moneda.abreviatura if obj.moneda else None
 
+# Lookups del ORM equivalentes a GastoOutSchema, para el camino rápido con values()
+# (ver apps/utils/serializacion.py). Mismas claves y en el mismo orden
+GASTO_OUT_CAMPOS = {
+    'id': 'id',
+    'usuario_id': 'usuario_id',
+    'usuario_username': 'usuario__username',
+    'categoria_id': 'categoria_id',
+    'categoria_nombre': 'categoria__nombre',
+    'moneda_abreviatura': 'moneda__abreviatura',
+    'fecha': 'fecha',
+    'monto': 'monto',
+    'descripcion': 'descripcion',
+}
+
+# Columnas y tablas de nombres del formato columnar (ver apps/utils/serializacion.py)
+GASTO_COLUMNAS = {
+    'id': 'id',
+    'fecha': 'fecha',
+    'monto_cents': 'monto',
+    'categoria_id': 'categoria_id',
+    'moneda_id': 'moneda_id',
+    'descripcion': 'descripcion',
+}
+GASTO_DICCIONARIOS = {
+    'categorias': ('categoria_id', 'categoria__nombre'),
+    'monedas': ('moneda_id', 'moneda__abreviatura'),
+}
+
 # Schema para el total de gastos
 class GastoTotalSchema(Schema):
     total: float
@@ -56,4 +86,18 @@ class SaldoSchema(Schema):
     total_ingresos: float
     total_gastos: float
     saldo_restante: float
-    moneda: Optional[str] = None
\ No newline at end of file
+    moneda: Optional[str] = None
+    # Monedas sin tasa de cambio: sus montos no entran en los totales
+    sin_convertir: List[str] = []
+# Schema para una operación dentro de un lote (input)
+class GastoBatchOperationSchema(Schema):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    categoria: Optional[int] = None
+    fecha: Optional[date] = None
+    monto: Optional[Decimal] = None
+    descripcion: Optional[str] = None
+
+# Schema para un lote de operaciones (input)
+class GastoBatchSchema(Schema):
+    operaciones: List[GastoBatchOperationSchema] = Field(..., max_length=MAX_OPERACIONES_LOTE)
@@ -1,10 +1,21 @@
-from django.test import TestCase
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from apps.usuario.models import Moneda
 from apps.categoria.models import Categoria
-from apps.gasto.models import Gasto
-
+from apps.gasto.models import Gasto, GastoResumenMensual
+from apps.utils.archivo import archivar
+from apps.utils.importacion import importar_transacciones, leer_ofx
+from apps.utils.tests.base import ApiTestCase
 
 class GastoTests(TestCase):
     def setUp(self):
@@ -141,3 +152,383 @@ class GastoTests(TestCase):
 
         nuevo_gasto = Gasto.objects.filter(usuario=self.user1, descripcion='Compra en Kiosko').exists()
         self.assertTrue(nuevo_gasto)
+
+
+class GastoApiTests(ApiTestCase):
+    # -------------------------------------------------------
+    # EXPORT
+    # -------------------------------------------------------
+    def test_exportar_gastos_csv(self):
+        response = self.client.get('/api/gastos/export')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        lineas = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lineas[0], 'id,fecha,categoria_id,categoria_nombre,moneda,monto,descripcion')
+        self.assertEqual(len(lineas), 3)
+        self.assertIn('Supermercado', lineas[1])
+
+    def test_exportar_gastos_ndjson_convertido(self):
+        response = self.client.get('/api/gastos/export', {'formato': 'ndjson', 'convertir': True, 'desde': '2024-02-01'})
+        self.assertEqual(response.status_code, 200)
+
+        filas = [json.loads(l) for l in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(filas), 1)
+        self.assertEqual(filas[0]['descripcion'], 'Verdulería')
+        self.assertEqual(filas[0]['monto_convertido'], '800.00')
+
+    # -------------------------------------------------------
+    # IMPORT
+    # -------------------------------------------------------
+    def test_importar_gastos_csv_omite_duplicados(self):
+        contenido = (
+            'fecha,monto,descripcion,categoria\n'
+            '2024-01-10,500,Supermercado,comida\n'
+            '11/03/2024,"1.250,50",Farmacia,Salud\n'
+            'no-es-fecha,10,Mal,Comida\n'
+            '12/03/2024,-1500,Devolución,Comida\n'
+        ).encode()
+        archivo = SimpleUploadedFile('extracto.csv', contenido, content_type='text/csv')
+
+        response = self.client.post('/api/gastos/import', {'archivo': archivo})
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(data['procesadas'], 4)
+        self.assertEqual(data['creadas'], 1)
+        self.assertEqual(data['duplicadas'], 1)
+        # La devolución no se importa como gasto positivo
+        self.assertEqual([e['fila'] for e in data['errores']], [4, 5])
+        self.assertIn('positivo', data['errores'][1]['error'])
+        self.assertFalse(Gasto.objects.filter(descripcion='Devolución').exists())
+
+        farmacia = Gasto.objects.get(usuario=self.user, descripcion='Farmacia')
+        self.assertEqual(farmacia.monto, Decimal('1250.50'))
+        self.assertEqual(farmacia.categoria.nombre, 'Salud')
+
+    def test_importar_gastos_filas_iguales_se_importan(self):
+        # Dos cafés iguales el mismo día son dos gastos; el supermercado ya existía una vez
+        filas = [
+            {'fila': 2, 'fecha': date(2024, 1, 10), 'monto': Decimal('500.00'), 'descripcion': 'Supermercado', 'nombre': 'Comida'},
+            {'fila': 3, 'fecha': date(2024, 1, 10), 'monto': Decimal('500.00'), 'descripcion': 'Supermercado', 'nombre': 'Comida'},
+            {'fila': 4, 'fecha': date(2024, 3, 1), 'monto': Decimal('3.50'), 'descripcion': 'Café', 'nombre': 'Comida'},
+            {'fila': 5, 'fecha': date(2024, 3, 1), 'monto': Decimal('3.50'), 'descripcion': 'Café', 'nombre': 'Comida'},
+        ]
+
+        # Bloques de una fila: lo creado en un bloque no cuenta como existente en el siguiente
+        data = importar_transacciones(self.user, filas, Gasto, Categoria, 'categoria', 'Sin categoría', chunk_size=1)
+
+        self.assertEqual((data['creadas'], data['duplicadas']), (3, 1))
+        self.assertEqual(Gasto.objects.filter(usuario=self.user, descripcion='Café').count(), 2)
+        self.assertEqual(Gasto.objects.filter(usuario=self.user, descripcion='Supermercado').count(), 2)
+
+    def test_importar_gastos_ofx_solo_debitos(self):
+        contenido = (
+            '<OFX><BANKTRANLIST>\n'
+            '<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240305120000<TRNAMT>-42.10<NAME>Kiosco</STMTTRN>\n'
+            '<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240306<TRNAMT>1000.00<NAME>Sueldo</STMTTRN>\n'
+            '</BANKTRANLIST></OFX>\n'
+        ).encode()
+        archivo = SimpleUploadedFile('extracto.ofx', contenido)
+
+        response = self.client.post('/api/gastos/import?formato=ofx', {'archivo': archivo})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['creadas'], 1)
+
+        kiosco = Gasto.objects.get(usuario=self.user, descripcion='Kiosco')
+        self.assertEqual(kiosco.monto, Decimal('42.10'))
+        self.assertEqual(kiosco.categoria.nombre, 'Sin categoría')
+
+    def test_leer_ofx_en_una_linea(self):
+        movimiento = '<stmttrn><DTPOSTED>20240305<TRNAMT>-{}.00<NAME>Kiosco</stmttrn>'
+        contenido = ('<OFX><BANKTRANLIST>' + ''.join(movimiento.format(i) for i in range(1, 51))
+                     + '</BANKTRANLIST></OFX>').encode()
+
+        # Bloques chicos: los tags quedan cortados entre lecturas
+        with patch('apps.utils.importacion.OFX_CHUNK_SIZE', 7):
+            filas = list(leer_ofx(io.BytesIO(contenido), signo=-1))
+
+        self.assertEqual([fila['monto'] for fila in filas], [Decimal(i) for i in range(1, 51)])
+        self.assertEqual(filas[-1]['fila'], 50)
+
+    # -------------------------------------------------------
+    # BATCH
+    # -------------------------------------------------------
+    def test_lote_gastos(self):
+        existente = Gasto.objects.get(usuario=self.user, descripcion='Supermercado')
+        ajeno = Categoria.objects.create(nombre='Ajena')
+
+        response = self.client.post('/api/gastos/batch', {
+            'operaciones': [
+                {'op': 'create', 'categoria': self.cat_comida.id, 'fecha': '2024-03-01', 'monto': '10.00'},
+                {'op': 'create', 'categoria': ajeno.id, 'fecha': '2024-03-01', 'monto': '10.00'},
+                {'op': 'create', 'fecha': '2024-03-01'},
+                {'op': 'update', 'id': existente.id, 'monto': '550.00'},
+                {'op': 'delete', 'id': 999999},
+            ]
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        resultados = response.json()
+        self.assertEqual([r['ok'] for r in resultados], [True, False, False, True, False])
+        self.assertEqual(resultados[4]['error'], 'No encontrado')
+
+        creado = Gasto.objects.get(id=resultados[0]['id'])
+        self.assertEqual(creado.moneda, self.moneda_ars)
+        existente.refresh_from_db()
+        self.assertEqual(existente.monto, Decimal('550.00'))
+
+    def test_lote_actualiza_solo_campos_enviados(self):
+        supermercado = Gasto.objects.get(usuario=self.user, descripcion='Supermercado')
+        verduleria = Gasto.objects.get(usuario=self.user, descripcion='Verdulería')
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post('/api/gastos/batch', {
+                'operaciones': [
+                    {'op': 'update', 'id': supermercado.id, 'monto': '550.00'},
+                    {'op': 'update', 'id': verduleria.id, 'descripcion': 'Feria'},
+                ]
+            }, content_type='application/json')
+        self.assertEqual([r['ok'] for r in response.json()], [True, True])
+
+        # Un UPDATE por conjunto de campos: el del monto no reescribe la descripción
+        updates = [q['sql'] for q in consultas.captured_queries if q['sql'].startswith('UPDATE "gasto_gasto"')]
+        self.assertEqual(len(updates), 2)
+        por_monto = next(sql for sql in updates if '"monto"' in sql)
+        self.assertNotIn('"descripcion"', por_monto)
+        self.assertNotIn('"fecha"', por_monto)
+
+        supermercado.refresh_from_db()
+        verduleria.refresh_from_db()
+        self.assertEqual((supermercado.monto, supermercado.descripcion), (Decimal('550.00'), 'Supermercado'))
+        self.assertEqual((verduleria.monto, verduleria.descripcion), (Decimal('800.00'), 'Feria'))
+
+    # -------------------------------------------------------
+    # ASYNC
+    # -------------------------------------------------------
+    def test_listar_y_obtener_gastos_async(self):
+        response = self.client.get('/api/async/gastos/', {'ordering': 'fecha'})
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual([g['descripcion'] for g in data], ['Supermercado', 'Verdulería'])
+
+        response = self.client.get(f"/api/async/gastos/{data[0]['id']}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['categoria_nombre'], 'Comida')
+
+        response = self.client.get('/api/async/gastos/999999')
+        self.assertEqual(response.status_code, 404)
+
+    # -------------------------------------------------------
+    # ARCHIVO
+    # -------------------------------------------------------
+    def test_archivar_gastos_y_lectura_transparente(self):
+        self.assertEqual(archivar(Gasto, date(2024, 2, 1), batch_size=1), 1)
+
+        self.assertEqual(Gasto.objects.filter(usuario=self.user).count(), 1)
+        resumen = GastoResumenMensual.objects.get(usuario=self.user)
+        self.assertEqual((resumen.mes, resumen.total, resumen.cantidad), (date(2024, 1, 1), Decimal('500.00'), 1))
+
+        # Sin filtro de fechas solo se lee la tabla caliente
+        response = self.client.get('/api/gastos/')
+        self.assertEqual([g['descripcion'] for g in response.json()], ['Verdulería'])
+
+        # Un filtro que llega al rango archivado incluye el archivo
+        response = self.client.get('/api/gastos/', {'year': 2024})
+        self.assertEqual([g['descripcion'] for g in response.json()], ['Verdulería', 'Supermercado'])
+
+        response = self.client.get('/api/gastos/export', {'desde': '2024-01-01'})
+        filas = b''.join(response.streaming_content).decode().strip().splitlines()
+        self.assertEqual(len(filas), 3)
+
+    def test_gasto_archivado_detalle_y_solo_lectura(self):
+        archivado = Gasto.objects.get(usuario=self.user, descripcion='Supermercado')
+        archivar(Gasto, date(2024, 2, 1))
+
+        response = self.client.get(f'/api/gastos/{archivado.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['descripcion'], 'Supermercado')
+        response = self.client.get(f'/api/gastos/{archivado.id}', {'fields': 'id,monto'})
+        self.assertEqual(response.json(), {'id': archivado.id, 'monto': '500.00'})
+
+        response = self.client.put(f'/api/gastos/{archivado.id}', {'monto': '1.00'}, content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.delete(f'/api/gastos/{archivado.id}').status_code, 409)
+        self.assertEqual(self.client.delete('/api/gastos/999999').status_code, 404)
+
+        # El listado HTML con ?year= lee el archivo y marca la fila como solo lectura
+        response = self.client.get(reverse('gastos'), {'year': 2024})
+        self.assertEqual(
+            [(g.descripcion, g.archivado) for g in response.context['gastos']],
+            [('Verdulería', False), ('Supermercado', True)],
+        )
+        self.assertNotContains(response, reverse('gastos_update', args=[archivado.id]))
+
+    # -------------------------------------------------------
+    # SERIALIZACIÓN RÁPIDA
+    # -------------------------------------------------------
+    def test_fast_path_values_misma_respuesta(self):
+        response = self.client.get('/api/gastos/', {'ordering': 'monto'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json())
+
+        with override_settings(API_VALUES_FAST_PATH=True):
+            # Una sola consulta para el listado (más sesión, usuario y versión)
+            with self.assertNumQueries(4):
+                rapida = self.client.get('/api/gastos/', {'ordering': 'monto'})
+
+        self.assertEqual(rapida.status_code, 200)
+        self.assertEqual(rapida.content, response.content)
+
+    def test_fields_selecciona_columnas_y_claves(self):
+        campos = 'id,fecha,monto,categoria_nombre'
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/gastos/', {'fields': campos})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()[0],
+            {'id': response.json()[0]['id'], 'fecha': '2024-02-15', 'monto': '800.00', 'categoria_nombre': 'Comida'},
+        )
+
+        # Sin descripcion ni JOIN con usuario/moneda
+        sql = consultas.captured_queries[-1]['sql']
+        self.assertNotIn('descripcion', sql)
+        self.assertNotIn('usuario_usuario', sql)
+        self.assertNotIn('usuario_moneda', sql)
+
+        gasto_id = response.json()[0]['id']
+        response = self.client.get(f'/api/gastos/{gasto_id}', {'fields': 'monto'})
+        self.assertEqual(response.json(), {'monto': '800.00'})
+
+        # Unión con el archivo ordenando por una columna no pedida
+        archivar(Gasto, date(2024, 2, 1))
+        response = self.client.get('/api/gastos/', {'year': 2024, 'fields': 'descripcion'})
+        self.assertEqual(response.json(), [{'descripcion': 'Verdulería'}, {'descripcion': 'Supermercado'}])
+
+        self.assertEqual(self.client.get('/api/gastos/', {'fields': 'id,password'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/gastos/999999', {'fields': 'id'}).status_code, 404)
+
+    # -------------------------------------------------------
+    # FORMATO COLUMNAR
+    # -------------------------------------------------------
+    def test_listado_columnar_por_accept(self):
+        response = self.client.get(
+            '/api/gastos/', {'ordering': 'fecha'},
+            HTTP_ACCEPT='application/vnd.spendwise.columnar+json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/vnd.spendwise.columnar+json')
+        self.assertIn('Accept', response['Vary'])
+
+        datos = response.json()
+        self.assertEqual(datos['filas'], 2)
+        self.assertEqual(datos['fecha'], ['2024-01-10', '2024-02-15'])
+        self.assertEqual(datos['monto_cents'], [50000, 80000])
+        self.assertEqual(datos['categoria_id'], [self.cat_comida.id] * 2)
+        self.assertEqual(datos['categorias'], {str(self.cat_comida.id): 'Comida'})
+        self.assertEqual(datos['monedas'], {str(self.moneda_ars.id): 'ARS'})
+
+        # El JSON por fila sigue siendo el default y tiene otro ETag
+        response_json = self.client.get('/api/gastos/', {'ordering': 'fecha'})
+        self.assertEqual(response_json['Content-Type'], 'application/json; charset=utf-8')
+        self.assertNotEqual(response_json['ETag'], response['ETag'])
+
+    def test_listado_columnar_con_archivo(self):
+        archivar(Gasto, date(2024, 2, 1))
+
+        for formato in ('application/vnd.spendwise.columnar+json', 'application/x-msgpack'):
+            response = self.client.get('/api/gastos/', {'year': 2024, 'ordering': 'fecha'}, HTTP_ACCEPT=formato)
+            self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            '/api/gastos/', {'year': 2024, 'ordering': 'fecha'},
+            HTTP_ACCEPT='application/vnd.spendwise.columnar+json',
+        )
+        datos = response.json()
+        self.assertEqual(datos['fecha'], ['2024-01-10', '2024-02-15'])
+        self.assertEqual(datos['monto_cents'], [50000, 80000])
+        self.assertEqual(datos['categoria_id'], [self.cat_comida.id] * 2)
+        self.assertEqual(datos['moneda_id'], [self.moneda_ars.id] * 2)
+        self.assertEqual(datos['categorias'], {str(self.cat_comida.id): 'Comida'})
+        self.assertEqual(datos['monedas'], {str(self.moneda_ars.id): 'ARS'})
+
+    def test_fragmento_tabla_solo_consulta_la_pagina(self):
+        for i in range(12):
+            Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=self.moneda_ars,
+                                 fecha='2024-03-01', monto=10 + i, descripcion=f'Café {i}')
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(reverse('gastos'), {'search': 'café', 'fragmento': 'tabla'})
+        self.assertTemplateUsed(response, 'gasto/gasto_tabla.html')
+        self.assertTemplateNotUsed(response, 'gasto/gasto.html')
+        self.assertNotIn('total_gastos_mensual', response.context)
+        # Sesión, usuario, moneda del usuario, la página y el conteo
+        self.assertEqual(len(consultas), 5, [q['sql'][:80] for q in consultas.captured_queries])
+        self.assertEqual(len(response.context['gastos']), 10)
+
+        # La paginación conserva los filtros y no arrastra el parámetro del fragmento
+        cursor = response.context['page_obj'].cursor_siguiente
+        self.assertContains(response, f'href="?search=caf%C3%A9&amp;cursor={cursor}"')
+
+        response = self.client.get(reverse('gastos'), {'search': 'café'})
+        self.assertTemplateUsed(response, 'gasto/gasto.html')
+        self.assertContains(response, 'data-fragmento-form="gastoFilterForm"')
+
+    def test_paginacion_por_cursor(self):
+        for i in range(12):
+            Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=self.moneda_ars,
+                                 fecha='2024-03-01', monto=10 + i, descripcion=f'Café {i}')
+        # Misma fecha: el id desempata
+        esperados = list(Gasto.objects.filter(usuario=self.user).order_by('-fecha', '-id').values_list('id', flat=True))
+
+        response = self.client.get(reverse('gastos'))
+        primera = [g.id for g in response.context['gastos']]
+        cursor = response.context['page_obj'].cursor_siguiente
+        self.assertEqual(response.context['conteo'], {'cantidad': len(esperados), 'aproximado': False})
+
+        response = self.client.get(reverse('gastos'), {'cursor': cursor, 'fragmento': 'tabla'})
+        segunda = [g.id for g in response.context['gastos']]
+        self.assertEqual(primera + segunda, esperados)
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertNotIn('conteo', response.context)
+        self.assertNotContains(response, 'data-fragmento-mas')
+
+        # Un cursor inválido vuelve a la primera página
+        response = self.client.get(reverse('gastos'), {'cursor': 'no-es-un-cursor'})
+        self.assertEqual([g.id for g in response.context['gastos']], primera)
+
+    def test_busqueda_full_text(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        cafe = Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=self.moneda_ars,
+                                    fecha='2024-03-01', monto=100, descripcion='Café con leche')
+        doble = Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=self.moneda_ars,
+                                     fecha='2024-03-02', monto=200, descripcion='Café y café para llevar')
+
+        def ids(**params):
+            response = self.client.get('/api/gastos/', params)
+            self.assertEqual(response.status_code, 200)
+            return [g['id'] for g in response.json()]
+
+        # Prefijo y sin tildes; más apariciones = más relevante
+        self.assertEqual(ids(search='cafe', ordering='relevancia'), [doble.id, cafe.id])
+        self.assertEqual(ids(search='caf LECHE'), [cafe.id])
+        # El nombre de la categoría también está indexado y sigue a los renombres
+        self.assertEqual(len(ids(search='comi')), 4)
+        # Las palabras pueden estar repartidas entre descripción y categoría
+        self.assertEqual(ids(search='leche comida'), [cafe.id])
+        Categoria.objects.filter(pk=self.cat_comida.pk).update(nombre='Alimentos')
+        self.assertEqual(ids(search='comi'), [])
+        self.assertEqual(len(ids(search='alimentos')), 4)
+
+        # Los triggers siguen a update() y delete()
+        Gasto.objects.filter(pk=cafe.pk).update(descripcion='Té verde')
+        self.assertEqual(ids(search='verde'), [cafe.id])
+        Gasto.objects.filter(pk=cafe.pk).delete()
+        self.assertEqual(ids(search='verde'), [])
+
+        # Sin índice: icontains (encuentra texto en medio de una palabra)
+        with override_settings(SEARCH_BACKEND='icontains'):
+            self.assertEqual(ids(search='afé'), [doble.id])
+        self.assertEqual(ids(search='afé'), [])
@@ -1,17 +1,20 @@
-from decimal import Decimal
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.shortcuts import redirect
-from .models import Gasto
+from .models import Gasto, GastoArchivado
 from apps.categoria.models import Categoria
 from datetime import datetime
 from .forms import GastoForm
 # Importar utilidades
-from apps.utils.calculations import calcular_variacion_mensual, calcular_saldo_mensual, MESES_ES
+from apps.utils.calculations import MESES_ES
+from apps.utils.resumen import resumen_mensual
 from apps.utils.filters import aplicar_filtros_basicos, aplicar_busqueda, obtener_valores_filtros
 from apps.utils.currency_mixins import ListViewCurrencyMixin
+from apps.utils.archivo import alcanza_archivo, marcar_archivado, unir_archivo
+from apps.utils.fragmentos import FragmentoListMixin
+from apps.utils.paginacion import KeysetPaginationMixin
 from apps.utils.categoria.style_helpers import get_badge_styles_from_hex
 
 
@@ -21,18 +24,39 @@ class UserGastoQuerysetMixin:
         return Gasto.objects.filter(usuario=self.request.user)
 
 
-class GastoListView(LoginRequiredMixin, UserGastoQuerysetMixin, ListViewCurrencyMixin, ListView):
+class GastoListView(LoginRequiredMixin, UserGastoQuerysetMixin, FragmentoListMixin, KeysetPaginationMixin, ListViewCurrencyMixin, ListView):
     """Vista principal de Gastos con:
     - Búsqueda de gastos, 
     - Lista de gastos con filtros,
     - Distribución de gastos por categoría."""
     model = Gasto
     template_name = 'gasto/gasto.html'
+    fragment_template_name = 'gasto/gasto_tabla.html'
     context_object_name = 'gastos'
     paginate_by = 10
 
     def get_queryset(self):
-        queryset = super().get_queryset().select_related(
+        queryset = self._filtrar(super().get_queryset())
+        
+        # Los gastos archivados solo se leen si el filtro de fecha llega a ese rango
+        # (mismos parámetros que la API). Se listan como solo lectura.
+        if alcanza_archivo(
+            GastoArchivado,
+            fecha=self.request.GET.get('fecha'),
+            year=self.request.GET.get('year'),
+        ):
+            archivados = GastoArchivado.objects.filter(usuario=self.request.user)
+            return unir_archivo(
+                marcar_archivado(queryset, False),
+                marcar_archivado(self._filtrar(archivados), True),
+                *self.keyset_ordering,
+            )
+        
+        return queryset.order_by(*self.keyset_ordering)
+    
+    def _filtrar(self, queryset):
+        """Aplica búsqueda y filtros del request (sirve para Gasto y GastoArchivado)."""
+        queryset = queryset.select_related(
             'categoria', 'moneda', 'usuario', 
             'categoria__color', 'categoria__icono'
         )
@@ -52,35 +76,26 @@ class GastoListView(LoginRequiredMixin, UserGastoQuerysetMixin, ListViewCurrency
         if categoria_id:
             queryset = queryset.filter(categoria_id=categoria_id)
         
-        return queryset.order_by('-fecha')
+        # Página pedida por cursor (keyset)
+        return self.aplicar_cursor(queryset)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        usuario = self.request.user
-        hoy = datetime.now()
-        user_currency = self.get_user_currency()
-        
-        # Consulta para gastos del mes
-        gastos_mes = Gasto.objects.filter(
-            usuario=usuario,
-            fecha__month=hoy.month,
-            fecha__year=hoy.year
-        ).select_related('moneda', 'categoria', 'categoria__color', 'categoria__icono')
-        
-        # Calcular distribución por categoría
-        gastos_por_categoria_dict = self._calcular_distribucion_categorias(
-            gastos_mes, user_currency
-        )
-        
-        total_gastos_convertido = gastos_por_categoria_dict['total']
-        gastos_por_categoria_list = gastos_por_categoria_dict['items']
         
         # Asignar estilos a gastos individuales
         self._asignar_estilos_gastos(context['gastos'])
         
-        # Calcular variación y saldo
-        variacion = calcular_variacion_mensual(Gasto, usuario)
-        saldo_info = calcular_saldo_mensual(usuario)
+        # Filtro o página nueva: solo la tabla, sin resumen ni formularios
+        if self.es_fragmento():
+            return context
+        
+        usuario = self.request.user
+        hoy = datetime.now()
+        user_currency = self.get_user_currency()
+        
+        # Total, variación, distribución y saldo del mes en una sola consulta
+        resumen = resumen_mensual(usuario, user_currency, hoy.date())
+        gastos_mes = resumen['gastos']
         
         # Obtener valores de filtros
         valores_filtros = obtener_valores_filtros(
@@ -89,15 +104,15 @@ class GastoListView(LoginRequiredMixin, UserGastoQuerysetMixin, ListViewCurrency
         )
         
         context.update({
-            'total_gastos_mensual': total_gastos_convertido,
-            'variacion_porcentual': variacion['variacion_porcentual'],
+            'total_gastos_mensual': gastos_mes['total_mes'],
+            'variacion_porcentual': gastos_mes['variacion_porcentual'],
             'mes_nombre': MESES_ES[hoy.month],
-            'gastos_por_categoria': gastos_por_categoria_list,
-            'total_general_grafico': total_gastos_convertido,
+            'gastos_por_categoria': gastos_mes['distribucion'],
+            'total_general_grafico': gastos_mes['total_mes'],
             'categorias_disponibles': Categoria.objects.filter(usuario=usuario),
-            'cantidad_gastos': self.get_queryset().count(),
-            'saldo_restante': saldo_info['saldo'],
-            'total_ingresos_mensual': saldo_info['total_ingresos'],
+            'saldo_restante': resumen['saldo'],
+            'total_ingresos_mensual': resumen['ingresos']['total_mes'],
+            'monedas_sin_convertir': resumen['sin_convertir'],
             'moneda': user_currency,
             'create_form': GastoForm(user=self.request.user),
             **valores_filtros
@@ -105,90 +120,31 @@ class GastoListView(LoginRequiredMixin, UserGastoQuerysetMixin, ListViewCurrency
         
         return context
     
-    def _calcular_distribucion_categorias(self, gastos_mes, user_currency):
+    def _asignar_estilos_gastos(self, gastos):
         """
-        Calcula la distribución de gastos por categoría con colores e íconos de la BD.
+        Asigna estilos inline a cada gasto basándose en su categoría
+        (color e ícono vienen del select_related del listado).
         """
-        total_convertido = Decimal('0.00')
-        gastos_por_categoria = {}
-        
-        for gasto in gastos_mes:
-            # Conversión de moneda
-            gasto_currency = gasto.moneda.abreviatura if gasto.moneda else 'ARS'
-            monto_convertido = (
-                gasto.monto 
-                if gasto_currency == user_currency 
-                else self.convert_to_user_currency(gasto.monto, gasto_currency)
-            )
-            
-            total_convertido += monto_convertido
-            
-            # Acumular por categoría
-            categoria_nombre = gasto.categoria.nombre if gasto.categoria else 'Sin categoría'
-            if categoria_nombre not in gastos_por_categoria:
-                gastos_por_categoria[categoria_nombre] = {
-                    'monto': Decimal('0.00'),
-                    'color': gasto.categoria.color.codigo_hex if gasto.categoria and gasto.categoria.color else '#9CA3AF',
-                    'icono': gasto.categoria.icono.icono if gasto.categoria and gasto.categoria.icono else 'fas fa-circle',
-                }
-            gastos_por_categoria[categoria_nombre]['monto'] += monto_convertido
-        
-        # Crear lista con porcentajes
-        items = [
-            {
-                'categoria': categoria,
-                'total': data['monto'],
-                'porcentaje': round((data['monto'] / total_convertido * 100), 2) if total_convertido > 0 else 0,
-                'color': data['color'],
-                'icono': data['icono'],
-            }
-            for categoria, data in gastos_por_categoria.items()
-        ]
-        
-        items.sort(key=lambda x: x['porcentaje'], reverse=True)
-        
-        return {
-            'total': total_convertido,
-            'items': items
-        }
-    
-    def _asignar_estilos_gastos(self, gastos_queryset):
-        """
-        Asigna estilos inline a cada gasto basándose en su categoría.
-        """
-        # Obtener categorías únicas
-        categorias_ids = {gasto.categoria.id for gasto in gastos_queryset if gasto.categoria}
-        
-        # Cargar estilos de categorías desde la BD
-        estilos_categorias = {}
-        if categorias_ids:
-            categorias = Categoria.objects.filter(
-                id__in=categorias_ids
-            ).select_related('color', 'icono')
-            
-            for cat in categorias:
-                color_hex = cat.color.codigo_hex if cat.color else '#9CA3AF'
-                icono_class = cat.icono.icono if cat.icono else 'fas fa-circle'
-                
-                estilos_categorias[cat.nombre] = {
-                    'icono': icono_class,
-                    'color_icono': f"color: {color_hex};",
-                    'color_badge': get_badge_styles_from_hex(color_hex)
-                }
-        
-        # Estilos por defecto
         estilos_default = {
             'icono': 'fas fa-circle',
             'color_icono': 'color: #9CA3AF;',
             'color_badge': 'background-color: rgba(156,163,175,0.15); color: rgb(75,85,99);'
         }
+        estilos_categorias = {}
         
-        # Asignar estilos a cada gasto
-        for gasto in gastos_queryset:
-            if gasto.categoria and gasto.categoria.nombre in estilos_categorias:
-                estilos = estilos_categorias[gasto.categoria.nombre]
-            else:
+        for gasto in gastos:
+            categoria = gasto.categoria
+            if categoria is None:
                 estilos = estilos_default
+            else:
+                estilos = estilos_categorias.get(categoria.id)
+                if estilos is None:
+                    color_hex = categoria.color.codigo_hex if categoria.color else '#9CA3AF'
+                    estilos = estilos_categorias[categoria.id] = {
+                        'icono': categoria.icono.icono if categoria.icono else 'fas fa-circle',
+                        'color_icono': f"color: {color_hex};",
+                        'color_badge': get_badge_styles_from_hex(color_hex),
+                    }
             
             gasto.icono = estilos['icono']
             gasto.color_icono = estilos['color_icono']
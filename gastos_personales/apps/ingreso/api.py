@@ -1,30 +1,99 @@
-from ninja import Router
-from typing import List
-from django.shortcuts import get_object_or_404
-from django.db.models import Sum, Q
-from .models import Ingreso, Fuente
+from ninja import Router, File
+from ninja.files import UploadedFile
+from ninja.decorators import decorate_view
+from ninja.errors import HttpError
+from typing import List, Literal
+from datetime import date
+from django.db.models import Sum
+from .models import Ingreso, IngresoArchivado, Fuente
 from .schemas import (
     IngresoCreateSchema, 
     IngresoUpdateSchema, 
     IngresoOutSchema,
     IngresoTotalSchema,
-    FuenteOutSchema
+    FuenteOutSchema,
+    IngresoBatchSchema,
+    INGRESO_OUT_CAMPOS,
+    INGRESO_COLUMNAS,
+    INGRESO_DICCIONARIOS,
 )
+from api.schemas import ImportacionResultSchema, BatchItemResultSchema
 from api.auth import session_auth
 from api.auth import AuthBearer
+from apps.utils.currency_service import CurrencyService
+from apps.utils.export import exportar_queryset
+from apps.utils.importacion import leer_extracto, importar_transacciones
+from apps.utils.batch import aplicar_lote
+from apps.utils.busqueda import ORDEN_RELEVANCIA, buscar, ordenar_por_relevancia
+from apps.utils.archivo import alcanza_archivo, obtener_con_archivo, unir_archivo
+from apps.utils.versionado import respuesta_condicional
+from apps.utils.limites import limitar
+from apps.utils.idempotencia import idempotente
+from apps.utils.serializacion import (
+    campos_pedidos,
+    columnar,
+    fast_path_activo,
+    formato_columnar,
+    respuesta_columnar,
+    respuesta_proyectada,
+)
 
 # Crear router para ingresos
 router = Router(tags=["Ingresos"])
 
 # ==================== ENDPOINTS DE INGRESOS ====================
 
+def filtrar_ingresos(usuario, fuente=None, fecha=None, search=None, ordering="-fecha"):
+    """
+    Construye el queryset de ingresos del usuario con los filtros de la API.
+    Compartido entre los endpoints sync y async.
+    Incluye los ingresos archivados solo si el filtro de fecha llega a ese rango.
+    """
+    def filtrar(model):
+        queryset = model.objects.filter(usuario=usuario).select_related(
+            'fuente', 'moneda', 'usuario'
+        )
+        
+        # Aplicar filtros
+        if fuente:
+            queryset = queryset.filter(fuente_id=fuente)
+        
+        if fecha:
+            queryset = queryset.filter(fecha=fecha)
+        
+        if search:
+            queryset = buscar(queryset, search, ['descripcion', 'fuente__nombre'])
+        return queryset
+    
+    queryset = filtrar(Ingreso)
+    
+    # La relevancia sale del índice de búsqueda, que el archivo no tiene
+    relevancia = ordering == ORDEN_RELEVANCIA
+    if relevancia:
+        ordering = "-fecha"
+    
+    if alcanza_archivo(IngresoArchivado, fecha=fecha):
+        return unir_archivo(queryset, filtrar(IngresoArchivado), ordering)
+    
+    if relevancia and search:
+        return ordenar_por_relevancia(queryset, search, ordering, "-id")
+    
+    # Aplicar ordenamiento
+    queryset = queryset.order_by(ordering)
+    
+    return queryset
+
+
 @router.get("/", response=List[IngresoOutSchema], auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
 def listar_ingresos(
     request,
     fuente: int = None,
     fecha: str = None,
     search: str = None,
-    ordering: str = "-fecha"
+    ordering: str = "-fecha",
+    fields: str = None
 ):
     """
     Lista todos los ingresos del usuario autenticado.
@@ -33,46 +102,156 @@ def listar_ingresos(
     - fuente: Filtrar por ID de fuente
     - fecha: Filtrar por fecha exacta (formato: YYYY-MM-DD)
     - search: Buscar en descripción
-    - ordering: Ordenar resultados (fecha, -fecha, monto, -monto)
+    - ordering: Ordenar resultados (fecha, -fecha, monto, -monto, o relevancia junto con search)
+    - fields: Campos a devolver separados por comas (p. ej. id,fecha,monto)
+
+    Con `Accept: application/vnd.spendwise.columnar+json` (o application/x-msgpack)
+    responde en formato columnar: una lista por columna, montos en centavos y
+    los nombres en tablas {id: nombre}. En ese formato `fields` no aplica.
     """
-    queryset = Ingreso.objects.filter(usuario=request.user).select_related(
-        'fuente', 'moneda', 'usuario'
-    )
+    seleccion = campos_pedidos(fields, INGRESO_OUT_CAMPOS)
+    queryset = filtrar_ingresos(request.user, fuente, fecha, search, ordering)
+
+    formato = formato_columnar(request)
+    if formato:
+        datos = columnar(queryset, INGRESO_COLUMNAS, INGRESO_DICCIONARIOS)
+        return respuesta_columnar(router, request, datos, formato)
+
+    if seleccion or fast_path_activo():
+        return respuesta_proyectada(router, request, queryset, seleccion or INGRESO_OUT_CAMPOS)
+    return list(queryset)
+
+
+@router.get("/export", auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api_pesada'))
+def exportar_ingresos(
+    request,
+    formato: Literal["csv", "ndjson"] = "csv",
+    convertir: bool = False,
+    fuente: int = None,
+    desde: date = None,
+    hasta: date = None
+):
+    """
+    Exporta el historial de ingresos del usuario en streaming (CSV o NDJSON).
     
-    # Aplicar filtros
-    if fuente:
-        queryset = queryset.filter(fuente_id=fuente)
+    Parámetros de consulta:
+    - formato: csv o ndjson
+    - convertir: Agrega la columna monto_convertido en la moneda del usuario
+    - fuente: Filtrar por ID de fuente
+    - desde / hasta: Rango de fechas (inclusive); si llega al rango archivado
+      también se exportan los ingresos archivados
+    """
+    def filtrar(model):
+        queryset = model.objects.filter(usuario=request.user)
+        
+        if fuente:
+            queryset = queryset.filter(fuente_id=fuente)
+        if desde:
+            queryset = queryset.filter(fecha__gte=desde)
+        if hasta:
+            queryset = queryset.filter(fecha__lte=hasta)
+        return queryset
     
-    if fecha:
-        queryset = queryset.filter(fecha=fecha)
+    queryset = filtrar(Ingreso)
+    if alcanza_archivo(IngresoArchivado, desde=desde, hasta=hasta):
+        queryset = unir_archivo(queryset, filtrar(IngresoArchivado))
     
-    if search:
-        queryset = queryset.filter(
-            Q(descripcion__icontains=search) | 
-            Q(fuente__nombre__icontains=search)
-        )
+    tasas = None
+    if convertir:
+        user_currency = request.user.moneda.abreviatura if request.user.moneda else 'ARS'
+        tasas = CurrencyService.get_rates_snapshot(user_currency)
     
-    # Aplicar ordenamiento
-    queryset = queryset.order_by(ordering)
+    return exportar_queryset(
+        queryset.order_by('fecha', 'id'),
+        [
+            ('id', 'id'),
+            ('fecha', 'fecha'),
+            ('fuente_id', 'fuente_id'),
+            ('fuente__nombre', 'fuente_nombre'),
+            ('moneda__abreviatura', 'moneda'),
+            ('monto', 'monto'),
+            ('descripcion', 'descripcion'),
+        ],
+        'ingresos',
+        formato=formato,
+        tasas=tasas,
+    )
+
+
+@router.post("/import", response=ImportacionResultSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api_pesada'))
+def importar_ingresos(
+    request,
+    archivo: UploadedFile = File(...),
+    formato: Literal["csv", "ofx"] = "csv",
+    fuente_defecto: str = "Otro"
+):
+    """
+    Importa ingresos desde un extracto bancario (CSV u OFX).
     
-    return list(queryset)
+    - CSV: columnas fecha, monto, descripcion, fuente
+    - OFX: se toman los créditos y se asignan a fuente_defecto
+    Los ingresos ya cargados (misma fecha, fuente y monto) se omiten.
+    """
+    return importar_transacciones(
+        request.user,
+        leer_extracto(archivo, formato, signo=1),
+        Ingreso,
+        Fuente,
+        'fuente',
+        fuente_defecto,
+    )
+
+
+@router.post("/batch", response=List[BatchItemResultSchema], auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api_pesada'))
+@decorate_view(idempotente)
+def lote_ingresos(request, payload: IngresoBatchSchema):
+    """
+    Aplica un lote de operaciones (create / update / delete) en una sola transacción.
+    Devuelve un resultado por operación, en el mismo orden recibido.
+    """
+    return aplicar_lote(
+        request.user,
+        payload.operaciones,
+        Ingreso,
+        campos={
+            'fuente': 'fuente_id',
+            'fecha': 'fecha',
+            'monto': 'monto',
+            'descripcion': 'descripcion',
+        },
+        requeridos=['fuente', 'fecha', 'monto'],
+        relaciones={'fuente': Fuente.objects.filter(usuario=request.user)},
+        valores_fijos={'usuario': request.user, 'moneda': request.user.moneda},
+    )
 
 
 @router.get("/{ingreso_id}", response=IngresoOutSchema, auth=[session_auth, AuthBearer()])
-def obtener_ingreso(request, ingreso_id: int):
+@decorate_view(limitar('api'))
+@decorate_view(respuesta_condicional)
+def obtener_ingreso(request, ingreso_id: int, fields: str = None):
     """
     Obtiene el detalle de un ingreso específico.
     Solo si pertenece al usuario autenticado.
+    Con `fields` devuelve solo esos campos (ver listar_ingresos).
     """
-    ingreso = get_object_or_404(
-        Ingreso, 
-        id=ingreso_id, 
-        usuario=request.user
-    )
+    seleccion = campos_pedidos(fields, INGRESO_OUT_CAMPOS)
+    if seleccion:
+        queryset = Ingreso.objects.filter(id=ingreso_id, usuario=request.user)
+        if not queryset.exists():
+            queryset = IngresoArchivado.objects.filter(id=ingreso_id, usuario=request.user)
+        return respuesta_proyectada(router, request, queryset, seleccion, detalle=True)
+
+    # Los ingresos archivados también se pueden consultar
+    ingreso, _ = obtener_con_archivo(Ingreso, id=ingreso_id, usuario=request.user)
     return ingreso
 
 
 @router.post("/", response=IngresoOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
+@decorate_view(idempotente)
 def crear_ingreso(request, payload: IngresoCreateSchema):
     """
     Crea un nuevo ingreso para el usuario autenticado.
@@ -91,16 +270,15 @@ def crear_ingreso(request, payload: IngresoCreateSchema):
 
 
 @router.put("/{ingreso_id}", response=IngresoOutSchema, auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
 def actualizar_ingreso(request, ingreso_id: int, payload: IngresoUpdateSchema):
     """
     Actualiza un ingreso existente.
     Solo si pertenece al usuario autenticado.
     """
-    ingreso = get_object_or_404(
-        Ingreso, 
-        id=ingreso_id, 
-        usuario=request.user
-    )
+    ingreso, archivado = obtener_con_archivo(Ingreso, id=ingreso_id, usuario=request.user)
+    if archivado:
+        raise HttpError(409, "Los ingresos archivados son de solo lectura")
     
     # Actualizar campos proporcionados
     if payload.fuente is not None:
@@ -125,36 +303,20 @@ def actualizar_ingreso(request, ingreso_id: int, payload: IngresoUpdateSchema):
 
 
 @router.delete("/{ingreso_id}", auth=[session_auth, AuthBearer()])
+@decorate_view(limitar('api'))
 def eliminar_ingreso(request, ingreso_id: int):
     """
     Elimina un ingreso existente.
     Solo si pertenece al usuario autenticado.
     """
-    ingreso = get_object_or_404(
-        Ingreso, 
-        id=ingreso_id, 
-        usuario=request.user
-    )
+    ingreso, archivado = obtener_con_archivo(Ingreso, id=ingreso_id, usuario=request.user)
+    if archivado:
+        raise HttpError(409, "Los ingresos archivados son de solo lectura")
     ingreso.delete()
     return {"success": True, "message": "Ingreso eliminado correctamente"}
 
 
-# @router.get("/estadisticas/total", response=IngresoTotalSchema, auth=[session_auth, AuthBearer()])
-# def total_ingresos(request):
-#     """
-#     Calcula el total de ingresos del usuario autenticado.
-#     """
-#     resultado = Ingreso.objects.filter(usuario=request.user).aggregate(
-#         total=Sum('monto')
-#     )
-    
-#     cantidad = Ingreso.objects.filter(usuario=request.user).count()
-    
-#     return {
-#         'total': float(resultado['total'] or 0),
-#         'cantidad': cantidad,
-#         'moneda': request.user.moneda.abreviatura if request.user.moneda else None
-#     }
+# Estadísticas (total, saldo, variación, distribución): ver api/estadisticas.py
 
 
 # ==================== ENDPOINTS DE FUENTES ====================
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingreso', '0002_initial'),
+        ('usuario', '0004_email_verification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingreso',
+            index=models.Index(fields=['usuario', 'fecha'], name='ingreso_ing_usuario_02f292_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingreso', '0004_particionar'),
+        ('usuario', '0004_email_verification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngresoArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('fecha', models.DateField()),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('descripcion', models.TextField(blank=True, null=True)),
+                ('fuente', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='ingreso.fuente')),
+                ('moneda', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='usuario.moneda')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['usuario', 'fecha'], name='ingreso_ing_usuario_983ad0_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='IngresoResumenMensual',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('cantidad', models.PositiveIntegerField()),
+                ('fuente', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='ingreso.fuente')),
+                ('moneda', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='usuario.moneda')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('usuario', 'mes', 'fuente', 'moneda'), name='ingreso_resumen_mensual_unico')],
+            },
+        ),
+    ]
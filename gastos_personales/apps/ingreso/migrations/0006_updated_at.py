@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:16
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingreso', '0005_archivo'),
+        ('usuario', '0007_eliminacion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fuente',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='ingreso',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='ingresoarchivado',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='ingreso',
+            index=models.Index(fields=['usuario', 'updated_at'], name='ingreso_ing_usuario_0d50ba_idx'),
+        ),
+    ]
@@ -10,10 +10,53 @@ class Ingreso(models.Model):
     fecha = models.DateField()
     monto = models.DecimalField(max_digits=10, decimal_places=2)
     descripcion = models.TextField(blank=True, null=True)
+    # Última modificación, para GET /api/sync (ver apps/utils/sincronizacion.py)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Todas las consultas filtran por usuario y rango de fechas
+        indexes = [
+            models.Index(fields=['usuario', 'fecha']),
+            models.Index(fields=['usuario', 'updated_at']),
+        ]
     
     def _str_(self):
         return f"{self.fuente} - {self.monto} - {self.fecha}"
 
+class IngresoArchivado(models.Model):
+    """
+    Ingresos antiguos movidos por `manage.py archivar_transacciones`.
+    Mismas columnas y en el mismo orden que Ingreso para poder unir ambas
+    tablas en una consulta (ver apps/utils/archivo.py).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    usuario = models.ForeignKey('usuario.Usuario', on_delete=models.CASCADE, related_name='+')
+    fuente = models.ForeignKey('ingreso.Fuente', on_delete=models.SET_NULL, null=True, related_name='+')
+    moneda = models.ForeignKey('usuario.Moneda', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    fecha = models.DateField()
+    monto = models.DecimalField(max_digits=10, decimal_places=2)
+    descripcion = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=['usuario', 'fecha'])]
+
+
+class IngresoResumenMensual(models.Model):
+    """Totales por mes, fuente y moneda de los ingresos archivados."""
+    usuario = models.ForeignKey('usuario.Usuario', on_delete=models.CASCADE, related_name='+')
+    fuente = models.ForeignKey('ingreso.Fuente', on_delete=models.SET_NULL, null=True, related_name='+')
+    moneda = models.ForeignKey('usuario.Moneda', on_delete=models.SET_NULL, null=True, related_name='+')
+    mes = models.DateField()
+    total = models.DecimalField(max_digits=14, decimal_places=2)
+    cantidad = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['usuario', 'mes', 'fuente', 'moneda'], name='ingreso_resumen_mensual_unico')
+        ]
+
+
 class Fuente(models.Model):
     usuario = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -21,6 +64,7 @@ class Fuente(models.Model):
         related_name="fuentes"
     )
     nombre = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.nombre
\ No newline at end of file
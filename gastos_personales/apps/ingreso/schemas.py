@@ -1,7 +1,9 @@
 from ninja import Schema
+from pydantic import Field
 from datetime import date
-from typing import Optional
+from typing import List, Literal, Optional
 from decimal import Decimal
+from apps.utils.batch import MAX_OPERACIONES_LOTE
 
 # Schema para CREAR un ingreso (input)
 class IngresoCreateSchema(Schema):
@@ -45,6 +47,34 @@ class IngresoOutSchema(Schema):
     def resolve_moneda_abreviatura(obj):
         return obj.moneda.abreviatura if obj.moneda else None
 
+# Lookups del ORM equivalentes a IngresoOutSchema, para el camino rápido con values()
+# (ver apps/utils/serializacion.py). Mismas claves y en el mismo orden
+INGRESO_OUT_CAMPOS = {
+    'id': 'id',
+    'usuario_id': 'usuario_id',
+    'usuario_username': 'usuario__username',
+    'fuente_id': 'fuente_id',
+    'fuente_nombre': 'fuente__nombre',
+    'moneda_abreviatura': 'moneda__abreviatura',
+    'fecha': 'fecha',
+    'monto': 'monto',
+    'descripcion': 'descripcion',
+}
+
+# Columnas y tablas de nombres del formato columnar (ver apps/utils/serializacion.py)
+INGRESO_COLUMNAS = {
+    'id': 'id',
+    'fecha': 'fecha',
+    'monto_cents': 'monto',
+    'fuente_id': 'fuente_id',
+    'moneda_id': 'moneda_id',
+    'descripcion': 'descripcion',
+}
+INGRESO_DICCIONARIOS = {
+    'fuentes': ('fuente_id', 'fuente__nombre'),
+    'monedas': ('moneda_id', 'moneda__abreviatura'),
+}
+
 # Schema para el total de ingresos
 class IngresoTotalSchema(Schema):
     total: float
@@ -54,4 +84,16 @@ class IngresoTotalSchema(Schema):
 # Schema para Fuente (output)
 class FuenteOutSchema(Schema):
     id: int
-    nombre: str
\ No newline at end of file
+    nombre: str
+# Schema para una operación dentro de un lote (input)
+class IngresoBatchOperationSchema(Schema):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    fuente: Optional[int] = None
+    fecha: Optional[date] = None
+    monto: Optional[Decimal] = None
+    descripcion: Optional[str] = None
+
+# Schema para un lote de operaciones (input)
+class IngresoBatchSchema(Schema):
+    operaciones: List[IngresoBatchOperationSchema] = Field(..., max_length=MAX_OPERACIONES_LOTE)
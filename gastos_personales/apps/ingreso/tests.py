@@ -1,7 +1,12 @@
+import json
+from decimal import Decimal
+from datetime import date
 from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.contrib.auth import get_user_model # Devuelve modelo de usuario activo configurado en el proyecto
 from .models import Ingreso, Fuente
+from apps.utils.archivo import archivar
 from apps.usuario.models import Moneda
 
 # Create your tests here.
@@ -112,4 +117,158 @@ class IngresoTests(TestCase):
         }
         self.client.post(reverse('ingresos_create'), data)
         nuevo = Ingreso.objects.filter(usuario=self.user1, descripcion='Bono extra').exists()
-        self.assertTrue(nuevo)
\ No newline at end of file
+        self.assertTrue(nuevo)
+
+
+class IngresoApiTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            username='api_ingresos',
+            email='ingresos@example.com',
+            password='12345'
+        )
+        self.moneda_ars = Moneda.objects.create(
+            usuario=self.user, moneda='Peso Argentino', abreviatura='ARS'
+        )
+        self.user.moneda = self.moneda_ars
+        self.user.save()
+
+        self.fuente_sueldo = Fuente.objects.create(usuario=self.user, nombre='Sueldo')
+
+        Ingreso.objects.create(
+            usuario=self.user,
+            fecha='2024-01-05',
+            fuente=self.fuente_sueldo,
+            monto=1000,
+            moneda=self.moneda_ars,
+            descripcion='Sueldo Enero'
+        )
+        Ingreso.objects.create(
+            usuario=self.user,
+            fecha='2024-02-05',
+            fuente=self.fuente_sueldo,
+            monto=1100,
+            moneda=self.moneda_ars,
+            descripcion='Sueldo Febrero'
+        )
+
+        self.client.force_login(self.user)
+
+    # -------------------------------------------------------
+    # EXPORT
+    # -------------------------------------------------------
+    def test_exportar_ingresos_csv(self):
+        response = self.client.get('/api/ingresos/export', {'desde': '2024-02-01'})
+        self.assertEqual(response.status_code, 200)
+
+        lineas = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lineas[0], 'id,fecha,fuente_id,fuente_nombre,moneda,monto,descripcion')
+        self.assertEqual(len(lineas), 2)
+        self.assertIn('Sueldo Febrero', lineas[1])
+
+    def test_exportar_ingresos_ndjson(self):
+        response = self.client.get('/api/ingresos/export', {'formato': 'ndjson'})
+        filas = [json.loads(l) for l in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([f['monto'] for f in filas], ['1000.00', '1100.00'])
+        self.assertEqual(filas[0]['fuente_nombre'], 'Sueldo')
+
+    # -------------------------------------------------------
+    # IMPORT
+    # -------------------------------------------------------
+    def test_importar_ingresos_csv_omite_duplicados(self):
+        contenido = (
+            'fecha,monto,descripcion,fuente\n'
+            '2024-01-05,1000,Sueldo Enero,sueldo\n'
+            '15/03/2024,"2.500,00",Proyecto web,Freelance\n'
+            '2024-03-20,abc,Mal,Freelance\n'
+        ).encode()
+        archivo = SimpleUploadedFile('extracto.csv', contenido, content_type='text/csv')
+
+        response = self.client.post('/api/ingresos/import', {'archivo': archivo})
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual((data['procesadas'], data['creadas'], data['duplicadas']), (3, 1, 1))
+        self.assertEqual(data['errores'][0]['fila'], 4)
+
+        proyecto = Ingreso.objects.get(usuario=self.user, descripcion='Proyecto web')
+        self.assertEqual(proyecto.monto, Decimal('2500.00'))
+        self.assertEqual(proyecto.fuente.usuario, self.user)
+
+    def test_importar_ingresos_ofx_solo_creditos(self):
+        contenido = (
+            '<OFX><BANKTRANLIST>\n'
+            '<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240305<TRNAMT>-42.10<NAME>Kiosco</STMTTRN>\n'
+            '<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240306120000<TRNAMT>1000.00<NAME>Transferencia</STMTTRN>\n'
+            '</BANKTRANLIST></OFX>\n'
+        ).encode()
+        archivo = SimpleUploadedFile('extracto.ofx', contenido)
+
+        response = self.client.post('/api/ingresos/import?formato=ofx', {'archivo': archivo})
+        self.assertEqual(response.json()['creadas'], 1)
+
+        transferencia = Ingreso.objects.get(usuario=self.user, descripcion='Transferencia')
+        self.assertEqual(transferencia.fuente.nombre, 'Otro')
+
+    # -------------------------------------------------------
+    # BATCH
+    # -------------------------------------------------------
+    def test_lote_ingresos(self):
+        existente = Ingreso.objects.get(usuario=self.user, descripcion='Sueldo Enero')
+        otro = get_user_model().objects.create_user(username='otro_lote', password='12345')
+        ajena = Fuente.objects.create(usuario=otro, nombre='Ajena')
+
+        response = self.client.post('/api/ingresos/batch', {
+            'operaciones': [
+                {'op': 'create', 'fuente': self.fuente_sueldo.id, 'fecha': '2024-03-05', 'monto': '1200.00'},
+                {'op': 'create', 'fuente': ajena.id, 'fecha': '2024-03-05', 'monto': '10.00'},
+                {'op': 'update', 'id': existente.id, 'monto': '1050.00'},
+                {'op': 'delete', 'id': 999999},
+            ]
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        resultados = response.json()
+        self.assertEqual([r['ok'] for r in resultados], [True, False, True, False])
+
+        creado = Ingreso.objects.get(id=resultados[0]['id'])
+        self.assertEqual(creado.moneda, self.moneda_ars)
+        existente.refresh_from_db()
+        self.assertEqual(existente.monto, Decimal('1050.00'))
+
+    # -------------------------------------------------------
+    # ARCHIVO
+    # -------------------------------------------------------
+    def test_listado_columnar_con_archivo(self):
+        archivar(Ingreso, date(2024, 2, 1))
+
+        response = self.client.get(
+            '/api/ingresos/', {'fecha': '2024-01-05'},
+            HTTP_ACCEPT='application/vnd.spendwise.columnar+json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        datos = response.json()
+        self.assertEqual(datos['descripcion'], ['Sueldo Enero'])
+        self.assertEqual(datos['monto_cents'], [100000])
+        self.assertEqual(datos['fuente_id'], [self.fuente_sueldo.id])
+        self.assertEqual(datos['fuentes'], {str(self.fuente_sueldo.id): 'Sueldo'})
+        self.assertEqual(datos['monedas'], {str(self.moneda_ars.id): 'ARS'})
+
+    def test_ingreso_archivado_detalle_y_solo_lectura(self):
+        archivado = Ingreso.objects.get(usuario=self.user, descripcion='Sueldo Enero')
+        archivar(Ingreso, date(2024, 2, 1))
+
+        response = self.client.get(f'/api/ingresos/{archivado.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['descripcion'], 'Sueldo Enero')
+        self.assertEqual(self.client.get(f'/api/async/ingresos/{archivado.id}').status_code, 200)
+
+        response = self.client.put(f'/api/ingresos/{archivado.id}', {'monto': '1.00'}, content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.delete(f'/api/ingresos/{archivado.id}').status_code, 409)
+
+        response = self.client.get(reverse('ingresos'), {'fecha': '2024-01-05'})
+        self.assertEqual([i.archivado for i in response.context['ingresos']], [True])
@@ -3,23 +3,26 @@ from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.shortcuts import redirect
-from apps.ingreso.models import Ingreso, Fuente
+from apps.ingreso.models import Ingreso, IngresoArchivado, Fuente
 from apps.usuario.models import Moneda
 from datetime import datetime
-from decimal import Decimal
 from .forms import IngresoForm
 
 # Importar utilidades
-from apps.utils.calculations import calcular_variacion_mensual, asignar_iconos_y_colores_fuentes_ingresos, MESES_ES
+from apps.utils.calculations import asignar_iconos_y_colores_fuentes_ingresos, MESES_ES
+from apps.utils.resumen import resumen_mensual
 from apps.utils.filters import aplicar_filtros_basicos, aplicar_busqueda, obtener_valores_filtros
 from apps.utils.currency_mixins import ListViewCurrencyMixin
+from apps.utils.archivo import alcanza_archivo, marcar_archivado, unir_archivo
+from apps.utils.fragmentos import FragmentoListMixin
+from apps.utils.paginacion import KeysetPaginationMixin
 
 class UserIngresoQuerysetMixin:
     """Filtra los ingresos para que cada usuario solo vea los suyos."""
     def get_queryset(self):
         return Ingreso.objects.filter(usuario=self.request.user)
 
-class IngresoListView(LoginRequiredMixin, UserIngresoQuerysetMixin, ListViewCurrencyMixin, ListView):
+class IngresoListView(LoginRequiredMixin, UserIngresoQuerysetMixin, FragmentoListMixin, KeysetPaginationMixin, ListViewCurrencyMixin, ListView):
     """ Vista principal de Ingresos con:
     - Total mensual de ingresos.
     - Distribución de ingresos por fuente.
@@ -27,11 +30,32 @@ class IngresoListView(LoginRequiredMixin, UserIngresoQuerysetMixin, ListViewCurr
     """
     model = Ingreso
     template_name = 'ingreso/ingreso.html'
+    fragment_template_name = 'ingreso/ingreso_tabla.html'
     context_object_name = 'ingresos'
     paginate_by = 10
 
     def get_queryset(self):
-        queryset = super().get_queryset().select_related('fuente', 'moneda', 'usuario')
+        queryset = self._filtrar(super().get_queryset())
+
+        # Los ingresos archivados solo se leen si el filtro de fecha llega a ese rango
+        # (mismos parámetros que la API). Se listan como solo lectura.
+        if alcanza_archivo(
+            IngresoArchivado,
+            fecha=self.request.GET.get('fecha'),
+            year=self.request.GET.get('year'),
+        ):
+            archivados = IngresoArchivado.objects.filter(usuario=self.request.user)
+            return unir_archivo(
+                marcar_archivado(queryset, False),
+                marcar_archivado(self._filtrar(archivados), True),
+                *self.keyset_ordering,
+            )
+
+        return queryset.order_by(*self.keyset_ordering)
+
+    def _filtrar(self, queryset):
+        """Aplica búsqueda y filtros del request (sirve para Ingreso e IngresoArchivado)."""
+        queryset = queryset.select_related('fuente', 'moneda', 'usuario')
 
         queryset = aplicar_busqueda(queryset, self.request, ['descripcion', 'fuente__nombre'])
         queryset = aplicar_filtros_basicos(queryset, self.request)
@@ -44,60 +68,35 @@ class IngresoListView(LoginRequiredMixin, UserIngresoQuerysetMixin, ListViewCurr
         if moneda:
             queryset = queryset.filter(moneda__abreviatura=moneda)
 
-        return queryset.order_by('-fecha')
+        # Página pedida por cursor (keyset)
+        return self.aplicar_cursor(queryset)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+
+        # Asignar estilos de fuente directamente a cada ingreso del listado
+        # (ingresos_por_fuente solo cubre el mes actual; la tabla puede mostrar cualquier mes)
+        for ingreso in context['ingresos']:
+            raw_nombre = ingreso.fuente.nombre if ingreso.fuente else ''
+            styled = asignar_iconos_y_colores_fuentes_ingresos([{'fuente': raw_nombre}])
+            ingreso.icono_fuente = styled[0]['icono']
+            ingreso.color_icono_fuente = styled[0]['color_icono']
+            ingreso.color_badge_fuente = styled[0]['color_badge']
+
+        # Filtro o página nueva: solo la tabla, sin resumen ni formularios
+        if self.es_fragmento():
+            return context
+
         usuario = self.request.user
         hoy = datetime.now()
         user_currency = self.get_user_currency()
         
-        # Una consulta base para ingresos del mes
-        ingresos_mes = Ingreso.objects.filter(
-            usuario=usuario,
-            fecha__month=hoy.month,
-            fecha__year=hoy.year
-        ).select_related('moneda', 'fuente')
-        
-        # Calcular total y distribución en una iteración
-        total_ingresos_convertido = Decimal('0.00')
-        ingresos_por_fuente = {}
-        
-        for ingreso in ingresos_mes:
-            # Conversión de moneda
-            ingreso_currency = ingreso.moneda.abreviatura if ingreso.moneda else 'ARS'
-            monto_convertido = (
-                ingreso.monto 
-                if ingreso_currency == user_currency 
-                else self.convert_to_user_currency(ingreso.monto, ingreso_currency)
-            )
-            
-            total_ingresos_convertido += monto_convertido
-            
-            # Acumular por fuente al mismo tiempo
-            fuente_nombre = ingreso.fuente.nombre if ingreso.fuente else 'Sin fuente'
-            if fuente_nombre not in ingresos_por_fuente:
-                ingresos_por_fuente[fuente_nombre] = Decimal('0.00')
-            ingresos_por_fuente[fuente_nombre] += monto_convertido
-        
-        # Calcular porcentajes
-        ingresos_por_fuente_list = [
-            {
-                'fuente': fuente,
-                'total': monto,
-                'porcentaje': round((monto / total_ingresos_convertido * 100), 2) if total_ingresos_convertido > 0 else 0
-            }
-            for fuente, monto in ingresos_por_fuente.items()
-        ]
-        
-        # Ordenar por porcentaje (de mayor a menor)
-        ingresos_por_fuente_list.sort(key=lambda x: x['porcentaje'], reverse=True)
+        # Total, variación y distribución del mes en una sola consulta
+        resumen = resumen_mensual(usuario, user_currency, hoy.date(), tipos=('ingresos',))
+        ingresos_mes = resumen['ingresos']
         
         # Asignar iconos y colores
-        ingresos_por_fuente_list = asignar_iconos_y_colores_fuentes_ingresos(ingresos_por_fuente_list)
-        
-        # Calcular variación solo si es necesario
-        variacion = calcular_variacion_mensual(Ingreso, usuario)
+        ingresos_por_fuente_list = asignar_iconos_y_colores_fuentes_ingresos(ingresos_mes['distribucion'])
         
         # Filtros
         valores_filtros = obtener_valores_filtros(
@@ -108,21 +107,13 @@ class IngresoListView(LoginRequiredMixin, UserIngresoQuerysetMixin, ListViewCurr
         # Obtener moneda del usuario
         moneda_usuario = usuario.moneda.abreviatura if hasattr(usuario, 'moneda') and usuario.moneda else '$'
         
-        # Asignar estilos de fuente directamente a cada ingreso del listado
-        # (ingresos_por_fuente solo cubre el mes actual; la tabla puede mostrar cualquier mes)
-        for ingreso in context['ingresos']:
-            raw_nombre = ingreso.fuente.nombre if ingreso.fuente else ''
-            styled = asignar_iconos_y_colores_fuentes_ingresos([{'fuente': raw_nombre}])
-            ingreso.icono_fuente = styled[0]['icono']
-            ingreso.color_icono_fuente = styled[0]['color_icono']
-            ingreso.color_badge_fuente = styled[0]['color_badge']
-
         context.update({
-            'total_ingresos_mensual': total_ingresos_convertido,
-            'variacion_porcentual': variacion['variacion_porcentual'],
+            'total_ingresos_mensual': ingresos_mes['total_mes'],
+            'monedas_sin_convertir': resumen['sin_convertir'],
+            'variacion_porcentual': ingresos_mes['variacion_porcentual'],
             'mes_nombre': MESES_ES[hoy.month],
             'ingresos_por_fuente': ingresos_por_fuente_list,
-            'total_general': total_ingresos_convertido,
+            'total_general': ingresos_mes['total_mes'],
             'fuentes_disponibles': Fuente.objects.filter(usuario=self.request.user),
             'monedas_disponibles': Moneda.objects.filter(usuario=self.request.user),
             'moneda': moneda_usuario,
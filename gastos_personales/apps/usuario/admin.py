@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from apps.usuario.models import Usuario, Moneda
+from apps.usuario.models import Usuario, Moneda, ApiToken
 
 @admin.register(Usuario)
 class CustomUserAdmin(UserAdmin):
@@ -30,3 +30,23 @@ class CustomUserAdmin(UserAdmin):
 @admin.register(Moneda)
 class MonedaAdmin(admin.ModelAdmin):
     list_display = ('moneda', 'abreviatura')
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ('name', 'user', 'prefix', 'scopes', 'created_at', 'expires_at', 'revoked_at')
+    list_filter = ('revoked_at',)
+    search_fields = ('name', 'prefix', 'user__username')
+    readonly_fields = ('prefix', 'token_hash', 'created_at', 'revoked_at')
+    actions = ['revocar']
+
+    def has_add_permission(self, request):
+        # El valor en claro se muestra una sola vez al generarlo:
+        # los tokens se crean con `manage.py crear_token_api`
+        return False
+
+    @admin.action(description='Revocar tokens seleccionados')
+    def revocar(self, request, queryset):
+        # Uno por uno para que las señales invaliden la cache de cada token
+        for token in queryset.filter(revoked_at__isnull=True):
+            token.revoke()
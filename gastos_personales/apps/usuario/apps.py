@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class UsuarioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.usuario'
+
+    def ready(self):
+        from apps.utils.api_tokens import invalidar_token_api, invalidar_tokens_usuario
+        from .models import ApiToken, Usuario
+
+        # Mantener la cache de tokens de la API al día (ver apps/utils/api_tokens.py)
+        post_save.connect(invalidar_token_api, sender=ApiToken, dispatch_uid='usuario_token_guardado')
+        post_delete.connect(invalidar_token_api, sender=ApiToken, dispatch_uid='usuario_token_borrado')
+        post_save.connect(invalidar_tokens_usuario, sender=Usuario, dispatch_uid='usuario_tokens_usuario')
@@ -0,0 +1,40 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from apps.gasto.models import Gasto
+from apps.ingreso.models import Ingreso
+from apps.utils.archivo import archivar, ARCHIVE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = '''Mueve gastos e ingresos más antiguos que N años a las tablas de archivo.
+    Mantiene resúmenes mensuales por categoría/fuente y moneda de lo archivado.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('--anios', type=int, default=3,
+                            help='Antigüedad mínima (en años) de las transacciones a archivar')
+        parser.add_argument('--tipo', choices=['gastos', 'ingresos', 'todos'], default='todos')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['anios'] < 1:
+            raise CommandError('✗ --anios debe ser al menos 1')
+
+        hoy = date.today()
+        # 29/02 no existe en años no bisiestos: se usa el 01/03
+        try:
+            corte = hoy.replace(year=hoy.year - options['anios'])
+        except ValueError:
+            corte = date(hoy.year - options['anios'], 3, 1)
+
+        modelos = {'gastos': [Gasto], 'ingresos': [Ingreso], 'todos': [Gasto, Ingreso]}[options['tipo']]
+
+        self.stdout.write(f'Archivando transacciones anteriores al {corte}...\n')
+
+        for model in modelos:
+            nombre = model._meta.verbose_name_plural
+
+            def progreso(total):
+                self.stdout.write(f'  • {total} {nombre} archivados')
+
+            total = archivar(model, corte, batch_size=options['batch_size'], progreso=progreso)
+            self.stdout.write(self.style.SUCCESS(f'✓ {nombre}: {total} archivados'))
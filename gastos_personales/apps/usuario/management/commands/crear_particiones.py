@@ -0,0 +1,48 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from apps.gasto.models import Gasto
+from apps.ingreso.models import Ingreso
+from apps.utils.particiones import (
+    PERIODOS_ADELANTE, crear_particiones, esta_particionada, fin_horizonte,
+    intervalo_configurado, particionar_tabla,
+)
+
+
+class Command(BaseCommand):
+    help = '''Crea por adelantado las particiones futuras de gastos e ingresos (Postgres + DB_PARTITIONING).
+    Pensado para correr periódicamente, p. ej. una vez por mes desde cron.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('--periodos', type=int, default=PERIODOS_ADELANTE,
+                            help='Cantidad de años/meses a cubrir después del actual')
+        parser.add_argument('--convertir', action='store_true',
+                            help='Particionar las tablas que todavía no lo estén')
+
+    def handle(self, *args, **options):
+        intervalo = intervalo_configurado(connection)
+        if not intervalo:
+            raise CommandError('✗ El particionado requiere Postgres y DB_PARTITIONING=year|month')
+
+        hasta = fin_horizonte(intervalo, options['periodos'])
+
+        for model in (Gasto, Ingreso):
+            tabla = model._meta.db_table
+            with transaction.atomic(), connection.cursor() as cursor:
+                if not esta_particionada(cursor, tabla):
+                    if not options['convertir']:
+                        self.stdout.write(self.style.WARNING(
+                            f'○ {tabla} no está particionada (usar --convertir)'
+                        ))
+                        continue
+                    particionar_tabla(cursor, tabla, intervalo, options['periodos'])
+                    self.stdout.write(self.style.SUCCESS(f'✓ {tabla} convertida a tabla particionada'))
+                    continue
+
+                creadas = crear_particiones(cursor, tabla, date.today(), hasta, intervalo)
+
+            if creadas:
+                for nombre in creadas:
+                    self.stdout.write(self.style.SUCCESS(f'✓ Creada {nombre}'))
+            else:
+                self.stdout.write(f'○ {tabla}: particiones al día hasta {hasta}')
@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from apps.usuario.models import ApiToken
+
+
+class Command(BaseCommand):
+    help = '''Crea un token para la API (Authorization: Bearer <token>).
+    El token se muestra una sola vez: en la base solo queda su hash.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuario', required=True, help='Username del dueño del token')
+        parser.add_argument('--nombre', required=True, help='Descripción del token (ej: "App móvil")')
+        parser.add_argument('--scopes', nargs='+', choices=ApiToken.SCOPES, default=list(ApiToken.SCOPES))
+        parser.add_argument('--dias', type=int, default=None, help='Días hasta que vence (por defecto no vence)')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            usuario = User.objects.get(username=options['usuario'])
+        except User.DoesNotExist:
+            raise CommandError(f"✗ El usuario '{options['usuario']}' no existe")
+
+        token, valor = ApiToken.generate(usuario, options['nombre'], options['scopes'], options['dias'])
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Token "{token.name}" creado ({", ".join(token.scopes)})'))
+        self.stdout.write(valor)
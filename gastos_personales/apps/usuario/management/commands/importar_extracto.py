@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from apps.gasto.models import Gasto
+from apps.ingreso.models import Ingreso, Fuente
+from apps.categoria.models import Categoria
+from apps.utils.importacion import leer_extracto, importar_transacciones, IMPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = '''Importa un extracto bancario (CSV u OFX) como gastos o ingresos de un usuario.
+    Omite las transacciones ya cargadas (misma fecha, categoría/fuente y monto).'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del extracto')
+        parser.add_argument('--usuario', required=True, help='Username del dueño de las transacciones')
+        parser.add_argument('--tipo', choices=['gastos', 'ingresos'], default='gastos')
+        parser.add_argument('--formato', choices=['csv', 'ofx'], default=None,
+                            help='Por defecto se deduce de la extensión del archivo')
+        parser.add_argument('--defecto', default=None,
+                            help='Categoría/fuente para filas sin nombre')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            usuario = User.objects.select_related('moneda').get(username=options['usuario'])
+        except User.DoesNotExist:
+            raise CommandError(f"✗ El usuario '{options['usuario']}' no existe")
+
+        ruta = options['archivo']
+        formato = options['formato'] or ('ofx' if ruta.lower().endswith('.ofx') else 'csv')
+
+        if options['tipo'] == 'gastos':
+            destino = (Gasto, Categoria, 'categoria', options['defecto'] or 'Sin categoría', -1)
+        else:
+            destino = (Ingreso, Fuente, 'fuente', options['defecto'] or 'Otro', 1)
+        model, relacion_model, campo_relacion, nombre_defecto, signo = destino
+
+        def progreso(resultado):
+            self.stdout.write(
+                f"  • {resultado['procesadas']} filas procesadas "
+                f"({resultado['creadas']} nuevas, {resultado['duplicadas']} duplicadas)"
+            )
+
+        self.stdout.write(f'Importando {ruta} ({formato})...\n')
+
+        with open(ruta, 'rb') as archivo:
+            resultado = importar_transacciones(
+                usuario,
+                leer_extracto(archivo, formato, signo),
+                model,
+                relacion_model,
+                campo_relacion,
+                nombre_defecto,
+                chunk_size=options['chunk_size'],
+                progreso=progreso,
+            )
+
+        for error in resultado['errores']:
+            self.stdout.write(self.style.WARNING(f"○ Fila {error['fila']}: {error['error']}"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✓ Proceso completado: {resultado['creadas']} {options['tipo']} creados, "
+                f"{resultado['duplicadas']} duplicados omitidos"
+            )
+        )
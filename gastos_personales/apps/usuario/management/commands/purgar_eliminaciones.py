@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.utils.sincronizacion import purgar_eliminaciones
+
+
+class Command(BaseCommand):
+    help = '''Borra los registros de bajas (GET /api/sync) más viejos que la retención.
+    Los clientes con un cursor anterior reciben un snapshot completo.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=None,
+                            help='Retención en días (por defecto SYNC_RETENCION_DIAS)')
+
+    def handle(self, *args, **options):
+        if options['dias'] is not None and options['dias'] < 1:
+            raise CommandError('✗ --dias debe ser al menos 1')
+
+        total = purgar_eliminaciones(options['dias'])
+        self.stdout.write(self.style.SUCCESS(f'✓ {total} registros de bajas eliminados'))
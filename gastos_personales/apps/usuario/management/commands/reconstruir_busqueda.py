@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from apps.gasto.models import Gasto
+from apps.ingreso.models import Ingreso
+from apps.utils.busqueda import crear_indice
+
+
+class Command(BaseCommand):
+    help = '''Vuelve a crear los índices de búsqueda de gastos e ingresos (FTS5 en SQLite, tsvector + GIN en Postgres).
+    Necesario si una migración reconstruye las tablas en SQLite: se pierden los triggers que mantienen el índice.'''
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.stdout.write(self.style.WARNING(f'○ {connection.vendor}: la búsqueda usa icontains, no hay índice'))
+            return
+
+        for model in (Gasto, Ingreso):
+            with connection.schema_editor() as schema_editor:
+                crear_indice(schema_editor, model)
+            self.stdout.write(self.style.SUCCESS(f'✓ Índice de búsqueda de {model._meta.db_table} reconstruido'))
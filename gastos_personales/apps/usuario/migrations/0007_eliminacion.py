@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:16
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuario', '0006_version_datos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Eliminacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('gasto', 'Gasto'), ('ingreso', 'Ingreso'), ('categoria', 'Categoría'), ('fuente', 'Fuente')], max_length=20)),
+                ('objeto_id', models.BigIntegerField()),
+                ('eliminado', models.DateTimeField(default=django.utils.timezone.now)),
+                ('usuario', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['usuario', 'eliminado'], name='usuario_eli_usuario_550f67_idx')],
+            },
+        ),
+    ]
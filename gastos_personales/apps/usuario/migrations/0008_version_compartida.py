@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuario', '0007_eliminacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionCompartida',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('modificado', models.DateTimeField()),
+            ],
+        ),
+    ]
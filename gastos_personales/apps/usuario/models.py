@@ -71,4 +71,125 @@ class EmailVerification(models.Model):
         return 'invalid'
 
     def can_resend(self):
-        return (timezone.now() - self.created_at).total_seconds() >= self.RESEND_COOLDOWN_SECONDS
\ No newline at end of file
+        return (timezone.now() - self.created_at).total_seconds() >= self.RESEND_COOLDOWN_SECONDS
+
+class ApiToken(models.Model):
+    """
+    Token para la API (Authorization: Bearer <token>).
+    Solo se guarda el SHA-256 del token; el valor en claro se muestra una vez al crearlo.
+    """
+    SCOPE_READ = 'read'
+    SCOPE_WRITE = 'write'
+    SCOPES = (SCOPE_READ, SCOPE_WRITE)
+    PREFIX_LENGTH = 8
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='api_tokens',
+    )
+    name = models.CharField(max_length=100)
+    prefix = models.CharField(max_length=PREFIX_LENGTH, db_index=True)
+    token_hash = models.CharField(max_length=64, unique=True)
+    scopes = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.prefix}…)"
+
+    @staticmethod
+    def hash(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @classmethod
+    def generate(cls, user, name, scopes=SCOPES, days=None):
+        """Creates a token. Returns (instance, plain_token)."""
+        token = secrets.token_urlsafe(32)
+        obj = cls.objects.create(
+            user=user,
+            name=name,
+            prefix=token[:cls.PREFIX_LENGTH],
+            token_hash=cls.hash(token),
+            scopes=list(scopes),
+            expires_at=timezone.now() + timedelta(days=days) if days else None,
+        )
+        return obj, token
+
+    def is_active(self):
+        if self.revoked_at:
+            return False
+        return self.expires_at is None or self.expires_at > timezone.now()
+
+    def revoke(self):
+        self.revoked_at = timezone.now()
+        self.save(update_fields=['revoked_at'])
+
+
+class VersionDatos(models.Model):
+    """
+    Versión de los datos de un usuario: se incrementa con cada escritura de sus
+    gastos, ingresos, categorías, fuentes o monedas. La API la usa como ETag.
+    """
+    usuario = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='version_datos',
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    modificado = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.usuario_id} v{self.version}"
+
+
+class VersionCompartida(models.Model):
+    """
+    Versión de los datos compartidos por todos los usuarios (categorías sin
+    usuario, colores e íconos). Es una sola fila; la API la combina con la
+    VersionDatos del usuario en el ETag.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    modificado = models.DateTimeField()
+
+    def __str__(self):
+        return f"compartida v{self.version}"
+
+
+class Eliminacion(models.Model):
+    """
+    Registro (tombstone) de un gasto, ingreso, categoría o fuente eliminado:
+    GET /api/sync informa las bajas a los clientes offline a partir de acá.
+
+    `usuario` no tiene constraint en la base: al borrar un usuario sus datos se
+    eliminan en cascada y se registran mientras el propio usuario se borra.
+    """
+    TIPO_GASTO = 'gasto'
+    TIPO_INGRESO = 'ingreso'
+    TIPO_CATEGORIA = 'categoria'
+    TIPO_FUENTE = 'fuente'
+    TIPOS = [
+        (TIPO_GASTO, 'Gasto'),
+        (TIPO_INGRESO, 'Ingreso'),
+        (TIPO_CATEGORIA, 'Categoría'),
+        (TIPO_FUENTE, 'Fuente'),
+    ]
+
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name='+',
+    )
+    tipo = models.CharField(max_length=20, choices=TIPOS)
+    objeto_id = models.BigIntegerField()
+    eliminado = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=['usuario', 'eliminado'])]
+
+    def __str__(self):
+        return f"{self.tipo} {self.objeto_id} ({self.eliminado:%Y-%m-%d %H:%M})"
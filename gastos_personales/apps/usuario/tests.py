@@ -1,6 +1,13 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from apps.usuario.models import ApiToken
+from apps.categoria.models import Categoria
+from apps.utils.api_tokens import verificar_token
 
 User = get_user_model()
 
@@ -35,6 +42,20 @@ class AuthFlowTests(TestCase):
         })
         self.assertTrue(r.status_code in [200, 302])
 
+    @override_settings(RATE_LIMITS={'login': (2, 300)})
+    @patch("apps.utils.limites._ahora_ms", return_value=1_700_000_000_000)
+    def test_login_limita_intentos_por_ip(self, _):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        datos = {"username": "u1", "password": "incorrecta"}
+        for _ in range(2):
+            self.assertEqual(self.client.post(reverse("login"), datos).status_code, 200)
+
+        r = self.client.post(reverse("login"), datos)
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(r["Retry-After"], "150")
+        # Ver el formulario no consume intentos
+        self.assertEqual(self.client.get(reverse("login")).status_code, 200)
 
     def test_register_duplicate_email_shows_error(self):
         User.objects.create_user(username="otro", email="dup@mail.com", password="XyZ12345!")
@@ -52,3 +73,66 @@ class AuthFlowTests(TestCase):
 
 
 
+
+
+class ApiTokenTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="token_user", email="token@mail.com", password="Passw0rd!123"
+        )
+        self.token, self.valor = ApiToken.generate(self.user, "Cliente de prueba")
+
+    def _get(self, valor, path="/api/categorias/"):
+        return self.client.get(path, HTTP_AUTHORIZATION=f"Bearer {valor}")
+
+    def test_token_guardado_hasheado(self):
+        self.assertNotEqual(self.token.token_hash, self.valor)
+        self.assertEqual(self.token.token_hash, ApiToken.hash(self.valor))
+        self.assertEqual(self.token.prefix, self.valor[:ApiToken.PREFIX_LENGTH])
+
+    def test_admin_no_permite_crear_tokens(self):
+        admin = User.objects.create_superuser(username="admin_tokens", password="Passw0rd!123")
+        self.client.force_login(admin)
+        self.assertEqual(self.client.get(reverse("admin:usuario_apitoken_add")).status_code, 403)
+        self.assertEqual(self.client.get(reverse("admin:usuario_apitoken_changelist")).status_code, 200)
+
+    def test_autentica_y_cachea(self):
+        self.assertEqual(self._get(self.valor).status_code, 200)
+        self.assertEqual(self._get("invalido").status_code, 401)
+        # Los inválidos no ocupan la cache compartida
+        self.assertIsNone(cache.get(f"api_token:{ApiToken.hash('invalido')}"))
+        self.assertIsNotNone(cache.get(f"api_token:{ApiToken.hash(self.valor)}"))
+
+        # Ya verificado: no hace falta consultar la base
+        with self.assertNumQueries(0):
+            self.assertEqual(verificar_token(self.valor, ApiToken.SCOPE_READ), self.user)
+
+    def test_revocado_y_vencido(self):
+        self.assertEqual(self._get(self.valor).status_code, 200)
+
+        self.token.revoke()
+        self.assertEqual(self._get(self.valor).status_code, 401)
+
+        _, vencido = ApiToken.generate(self.user, "Vencido")
+        ApiToken.objects.filter(name="Vencido").update(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(self._get(vencido).status_code, 401)
+
+    def test_scopes(self):
+        _, lectura = ApiToken.generate(self.user, "Solo lectura", scopes=[ApiToken.SCOPE_READ])
+        self.assertEqual(self._get(lectura).status_code, 200)
+
+        payload = {"nombre": "Nueva", "icono": "tag", "color_nombre": "Azul", "color_hex": "#0000FF"}
+
+        response = self.client.post(
+            "/api/categorias/", data=payload, content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {lectura}",
+        )
+        self.assertEqual(response.status_code, 401)
+
+        # Con scope 'write' el endpoint recibe el usuario del token en request.user
+        response = self.client.post(
+            "/api/categorias/", data=payload, content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {self.valor}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Categoria.objects.filter(nombre="Nueva", usuario=self.user).exists())
@@ -7,10 +7,12 @@ from django.core.mail import send_mail
 from django.shortcuts import redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, View
 
 from .forms import CustomUserCreationForm
 from .models import EmailVerification
+from apps.utils.limites import limitar_vista
 
 User = get_user_model()
 
@@ -81,6 +83,7 @@ class RegisterView(CreateView):
         return redirect(f"/verificar-email/?uid={user.pk}")
 
 
+@method_decorator(limitar_vista('login'), name='dispatch')
 class CustomLoginView(LoginView):
     template_name = "usuario/login.html"
 
@@ -174,6 +177,7 @@ class VerifyEmailView(View):
         return render(request, self.template_name, ctx)
 
 
+@method_decorator(limitar_vista('reenvio_verificacion'), name='dispatch')
 class ResendVerificationView(View):
     def post(self, request):
         uid = request.POST.get('uid')
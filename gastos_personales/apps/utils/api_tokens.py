@@ -0,0 +1,145 @@
+"""
+Verificación de tokens de API (ApiToken) con cache en dos niveles.
+Ubicación: apps/utils/api_tokens.py
+
+1. LRU en proceso: API_TOKEN_LRU_SIZE entradas válidas API_TOKEN_LRU_TTL segundos.
+2. Cache compartida de Django: API_TOKEN_CACHE_TIMEOUT segundos.
+3. Base de datos, solo si el token no está en ninguna de las dos.
+
+Los tokens inválidos solo se recuerdan en el LRU, que tiene tamaño fijo:
+mandar valores al azar en Authorization no llena la cache compartida.
+
+Cada entrada guarda el usuario (con su moneda), los scopes y el vencimiento,
+así una request autenticada no consulta la base en régimen estable.
+
+Revocar, borrar o editar un token, o modificar a su usuario, invalida ambas
+caches vía señales (ver apps/usuario/apps.py). Los demás procesos ven el
+cambio cuando vence su LRU.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from apps.usuario.models import ApiToken
+
+_INVALIDO = 'invalido'
+
+
+class _LRU:
+    """Diccionario LRU con vencimiento, seguro entre threads."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            valor, guardado = entrada
+            if time.monotonic() - guardado > self.ttl:
+                del self._datos[clave]
+                return None
+            self._datos.move_to_end(clave)
+            return valor
+
+    def set(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = (valor, time.monotonic())
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def pop(self, clave):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+
+
+_lru = _LRU(
+    getattr(settings, 'API_TOKEN_LRU_SIZE', 1024),
+    getattr(settings, 'API_TOKEN_LRU_TTL', 30),
+)
+
+
+def _cache_key(token_hash):
+    return f'api_token:{token_hash}'
+
+
+def _cargar(token_hash):
+    """Lee el token de la base. Tokens inexistentes, revocados o de usuarios inactivos quedan como inválidos."""
+    token = (
+        ApiToken.objects
+        .select_related('user', 'user__moneda')
+        .filter(token_hash=token_hash)
+        .first()
+    )
+    if token is None or token.revoked_at or not token.user.is_active:
+        return _INVALIDO
+
+    return {
+        'usuario': token.user,
+        'scopes': frozenset(token.scopes),
+        'expires_at': token.expires_at,
+    }
+
+
+def verificar_token(token, scope=None):
+    """
+    Valida un token en claro y devuelve su usuario.
+
+    Args:
+        token: Valor recibido en Authorization: Bearer
+        scope: Scope requerido (ApiToken.SCOPE_READ / SCOPE_WRITE) o None
+
+    Returns:
+        Usuario (copia propia de la request) o None si el token no es válido
+    """
+    token_hash = ApiToken.hash(token)
+
+    datos = _lru.get(token_hash)
+    if datos is None:
+        datos = cache.get(_cache_key(token_hash))
+        if datos is None:
+            datos = _cargar(token_hash)
+            if datos != _INVALIDO:
+                cache.set(_cache_key(token_hash), datos, getattr(settings, 'API_TOKEN_CACHE_TIMEOUT', 300))
+        _lru.set(token_hash, datos)
+
+    if datos == _INVALIDO:
+        return None
+    if datos['expires_at'] and datos['expires_at'] <= timezone.now():
+        return None
+    if scope and scope not in datos['scopes']:
+        return None
+
+    # Cada request recibe su propia instancia: la cacheada se comparte entre threads
+    return copy.copy(datos['usuario'])
+
+
+def invalidar_token(token_hash):
+    """Quita un token de ambas caches; la próxima verificación lee la base."""
+    _lru.pop(token_hash)
+    cache.delete(_cache_key(token_hash))
+
+
+def invalidar_token_api(sender, instance, **kwargs):
+    """Señal post_save/post_delete de ApiToken."""
+    invalidar_token(instance.token_hash)
+
+
+def invalidar_tokens_usuario(sender, instance, update_fields=None, **kwargs):
+    """Señal post_save del usuario: los tokens cacheados guardan una copia del usuario."""
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    for token_hash in ApiToken.objects.filter(user=instance).values_list('token_hash', flat=True):
+        invalidar_token(token_hash)
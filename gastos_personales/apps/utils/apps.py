@@ -0,0 +1,36 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete, post_migrate
+
+
+class UtilsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.utils'
+
+    def ready(self):
+        from .sqlite import configurar_sqlite
+        connection_created.connect(configurar_sqlite, dispatch_uid='utils_configurar_sqlite')
+
+        # Versión de datos por usuario para los GETs condicionales (ver apps/utils/versionado.py)
+        from .versionado import cambio_en_datos_usuario, cambio_en_datos_compartidos, cambio_en_usuario
+        from apps.gasto.models import Gasto
+        from apps.ingreso.models import Ingreso, Fuente
+        from apps.categoria.models import Categoria, Color, Icono
+        from apps.usuario.models import Moneda, Usuario
+
+        for model in (Gasto, Ingreso, Fuente, Categoria, Moneda):
+            for signal in (post_save, post_delete):
+                signal.connect(cambio_en_datos_usuario, sender=model, dispatch_uid=f'utils_version_{model.__name__}')
+        for model in (Color, Icono):
+            for signal in (post_save, post_delete):
+                signal.connect(cambio_en_datos_compartidos, sender=model, dispatch_uid=f'utils_version_{model.__name__}')
+        post_save.connect(cambio_en_usuario, sender=Usuario, dispatch_uid='utils_version_usuario')
+
+        # Registro de bajas para GET /api/sync (ver apps/utils/sincronizacion.py)
+        from .sincronizacion import registrar_eliminacion
+        for model in (Gasto, Ingreso, Fuente, Categoria):
+            post_delete.connect(registrar_eliminacion, sender=model, dispatch_uid=f'utils_eliminacion_{model.__name__}')
+
+        # Índices de búsqueda que una migración posterior pudo dejar sin triggers (ver apps/utils/busqueda.py)
+        from .busqueda import reponer_indices
+        post_migrate.connect(reponer_indices, dispatch_uid='utils_reponer_indices_busqueda')
@@ -0,0 +1,218 @@
+"""
+Archivo de transacciones antiguas.
+Ubicación: apps/utils/archivo.py
+
+`manage.py archivar_transacciones` mueve por lotes los gastos/ingresos más
+viejos que N años a tablas de archivo (GastoArchivado, IngresoArchivado) y
+acumula sus totales en resúmenes mensuales por categoría/fuente y moneda.
+Así las tablas calientes y sus índices quedan chicos.
+
+Las lecturas consultan el archivo solo cuando el filtro de fechas llega al
+rango archivado (alcanza_archivo); en ese caso se une con la tabla caliente
+en una sola consulta (unir_archivo). Los cálculos sobre el historial
+completo suman los resúmenes mensuales en lugar de leer las filas archivadas.
+
+Las filas archivadas son de solo lectura: sus montos ya están sumados en los
+resúmenes. El detalle por id las busca también en el archivo
+(obtener_con_archivo); editarlas o borrarlas responde 409 y los listados las
+muestran sin acciones (anotación `archivado`).
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Max, Value
+from django.shortcuts import get_object_or_404
+from apps.utils.sincronizacion import sin_eliminaciones
+from apps.utils.versionado import agrupar_versiones, marcar_cambio
+
+ARCHIVE_BATCH_SIZE = 1000
+ARCHIVO_CACHE_TIMEOUT = 300  # 5 minutos
+
+
+def modelos_archivo(model):
+    """
+    Devuelve los modelos de archivo asociados a Gasto o Ingreso.
+
+    Returns:
+        tuple: (archivo_model, resumen_model, campo_relacion)
+    """
+    from apps.gasto.models import Gasto, GastoArchivado, GastoResumenMensual
+    from apps.ingreso.models import Ingreso, IngresoArchivado, IngresoResumenMensual
+
+    return {
+        Gasto: (GastoArchivado, GastoResumenMensual, 'categoria'),
+        Ingreso: (IngresoArchivado, IngresoResumenMensual, 'fuente'),
+    }[model]
+
+
+def _cache_key(archivo_model):
+    return f'archivo:limite:{archivo_model._meta.db_table}'
+
+
+def limite_archivo(archivo_model):
+    """Fecha más reciente archivada (cacheada), o None si el archivo está vacío."""
+    key = _cache_key(archivo_model)
+    limite = cache.get(key)
+
+    if limite is None:
+        limite = archivo_model.objects.aggregate(limite=Max('fecha'))['limite'] or ''
+        cache.set(key, limite, ARCHIVO_CACHE_TIMEOUT)
+
+    return limite or None
+
+
+def alcanza_archivo(archivo_model, fecha=None, year=None, desde=None, hasta=None):
+    """
+    Indica si un filtro de fechas llega al rango archivado.
+    Sin filtro de fechas se leen solo las tablas calientes.
+
+    Args:
+        archivo_model: GastoArchivado o IngresoArchivado
+        fecha: Fecha exacta (date o 'YYYY-MM-DD')
+        year: Año
+        desde / hasta: Rango de fechas; solo `hasta` se considera abierto hacia atrás
+
+    Returns:
+        bool
+    """
+    if not (fecha or year or desde or hasta):
+        return False
+
+    limite = limite_archivo(archivo_model)
+    if limite is None:
+        return False
+
+    try:
+        if fecha:
+            return _a_fecha(fecha) <= limite
+        if year:
+            return int(year) <= limite.year
+        if desde:
+            return _a_fecha(desde) <= limite
+    except (TypeError, ValueError):
+        return False
+
+    return True
+
+
+def _a_fecha(valor):
+    return valor if isinstance(valor, date) else date.fromisoformat(valor)
+
+
+def unir_archivo(queryset, archivo_queryset, *ordering):
+    """
+    Une el queryset de la tabla caliente con el equivalente del archivo.
+    Ambos deben tener los mismos filtros y select_related; el resultado son
+    instancias del modelo caliente. Solo se puede ordenar por columnas propias.
+    """
+    return queryset.order_by().union(archivo_queryset.order_by(), all=True).order_by(*ordering)
+
+
+def marcar_archivado(queryset, archivado):
+    """Anota `archivado` (True/False) para que el listado distinga las filas de solo lectura."""
+    return queryset.annotate(archivado=Value(archivado, output_field=BooleanField()))
+
+
+def obtener_con_archivo(model, *relacionados, **filtros):
+    """
+    Busca una fila en la tabla caliente y, si no está, en el archivo.
+
+    Args:
+        model: Gasto o Ingreso
+        relacionados: Campos para select_related
+        filtros: Filtros de la fila (id, usuario)
+
+    Returns:
+        tuple: (instancia, archivada)
+
+    Raises:
+        Http404 si no está en ninguna de las dos tablas
+    """
+    obj = model.objects.select_related(*relacionados).filter(**filtros).first()
+    if obj is not None:
+        return obj, False
+    archivo_model = modelos_archivo(model)[0]
+    return get_object_or_404(archivo_model.objects.select_related(*relacionados), **filtros), True
+
+
+def archivar(model, antes_de, batch_size=ARCHIVE_BATCH_SIZE, progreso=None):
+    """
+    Mueve a las tablas de archivo las transacciones con fecha anterior a `antes_de`.
+
+    Cada lote es una transacción: copia las filas al archivo, suma sus montos
+    a los resúmenes mensuales y las borra de la tabla caliente.
+
+    Args:
+        model: Gasto o Ingreso
+        antes_de: Fecha de corte (exclusiva)
+        batch_size: Filas por lote
+        progreso: Callback opcional que recibe el total archivado tras cada lote
+
+    Returns:
+        int: Cantidad de filas archivadas
+    """
+    archivo_model, resumen_model, campo_relacion = modelos_archivo(model)
+    campos = [field.attname for field in model._meta.concrete_fields]
+    total = 0
+
+    while True:
+        with agrupar_versiones(), transaction.atomic():
+            filas = list(
+                model.objects.select_for_update()
+                .filter(fecha__lt=antes_de)
+                .order_by('id')
+                .values(*campos)[:batch_size]
+            )
+            if not filas:
+                break
+
+            archivo_model.objects.bulk_create([archivo_model(**fila) for fila in filas])
+            _acumular_resumenes(resumen_model, f'{campo_relacion}_id', filas)
+            # Archivar no es una baja: los clientes sincronizados conservan las filas
+            with sin_eliminaciones():
+                model.objects.filter(id__in=[fila['id'] for fila in filas]).delete()
+            for usuario_id in {fila['usuario_id'] for fila in filas}:
+                marcar_cambio(usuario_id)
+
+        total += len(filas)
+        if progreso:
+            progreso(total)
+
+    cache.delete(_cache_key(archivo_model))
+    return total
+
+
+def _acumular_resumenes(resumen_model, campo_relacion, filas):
+    """Suma las filas de un lote a los resúmenes (usuario, mes, categoría/fuente, moneda)."""
+    grupos = defaultdict(lambda: [Decimal('0.00'), 0])
+    for fila in filas:
+        mes = fila['fecha'].replace(day=1)
+        clave = (fila['usuario_id'], mes, fila[campo_relacion], fila['moneda_id'])
+        grupos[clave][0] += fila['monto']
+        grupos[clave][1] += 1
+
+    existentes = {
+        (r.usuario_id, r.mes, getattr(r, campo_relacion), r.moneda_id): r
+        for r in resumen_model.objects.filter(
+            usuario_id__in={clave[0] for clave in grupos},
+            mes__in={clave[1] for clave in grupos},
+        )
+    }
+
+    nuevos, actualizados = [], []
+    for (usuario_id, mes, relacion_id, moneda_id), (monto, cantidad) in grupos.items():
+        resumen = existentes.get((usuario_id, mes, relacion_id, moneda_id))
+        if resumen:
+            resumen.total += monto
+            resumen.cantidad += cantidad
+            actualizados.append(resumen)
+        else:
+            nuevos.append(resumen_model(
+                usuario_id=usuario_id, mes=mes, moneda_id=moneda_id,
+                total=monto, cantidad=cantidad, **{campo_relacion: relacion_id},
+            ))
+
+    resumen_model.objects.bulk_create(nuevos)
+    resumen_model.objects.bulk_update(actualizados, ['total', 'cantidad'])
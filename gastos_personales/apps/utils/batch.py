@@ -0,0 +1,134 @@
+"""
+Aplicación de operaciones en lote (create / update / delete) para la API.
+Ubicación: apps/utils/batch.py
+
+Pensado para clientes offline que reenvían su cola de cambios: todas las
+operaciones se validan juntas, las FKs y los objetos a modificar se
+resuelven con una consulta cada uno y los cambios se aplican con
+bulk_create / bulk_update / delete dentro de una sola transacción.
+
+Los objetos a modificar se leen dentro de esa transacción con
+select_for_update, y cada update escribe solo los campos que trajo su
+operación: un lote que cambia el monto no pisa la descripción que otro
+cliente editó mientras tanto.
+"""
+from collections import defaultdict
+from django.db import transaction
+from django.utils import timezone
+from apps.utils.versionado import agrupar_versiones, marcar_cambio
+
+OPERACIONES_LOTE = ('create', 'update', 'delete')
+MAX_OPERACIONES_LOTE = 500
+
+
+def aplicar_lote(usuario, operaciones, model, campos, requeridos, relaciones=None, valores_fijos=None):
+    """
+    Valida y aplica un lote de operaciones sobre un modelo del usuario.
+
+    Args:
+        usuario: Usuario autenticado
+        operaciones: Lista de schemas con 'op', 'id' y los campos de `campos`
+        model: Modelo destino (Gasto, Ingreso, Categoria)
+        campos: Dict {campo_payload: campo_modelo} (ej: {'categoria': 'categoria_id'})
+        requeridos: Campos del payload obligatorios al crear
+        relaciones: Dict {campo_payload: queryset} con los objetos válidos para cada FK
+        valores_fijos: Valores asignados a todo objeto creado (usuario, moneda...)
+
+    Returns:
+        list: Un resultado por operación, en el mismo orden que la entrada:
+            {'indice', 'op', 'id', 'ok', 'error'}
+    """
+    relaciones = relaciones or {}
+    valores_fijos = valores_fijos or {}
+    resultados = [
+        {'indice': i, 'op': op.op, 'id': op.id, 'ok': False, 'error': None}
+        for i, op in enumerate(operaciones)
+    ]
+
+    # bulk_create/bulk_update no emiten señales: la versión de datos se marca acá
+    with agrupar_versiones(), transaction.atomic():
+        crear, actualizar, eliminar = _validar(
+            usuario, operaciones, resultados, model, campos, requeridos, relaciones, valores_fijos
+        )
+        if crear:
+            model.objects.bulk_create([obj for obj, _ in crear])
+        if actualizar:
+            # bulk_update no aplica auto_now: updated_at se asigna a mano (GET /api/sync)
+            ahora = timezone.now()
+            por_campos = defaultdict(dict)
+            for obj, _, campos_op in actualizar:
+                obj.updated_at = ahora
+                if campos_op:
+                    por_campos[frozenset(campos_op)][obj.pk] = obj
+            # Un bulk_update por conjunto de campos: cada fila escribe solo lo que se pidió
+            for campos_grupo, objs in por_campos.items():
+                model.objects.bulk_update(list(objs.values()), [*sorted(campos_grupo), 'updated_at'])
+        if eliminar:
+            model.objects.filter(id__in=[obj.id for obj, _ in eliminar]).delete()
+        if crear or actualizar or eliminar:
+            marcar_cambio(usuario.id)
+
+    for obj, resultado, *_ in crear + actualizar + eliminar:
+        resultado['id'] = obj.id
+        resultado['ok'] = True
+
+    return resultados
+
+
+def _validar(usuario, operaciones, resultados, model, campos, requeridos, relaciones, valores_fijos):
+    """
+    Resuelve objetos y FKs, valida cada operación y anota los errores en `resultados`.
+    Se llama dentro de la transacción del lote: los objetos quedan bloqueados hasta el commit.
+
+    Returns:
+        tuple: (crear, actualizar, eliminar) con (obj, resultado) y, en los
+        updates, además los campos del modelo que cambia esa operación
+    """
+    # Resolver en bloque los objetos existentes y las FKs referenciadas
+    ids_objetivo = {op.id for op in operaciones if op.op != 'create' and op.id is not None}
+    existentes = (
+        model.objects.select_for_update().filter(usuario=usuario).in_bulk(ids_objetivo)
+        if ids_objetivo else {}
+    )
+
+    fks_validas = {}
+    for campo, queryset in relaciones.items():
+        ids = {getattr(op, campo) for op in operaciones if getattr(op, campo, None) is not None}
+        fks_validas[campo] = set(queryset.filter(id__in=ids).values_list('id', flat=True)) if ids else set()
+
+    crear, actualizar, eliminar = [], [], []
+
+    for op, resultado in zip(operaciones, resultados):
+        valores = {campo: getattr(op, campo, None) for campo in campos}
+        valores = {campo: valor for campo, valor in valores.items() if valor is not None}
+
+        invalidas = [
+            campo for campo in relaciones
+            if campo in valores and valores[campo] not in fks_validas[campo]
+        ]
+        if invalidas:
+            resultado['error'] = f"Referencia inválida: {', '.join(invalidas)}"
+            continue
+
+        if op.op == 'create':
+            faltantes = [campo for campo in requeridos if campo not in valores]
+            if faltantes:
+                resultado['error'] = f"Campos requeridos: {', '.join(faltantes)}"
+                continue
+            obj = model(**valores_fijos, **{campos[c]: v for c, v in valores.items()})
+            crear.append((obj, resultado))
+            continue
+
+        obj = existentes.get(op.id)
+        if obj is None:
+            resultado['error'] = 'No encontrado'
+            continue
+
+        if op.op == 'update':
+            for campo, valor in valores.items():
+                setattr(obj, campos[campo], valor)
+            actualizar.append((obj, resultado, {campos[campo] for campo in valores}))
+        else:
+            eliminar.append((obj, resultado))
+
+    return crear, actualizar, eliminar
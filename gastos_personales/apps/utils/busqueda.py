@@ -0,0 +1,344 @@
+"""
+Búsqueda de texto en gastos e ingresos con índice full-text.
+Ubicación: apps/utils/busqueda.py
+
+`icontains` sobre la descripción y el nombre de la categoría/fuente recorre
+toda la tabla (LIKE '%...%' con JOIN) en cada búsqueda. Los modelos de
+INDICES_BUSQUEDA tienen un índice según el motor:
+
+- SQLite: tabla virtual FTS5 `<tabla>_busqueda` (rowid = id de la fila) con
+  la descripción y el nombre de la relación. La mantienen triggers sobre la
+  tabla y sobre la de categorías/fuentes, así que también cubre bulk_create,
+  update() y el archivado.
+- Postgres: tabla `<tabla>_busqueda` (id, documento) con un único tsvector
+  de la descripción y el nombre de la relación, índice GIN y triggers con la
+  misma cobertura que en SQLite. Config 'simple' (sin stemming) y tildes
+  quitadas con translate(), igual que el tokenizer de FTS5: las palabras
+  pueden estar repartidas entre las dos columnas.
+- Otros motores, SEARCH_BACKEND='icontains' o modelos sin índice (archivo,
+  categorías): icontains sobre los campos pedidos.
+
+Cada palabra buscada es un prefijo ("caf" encuentra "Café") y tienen que
+aparecer todas. Las migraciones `busqueda` de gasto e ingreso crean los
+índices; `python manage.py reconstruir_busqueda` los vuelve a armar (p. ej.
+si una migración reconstruye la tabla en SQLite y se pierden los triggers).
+Además, reponer_indices (post_migrate) vuelve a crear los índices a los que
+les falte una parte después de cada migrate.
+"""
+import re
+import unicodedata
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Modelo indexado: relación cuyo `nombre` también se busca
+INDICES_BUSQUEDA = {
+    'gasto.Gasto': 'categoria',
+    'ingreso.Ingreso': 'fuente',
+}
+CONFIG_POSTGRES = 'simple'
+CON_TILDE = 'áàâäãéèêëíìîïóòôöõúùûüñçÁÀÂÄÃÉÈÊËÍÌÎÏÓÒÔÖÕÚÙÛÜÑÇ'
+TOKENIZER_FTS5 = 'unicode61 remove_diacritics 2'
+
+ORDEN_RELEVANCIA = 'relevancia'
+
+
+def _terminos(texto):
+    """Palabras de la búsqueda, sin operadores ni comillas de FTS5/tsquery."""
+    return re.findall(r'\w+', texto)
+
+
+def _tabla_fts(model):
+    return f'{model._meta.db_table}_busqueda'
+
+
+def backend_busqueda(model, using='default'):
+    """
+    Índice disponible para el modelo en la conexión.
+
+    Returns:
+        'fts5', 'postgres' o None (sin índice: icontains)
+    """
+    if getattr(settings, 'SEARCH_BACKEND', 'auto') == 'icontains':
+        return None
+    if model._meta.label not in INDICES_BUSQUEDA:
+        return None
+    vendor = connections[using].vendor
+    if vendor == 'sqlite':
+        return 'fts5'
+    if vendor == 'postgresql':
+        return 'postgres'
+    return None
+
+
+def _icontains(queryset, texto, campos):
+    q_objects = Q()
+    for campo in campos:
+        q_objects |= Q(**{f'{campo}__icontains': texto})
+    return queryset.filter(q_objects)
+
+
+def buscar(queryset, texto, campos):
+    """
+    Filtra el queryset por el texto buscado.
+
+    Args:
+        queryset: QuerySet a filtrar
+        texto: Texto ingresado por el usuario
+        campos: Campos para icontains si el modelo no tiene índice
+                (ej: ['descripcion', 'categoria__nombre'])
+
+    Returns:
+        QuerySet filtrado (el índice cubre descripción y nombre de la relación)
+    """
+    texto = (texto or '').strip()
+    if not texto:
+        return queryset
+
+    terminos = _terminos(texto)
+    backend = backend_busqueda(queryset.model, queryset.db)
+    if not terminos or backend is None:
+        return _icontains(queryset, texto, campos)
+
+    fts = _tabla_fts(queryset.model)
+    if backend == 'fts5':
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM "{fts}" WHERE "{fts}" MATCH %s', [_match_fts5(terminos)]
+        ))
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT id FROM "{fts}" WHERE documento @@ to_tsquery(%s, %s)', [CONFIG_POSTGRES, _tsquery(terminos)]
+    ))
+
+
+def ordenar_por_relevancia(queryset, texto, *desempate):
+    """
+    Ordena los resultados de buscar() por relevancia (anotada como `relevancia`).
+    Sin índice todas las filas valen lo mismo y decide el desempate.
+    """
+    terminos = _terminos(texto or '')
+    backend = backend_busqueda(queryset.model, queryset.db)
+
+    if terminos and backend == 'fts5':
+        relevancia = _RelevanciaFTS5(queryset.model, terminos)
+    elif terminos and backend == 'postgres':
+        relevancia = _RelevanciaPostgres(queryset.model, terminos)
+    else:
+        relevancia = Value(0.0, output_field=FloatField())
+    return queryset.annotate(relevancia=relevancia).order_by('-relevancia', *desempate)
+
+
+# ==================== SQLITE (FTS5) ====================
+
+def _match_fts5(terminos):
+    return ' AND '.join(f'"{termino}"*' for termino in terminos)
+
+
+class _RelevanciaFTS5(Func):
+    """-bm25 de la fila (mayor = más relevante), calculado solo para las filas del resultado."""
+    output_field = FloatField()
+    # MATCH <consulta> AND rowid = <pk de la fila externa>
+    arg_joiner = ' AND rowid = '
+
+    def __init__(self, model, terminos):
+        self.tabla = _tabla_fts(model)
+        super().__init__(Value(_match_fts5(terminos)), F('pk'))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        template = (
+            f'(SELECT -bm25("{self.tabla}") FROM "{self.tabla}" '
+            f'WHERE "{self.tabla}" MATCH %(expressions)s)'
+        )
+        return super().as_sql(compiler, connection, template=template, **extra_context)
+
+
+def _sql_fts5(model):
+    """Tabla FTS5, carga inicial y triggers que la mantienen."""
+    tabla = model._meta.db_table
+    fts = _tabla_fts(model)
+    campo = model._meta.get_field(INDICES_BUSQUEDA[model._meta.label])
+    columna = campo.column
+    tabla_rel = campo.related_model._meta.db_table
+    nombre_rel = f'(SELECT nombre FROM "{tabla_rel}" WHERE id = new.{columna})'
+    insertar = f'INSERT INTO "{fts}"(rowid, descripcion, relacion) VALUES (new.id, new.descripcion, {nombre_rel});'
+    borrar = f'DELETE FROM "{fts}" WHERE rowid = old.id;'
+
+    return [
+        f"CREATE VIRTUAL TABLE \"{fts}\" USING fts5(descripcion, relacion, tokenize='{TOKENIZER_FTS5}')",
+        f'INSERT INTO "{fts}"(rowid, descripcion, relacion) '
+        f'SELECT t.id, t.descripcion, r.nombre FROM "{tabla}" t LEFT JOIN "{tabla_rel}" r ON r.id = t.{columna}',
+        f'CREATE TRIGGER "{fts}_ai" AFTER INSERT ON "{tabla}" BEGIN {insertar} END',
+        f'CREATE TRIGGER "{fts}_ad" AFTER DELETE ON "{tabla}" BEGIN {borrar} END',
+        f'CREATE TRIGGER "{fts}_au" AFTER UPDATE OF descripcion, {columna} ON "{tabla}" '
+        f'BEGIN {borrar} {insertar} END',
+        # Renombrar una categoría/fuente actualiza todas sus filas
+        f'CREATE TRIGGER "{fts}_rel_au" AFTER UPDATE OF nombre ON "{tabla_rel}" BEGIN '
+        f'UPDATE "{fts}" SET relacion = new.nombre WHERE rowid IN '
+        f'(SELECT id FROM "{tabla}" WHERE {columna} = new.id); END',
+    ]
+
+
+def _borrar_fts5(model):
+    fts = _tabla_fts(model)
+    return [f'DROP TRIGGER IF EXISTS "{fts}_{sufijo}"' for sufijo in ('ai', 'ad', 'au', 'rel_au')] + [
+        f'DROP TABLE IF EXISTS "{fts}"',
+    ]
+
+
+# ==================== POSTGRES (tsvector + GIN) ====================
+
+def _sin_tildes(texto):
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def _tsquery(terminos):
+    return ' & '.join(f'{_sin_tildes(termino).lower()}:*' for termino in terminos)
+
+
+class _RelevanciaPostgres(Func):
+    """ts_rank de la fila (mayor = más relevante), calculado solo para las filas del resultado."""
+    output_field = FloatField()
+    # to_tsquery(<consulta>) consulta WHERE id = <pk de la fila externa>
+    arg_joiner = ') consulta WHERE id = '
+
+    def __init__(self, model, terminos):
+        self.tabla = _tabla_fts(model)
+        super().__init__(Value(_tsquery(terminos)), F('pk'))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        template = (
+            f'(SELECT ts_rank(documento, consulta) FROM "{self.tabla}", '
+            f"to_tsquery('{CONFIG_POSTGRES}', %(expressions)s)"
+        )
+        return super().as_sql(compiler, connection, template=template, **extra_context)
+
+
+def _documento(descripcion, nombre):
+    """Expresión SQL del tsvector de la fila: descripción y nombre de la relación, sin tildes."""
+    sin_tildes = _sin_tildes(CON_TILDE)
+    partes = [f"to_tsvector('{CONFIG_POSTGRES}', translate(coalesce({columna}, ''), '{CON_TILDE}', '{sin_tildes}'))"
+              for columna in (descripcion, nombre)]
+    return ' || '.join(partes)
+
+
+def _sql_postgres(model):
+    """Tabla de documentos, carga inicial, índice GIN y triggers que la mantienen."""
+    tabla = model._meta.db_table
+    fts = _tabla_fts(model)
+    campo = model._meta.get_field(INDICES_BUSQUEDA[model._meta.label])
+    columna = campo.column
+    tabla_rel = campo.related_model._meta.db_table
+    nombre_rel = f'(SELECT nombre FROM "{tabla_rel}" WHERE id = NEW.{columna})'
+
+    return [
+        f'CREATE TABLE "{fts}" (id bigint PRIMARY KEY, documento tsvector NOT NULL)',
+        f'INSERT INTO "{fts}"(id, documento) '
+        f'SELECT t.id, {_documento("t.descripcion", "r.nombre")} '
+        f'FROM "{tabla}" t LEFT JOIN "{tabla_rel}" r ON r.id = t.{columna}',
+        f'CREATE INDEX "{fts}_documento" ON "{fts}" USING gin (documento)',
+        f'CREATE FUNCTION "{fts}_fn"() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN '
+        f'IF TG_OP <> \'INSERT\' THEN DELETE FROM "{fts}" WHERE id = OLD.id; END IF; '
+        f'IF TG_OP <> \'DELETE\' THEN INSERT INTO "{fts}"(id, documento) '
+        f'VALUES (NEW.id, {_documento("NEW.descripcion", nombre_rel)}); END IF; '
+        f'RETURN NULL; END $$',
+        # En una tabla particionada el trigger se replica en cada partición
+        f'CREATE TRIGGER "{fts}_tg" AFTER INSERT OR DELETE OR UPDATE OF descripcion, {columna} '
+        f'ON "{tabla}" FOR EACH ROW EXECUTE FUNCTION "{fts}_fn"()',
+        # Renombrar una categoría/fuente actualiza todas sus filas
+        f'CREATE FUNCTION "{fts}_rel_fn"() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN '
+        f'UPDATE "{fts}" b SET documento = {_documento("t.descripcion", "NEW.nombre")} '
+        f'FROM "{tabla}" t WHERE t.{columna} = NEW.id AND b.id = t.id; '
+        f'RETURN NULL; END $$',
+        f'CREATE TRIGGER "{fts}_rel_tg" AFTER UPDATE OF nombre ON "{tabla_rel}" '
+        f'FOR EACH ROW EXECUTE FUNCTION "{fts}_rel_fn"()',
+    ]
+
+
+def _borrar_postgres(model):
+    fts = _tabla_fts(model)
+    # CASCADE se lleva los triggers
+    return [f'DROP FUNCTION IF EXISTS "{fts}_{sufijo}"() CASCADE' for sufijo in ('fn', 'rel_fn')] + [
+        f'DROP TABLE IF EXISTS "{fts}"',
+    ]
+
+
+# ==================== CREACIÓN DE ÍNDICES ====================
+
+def crear_indice(schema_editor, model):
+    """Crea (o vuelve a crear) el índice de búsqueda del modelo. Sin efecto en otros motores."""
+    borrar_indice(schema_editor, model)
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in _sql_fts5(model):
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        for sql in _sql_postgres(model):
+            schema_editor.execute(sql)
+
+
+def borrar_indice(schema_editor, model):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in _borrar_fts5(model):
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        for sql in _borrar_postgres(model):
+            schema_editor.execute(sql)
+
+
+def indice_completo(connection, model):
+    """True si están la tabla del índice y todos sus triggers (o si el motor no usa índice)."""
+    fts = _tabla_fts(model)
+    campo = model._meta.get_field(INDICES_BUSQUEDA[model._meta.label])
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            piezas = [fts] + [f'{fts}_{sufijo}' for sufijo in ('ai', 'ad', 'au', 'rel_au')]
+            cursor.execute(
+                f"SELECT count(*) FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(piezas))})", piezas
+            )
+            return cursor.fetchone()[0] == len(piezas)
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT to_regclass(%s) IS NOT NULL, count(*) FROM pg_trigger '
+                'WHERE (tgrelid, tgname) IN ((%s::regclass, %s), (%s::regclass, %s))',
+                [f'"{fts}"', f'"{model._meta.db_table}"', f'{fts}_tg',
+                 f'"{campo.related_model._meta.db_table}"', f'{fts}_rel_tg'],
+            )
+            tabla, triggers = cursor.fetchone()
+            return tabla and triggers == 2
+    return True
+
+
+def reponer_indices(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate: vuelve a crear el índice de los modelos de la app si le
+    falta la tabla o algún trigger. En SQLite casi cualquier ALTER posterior
+    a la migración `busqueda` reconstruye la tabla y se lleva los triggers.
+    """
+    connection = connections[using]
+    aplicadas = MigrationRecorder(connection).applied_migrations()
+    for label in INDICES_BUSQUEDA:
+        app_label = label.split('.')[0]
+        if app_label != sender.label:
+            continue
+        # Si se revirtió la migración del índice no hay que reponerlo
+        if not any(app == app_label and nombre.endswith('_busqueda') for app, nombre in aplicadas):
+            continue
+        model = django_apps.get_model(label)
+        if not indice_completo(connection, model):
+            with connection.schema_editor() as schema_editor:
+                crear_indice(schema_editor, model)
+
+
+def indice_busqueda(app_label, model_name):
+    """Devuelve el par (forward, reverse) para migrations.RunPython."""
+
+    def forward(apps, schema_editor):
+        crear_indice(schema_editor, apps.get_model(app_label, model_name))
+
+    def reverse(apps, schema_editor):
+        borrar_indice(schema_editor, apps.get_model(app_label, model_name))
+
+    return forward, reverse
@@ -0,0 +1,125 @@
+"""
+Compresión de respuestas dinámicas (API y HTML).
+Ubicación: apps/utils/compresion.py
+
+CompresionMiddleware extiende GZipMiddleware de Django:
+- solo comprime tipos de texto/JSON (las imágenes ya vienen comprimidas);
+- no comprime respuestas menores a COMPRESSION_MIN_BYTES (las streaming,
+  como los exports, se comprimen siempre porque no se conoce su tamaño);
+- usa brotli si el cliente lo acepta (q > 0) y el paquete está instalado
+  (pip install brotli), y gzip en los demás casos;
+- el HTML va siempre con gzip: lleva el token CSRF junto con texto que
+  puede controlar un atacante (búsquedas, descripciones), y solo gzip agrega
+  el relleno aleatorio de Django contra BREACH. Brotli no tiene un campo
+  equivalente, así que se limita a la API y los exports.
+
+Los estáticos no pasan por acá: WhiteNoise sirve las versiones .br/.gz
+generadas por collectstatic (ver master/settings_production.py).
+"""
+import re
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_BROTLI_QUALITY = 4  # Rápido para respuestas dinámicas; los estáticos usan el máximo
+
+TIPOS_COMPRIMIBLES = {
+    'text/html',
+    'text/plain',
+    'text/csv',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'application/x-ndjson',
+    'application/x-msgpack',
+}
+
+# Respuestas que pueden llevar secretos (token CSRF): solo gzip, con relleno
+TIPOS_SIN_BROTLI = {'text/html'}
+
+_calidad = re.compile(r'\bq\s*=\s*([0-9.]+)')
+
+
+def _tipo(response):
+    return response.get('Content-Type', '').split(';')[0].strip().lower()
+
+
+def _comprimible(response):
+    tipo = _tipo(response)
+    return tipo in TIPOS_COMPRIMIBLES or tipo.endswith('+json')
+
+
+def acepta_codificacion(accept_encoding, codificacion):
+    """True si el Accept-Encoding incluye `codificacion` con calidad mayor a 0 (`br;q=0` la rechaza)."""
+    for parte in accept_encoding.split(','):
+        nombre, _, parametros = parte.partition(';')
+        if nombre.strip().lower() != codificacion:
+            continue
+        calidad = _calidad.search(parametros)
+        try:
+            return calidad is None or float(calidad.group(1)) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def _brotli_sequence(secuencia, quality):
+    compresor = brotli.Compressor(quality=quality)
+    for chunk in secuencia:
+        # Se vacía el compresor por chunk (como compress_sequence de Django)
+        # para que el cliente reciba las filas de un export a medida que salen
+        datos = compresor.process(chunk) + compresor.flush()
+        if datos:
+            yield datos
+    yield compresor.finish()
+
+
+class CompresionMiddleware(GZipMiddleware):
+    """GZipMiddleware con umbral de tamaño, filtro por tipo de contenido y brotli."""
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not _comprimible(response):
+            return response
+
+        minimo = getattr(settings, 'COMPRESSION_MIN_BYTES', COMPRESSION_MIN_BYTES)
+        if not response.streaming and len(response.content) < minimo:
+            return response
+
+        usar_brotli = (
+            brotli
+            and _tipo(response) not in TIPOS_SIN_BROTLI
+            and acepta_codificacion(request.META.get('HTTP_ACCEPT_ENCODING', ''), 'br')
+            and not (response.streaming and response.is_async)
+        )
+        if usar_brotli:
+            return self._comprimir_brotli(response)
+
+        return super().process_response(request, response)
+
+    def _comprimir_brotli(self, response):
+        quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', COMPRESSION_BROTLI_QUALITY)
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if response.streaming:
+            response.streaming_content = _brotli_sequence(response.streaming_content, quality)
+            del response.headers['Content-Length']
+        else:
+            comprimido = brotli.compress(response.content, quality=quality)
+            if len(comprimido) >= len(response.content):
+                return response
+            response.content = comprimido
+            response.headers['Content-Length'] = str(len(comprimido))
+
+        # Igual que GZipMiddleware: el ETag fuerte pasa a débil
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -9,6 +9,7 @@ from decimal import Decimal
 from django.db.models import Sum, Q, F, Value, DecimalField
 from django.db.models.functions import Coalesce
 from apps.utils.currency_service import CurrencyService
+from apps.utils.archivo import modelos_archivo
 from django.db.models import Count
 
 
@@ -95,14 +96,22 @@ class CurrencyConversionMixin:
 
         user_currency = self.get_user_currency()
         
-        # Obtener todos los items
+        # Items de la tabla caliente + resúmenes mensuales del historial archivado
+        # (cada resumen trae total y cantidad de un mes/categoría/moneda)
+        _, resumen_model, campo_relacion = modelos_archivo(model)
         items = model.objects.filter(usuario=usuario).select_related('moneda')
+        resumenes = resumen_model.objects.filter(usuario=usuario).select_related(
+            'moneda', campo_relacion
+        )
         
         # Agrupar manualmente por el campo
         grupos = {}
         total_general = Decimal('0.00')
         
-        for item in items:
+        filas = [(item, item.monto, 1) for item in items]
+        filas += [(resumen, resumen.total, resumen.cantidad) for resumen in resumenes]
+        
+        for item, monto, cantidad in filas:
             # Obtener el valor del campo (ej: 'Sueldo', 'Comida')
             field_value = item
             for field in field_name.split('__'):
@@ -119,9 +128,9 @@ class CurrencyConversionMixin:
             item_currency = item.moneda.abreviatura if item.moneda else 'ARS'
             
             if item_currency == user_currency:
-                monto_convertido = item.monto
+                monto_convertido = monto
             else:
-                monto_convertido = self.convert_to_user_currency(item.monto, item_currency)
+                monto_convertido = self.convert_to_user_currency(monto, item_currency)
             
             # Acumular en grupos
             if field_value not in grupos:
@@ -131,7 +140,7 @@ class CurrencyConversionMixin:
                 }
             
             grupos[field_value]['total'] += monto_convertido
-            grupos[field_value]['cantidad'] += 1
+            grupos[field_value]['cantidad'] += cantidad
             total_general += monto_convertido
         
         # Formatear resultado
@@ -148,6 +148,33 @@ class CurrencyService:
         
         return rates
     
+    @classmethod
+    def get_rates_snapshot(cls, to_currency: str) -> Dict[str, Optional[Decimal]]:
+        """
+        Obtiene de una sola vez las tasas de todas las monedas soportadas hacia
+        la moneda destino. Pensado para procesos largos (exportaciones,
+        estadísticas) que deben convertir muchas filas con la misma tasa.
+        
+        Args:
+            to_currency: Moneda destino
+            
+        Returns:
+            Dict {moneda_origen: tasa o None si no se pudo obtener}
+        """
+        monedas = ['ARS', *cls.CURRENCY_ENDPOINTS.keys()]
+        return {
+            moneda: cls.get_exchange_rate(moneda, to_currency)
+            for moneda in monedas
+        }
+    
+    @classmethod
+    def rates_version(cls) -> str:
+        """
+        Identifica el snapshot de tasas vigente. Se suma al ETag de las
+        respuestas con montos convertidos, que cambian aunque no cambien los datos.
+        """
+        return ','.join(f'{moneda}={tasa}' for moneda, tasa in sorted(cls.get_all_rates().items()))
+
     @classmethod
     def clear_cache(cls):
         """Limpia el caché de tasas de cambio."""
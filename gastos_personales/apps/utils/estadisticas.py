@@ -0,0 +1,145 @@
+"""
+Estadísticas de la API calculadas con agregados (GET /api/estadisticas/...).
+Ubicación: apps/utils/estadisticas.py
+
+Cada cálculo agrupa en la base por moneda (y por categoría/fuente o mes
+cuando corresponde) y convierte los subtotales a la moneda del usuario con
+un snapshot de tasas: la cantidad de consultas no depende del historial.
+Lo archivado se suma desde los resúmenes mensuales (ver apps/utils/archivo.py),
+por eso los filtros de período son por año y mes. Los subtotales en monedas
+sin tasa de cambio no se suman a los montos (sí a las cantidades).
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from django.db.models import Count, Sum
+from apps.utils.archivo import modelos_archivo
+from apps.utils.calculations import calcular_crecimiento
+from apps.utils.currency_service import CurrencyService
+
+# Nombre del grupo de las filas sin categoría/fuente (como en apps/utils/resumen.py)
+SIN_RELACION = {'categoria': 'Sin categoría', 'fuente': 'Sin fuente'}
+
+
+def _convertir(total, moneda, tasas, sin_convertir=None):
+    """Subtotal en la moneda del usuario; 0 (y la moneda a `sin_convertir`) si no hay tasa."""
+    moneda = moneda or 'ARS'
+    tasa = tasas.get(moneda)
+    if not tasa:
+        if sin_convertir is not None:
+            sin_convertir.add(moneda)
+        return Decimal('0.00')
+    return total * tasa
+
+
+def _agrupar(model, usuario, campos, year=None, mes=None):
+    """
+    Subtotales de la tabla caliente y de los resúmenes del archivo, agrupados
+    por `campos` (lookups sobre la relación) y moneda.
+
+    Returns:
+        Lista de (valores de campos..., abreviatura de moneda, total, cantidad)
+    """
+    _, resumen_model, _ = modelos_archivo(model)
+
+    caliente = model.objects.filter(usuario=usuario)
+    resumenes = resumen_model.objects.filter(usuario=usuario)
+    if year:
+        caliente = caliente.filter(fecha__year=year)
+        resumenes = resumenes.filter(mes__year=year)
+    if mes:
+        caliente = caliente.filter(fecha__month=mes)
+        resumenes = resumenes.filter(mes__month=mes)
+
+    filas = list(
+        caliente.values_list(*campos, 'moneda__abreviatura')
+        .annotate(total=Sum('monto'), cantidad=Count('id'))
+        .order_by()
+    )
+    filas += list(
+        resumenes.values_list(*campos, 'moneda__abreviatura')
+        .annotate(total=Sum('total'), cantidad=Sum('cantidad'))
+        .order_by()
+    )
+    return filas
+
+
+def total(model, usuario, moneda, year=None, mes=None):
+    """
+    Total y cantidad de gastos o ingresos (todo el historial o un año/mes).
+
+    Returns:
+        dict: {'total': Decimal, 'cantidad': int, 'sin_convertir': set de monedas sin tasa}
+    """
+    tasas = CurrencyService.get_rates_snapshot(moneda)
+    suma, cantidad, sin_convertir = Decimal('0.00'), 0, set()
+    for moneda_fila, subtotal, n in _agrupar(model, usuario, (), year, mes):
+        suma += _convertir(subtotal, moneda_fila, tasas, sin_convertir)
+        cantidad += n
+    return {'total': suma, 'cantidad': cantidad, 'sin_convertir': sin_convertir}
+
+
+def variacion_mensual(model, usuario, moneda, hoy=None):
+    """
+    Total del mes actual contra el anterior en una consulta (el archivo solo
+    guarda transacciones de años atrás, así que no interviene).
+
+    Returns:
+        dict: {'total_mes_actual', 'total_mes_anterior', 'variacion_porcentual'}
+    """
+    hoy = hoy or date.today()
+    inicio_actual = hoy.replace(day=1)
+    inicio_anterior = date(hoy.year - (hoy.month == 1), (hoy.month - 2) % 12 + 1, 1)
+    tasas = CurrencyService.get_rates_snapshot(moneda)
+
+    filas = (
+        model.objects
+        .filter(usuario=usuario, fecha__gte=inicio_anterior, fecha__lte=hoy)
+        .values_list('fecha__year', 'fecha__month', 'moneda__abreviatura')
+        .annotate(total=Sum('monto'))
+        .order_by()
+    )
+    totales = defaultdict(lambda: Decimal('0.00'))
+    for year, mes, moneda_fila, subtotal in filas:
+        totales[(year, mes)] += _convertir(subtotal, moneda_fila, tasas)
+
+    actual = totales[(inicio_actual.year, inicio_actual.month)]
+    anterior = totales[(inicio_anterior.year, inicio_anterior.month)]
+    return {
+        'total_mes_actual': actual,
+        'total_mes_anterior': anterior,
+        'variacion_porcentual': float(calcular_crecimiento(actual, anterior)),
+    }
+
+
+def distribucion(model, usuario, moneda, year=None, mes=None):
+    """
+    Total por categoría (gastos) o fuente (ingresos) con su porcentaje.
+    Las filas sin fuente (p. ej. de una fuente borrada) van a un grupo
+    "Sin fuente" con id None, así los porcentajes suman 100 sobre el total.
+
+    Returns:
+        dict: {'total': Decimal, 'items': [{'id', 'nombre', 'total', 'cantidad', 'porcentaje'}]}
+    """
+    _, _, campo_relacion = modelos_archivo(model)
+    tasas = CurrencyService.get_rates_snapshot(moneda)
+
+    grupos = {}
+    suma = Decimal('0.00')
+    campos = (f'{campo_relacion}_id', f'{campo_relacion}__nombre')
+    for relacion_id, nombre, moneda_fila, subtotal, n in _agrupar(model, usuario, campos, year, mes):
+        grupo = grupos.setdefault(relacion_id, {
+            'id': relacion_id,
+            'nombre': nombre if relacion_id is not None else SIN_RELACION[campo_relacion],
+            'total': Decimal('0.00'),
+            'cantidad': 0,
+        })
+        convertido = _convertir(subtotal, moneda_fila, tasas)
+        grupo['total'] += convertido
+        grupo['cantidad'] += n
+        suma += convertido
+
+    items = sorted(grupos.values(), key=lambda g: g['total'], reverse=True)
+    for item in items:
+        item['porcentaje'] = round(float(item['total'] / suma * 100), 1) if suma else 0.0
+    return {'total': suma, 'items': items}
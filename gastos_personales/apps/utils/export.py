@@ -0,0 +1,91 @@
+"""
+Exportación en streaming de transacciones (CSV / NDJSON).
+Ubicación: apps/utils/export.py
+
+Las filas se leen con values_list().iterator() y se escriben a medida que
+llegan, así la memoria queda constante sin importar el tamaño del historial
+y el primer byte (el encabezado) sale antes de ejecutar la consulta.
+"""
+import csv
+import json
+from decimal import Decimal
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class _Echo:
+    """Pseudo-buffer para csv.writer: devuelve la línea en lugar de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def _convertir_filas(filas, tasas, idx_monto, idx_moneda):
+    """
+    Agrega el monto convertido al final de cada fila usando un snapshot de tasas.
+    Si no hay tasa para la moneda de la fila, el monto convertido queda vacío.
+    """
+    for fila in filas:
+        tasa = tasas.get(fila[idx_moneda] or 'ARS')
+        monto = fila[idx_monto]
+        convertido = (monto * tasa).quantize(Decimal('0.01')) if tasa is not None else None
+        yield (*fila, convertido)
+
+
+def _stream_csv(encabezados, filas):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(encabezados)
+    for fila in filas:
+        yield writer.writerow(fila)
+
+
+def _stream_ndjson(encabezados, filas):
+    for fila in filas:
+        yield json.dumps(dict(zip(encabezados, fila)), cls=DjangoJSONEncoder) + '\n'
+
+
+def exportar_queryset(queryset, columnas, nombre_archivo, formato='csv', tasas=None):
+    """
+    Genera una respuesta en streaming con las filas del queryset.
+
+    Args:
+        queryset: QuerySet ya filtrado y ordenado
+        columnas: Lista de tuplas (campo_orm, encabezado). Si se pasan tasas,
+            debe incluir 'monto' y 'moneda__abreviatura'.
+        nombre_archivo: Nombre base del archivo descargado (sin extensión)
+        formato: 'csv' o 'ndjson'
+        tasas: Snapshot {moneda: tasa} (ver CurrencyService.get_rates_snapshot).
+            Si es None no se agrega la columna 'monto_convertido'.
+
+    Returns:
+        StreamingHttpResponse
+    """
+    campos = [campo for campo, _ in columnas]
+    encabezados = [encabezado for _, encabezado in columnas]
+
+    filas = queryset.values_list(*campos).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    if tasas is not None:
+        filas = _convertir_filas(
+            filas,
+            tasas,
+            campos.index('monto'),
+            campos.index('moneda__abreviatura'),
+        )
+        encabezados.append('monto_convertido')
+
+    if formato == 'ndjson':
+        contenido = _stream_ndjson(encabezados, filas)
+    else:
+        contenido = _stream_csv(encabezados, filas)
+
+    response = StreamingHttpResponse(contenido, content_type=CONTENT_TYPES[formato])
+    response['Content-Disposition'] = f'attachment; filename="{nombre_archivo}.{formato}"'
+    return response
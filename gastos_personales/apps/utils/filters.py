@@ -1,10 +1,10 @@
 """Utilidades para aplicar filtros a querysets."""
-from django.db.models import Q
 from decimal import Decimal
+from apps.utils.busqueda import buscar
 
 def aplicar_filtros_basicos(queryset, request):
     """
-    Aplica filtros básicos de fecha y monto a un queryset.
+    Aplica filtros básicos de fecha, año y monto a un queryset.
     
     Args:
         queryset: QuerySet a filtrar
@@ -18,6 +18,14 @@ def aplicar_filtros_basicos(queryset, request):
     if fecha:
         queryset = queryset.filter(fecha=fecha)
     
+    # Filtro por año (mismo parámetro que la API)
+    year = request.GET.get('year')
+    if year:
+        try:
+            queryset = queryset.filter(fecha__year=int(year))
+        except ValueError:
+            pass
+    
     # Filtro por monto mínimo
     monto_min = request.GET.get('monto_min')
     if monto_min:
@@ -40,6 +48,7 @@ def aplicar_filtros_basicos(queryset, request):
 def aplicar_busqueda(queryset, request, campos_busqueda):
     """
     Aplica búsqueda en múltiples campos.
+    Gastos e ingresos usan el índice full-text (ver apps/utils/busqueda.py).
     
     Args:
         queryset: QuerySet a filtrar
@@ -49,15 +58,7 @@ def aplicar_busqueda(queryset, request, campos_busqueda):
     Returns:
         QuerySet filtrado
     """
-    search = request.GET.get('search', '').strip()
-    
-    if search:
-        q_objects = Q()
-        for campo in campos_busqueda:
-            q_objects |= Q(**{f'{campo}__icontains': search})
-        queryset = queryset.filter(q_objects)
-    
-    return queryset
+    return buscar(queryset, request.GET.get('search', ''), campos_busqueda)
 
 
 def obtener_valores_filtros(request, campos):
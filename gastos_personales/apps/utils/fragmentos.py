@@ -0,0 +1,25 @@
+"""
+Render parcial de los listados (tabla y paginación).
+Ubicación: apps/utils/fragmentos.py
+
+Con ?fragmento=tabla la ListView renderiza solo `fragment_template_name` y
+get_context_data corta antes de calcular el resto de la página (resumen del
+mes, gráfico, formularios). Los filtros y la paginación del template piden
+ese fragmento y reemplazan solo la tabla (ver static/js/fragmentos.js).
+"""
+FRAGMENTO_PARAM = 'fragmento'
+FRAGMENTO_TABLA = 'tabla'
+
+
+class FragmentoListMixin:
+    """Mixin para ListView: usar es_fragmento() en get_context_data para cortar temprano."""
+    fragment_template_name = None
+
+    def es_fragmento(self):
+        return self.request.GET.get(FRAGMENTO_PARAM) == FRAGMENTO_TABLA
+
+    def get_template_names(self):
+        if self.es_fragmento():
+            return [self.fragment_template_name]
+        return super().get_template_names()
+
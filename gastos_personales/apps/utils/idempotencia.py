@@ -0,0 +1,108 @@
+"""
+Idempotency-Key para los POST de la API.
+Ubicación: apps/utils/idempotencia.py
+
+Un cliente que reintenta un POST (p. ej. por una red inestable) manda el
+mismo encabezado Idempotency-Key en cada intento. La primera request que
+llega toma la clave con cache.add (atómico) y se ejecuta; su respuesta se
+guarda IDEMPOTENCY_TTL segundos. Los reintentos:
+- si la primera sigue en curso, esperan hasta IDEMPOTENCY_ESPERA segundos y
+  devuelven su respuesta (o 409 con Retry-After si no terminó);
+- si ya terminó, reciben la respuesta guardada sin ejecutar el endpoint
+  (con el encabezado Idempotent-Replayed: true);
+- si el cuerpo es distinto al del primer intento, reciben 422.
+
+Las respuestas 5xx y las excepciones no se guardan: el próximo reintento
+vuelve a ejecutar el endpoint. La clave es por cliente (ver
+identificar_cliente), método y ruta. Con varios workers CACHES debe ser una
+cache compartida.
+"""
+import hashlib
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from apps.utils.limites import identificar_cliente
+
+IDEMPOTENCY_TTL = 24 * 3600  # 24 horas
+IDEMPOTENCY_ESPERA = 10       # Segundos que un reintento espera a la request en curso
+IDEMPOTENCY_BLOQUEO = 60      # Vencimiento de la marca "en curso" si el worker muere
+IDEMPOTENCY_MAX_LARGO = 255
+
+_EN_CURSO = 'en_curso'
+_INTERVALO_ESPERA = 0.05
+
+
+def _error(status, detalle, **encabezados):
+    response = JsonResponse({'detail': detalle}, status=status)
+    for nombre, valor in encabezados.items():
+        response[nombre.replace('_', '-')] = valor
+    return response
+
+
+def _reproducir(guardada):
+    response = HttpResponse(
+        guardada['content'], status=guardada['status'], content_type=guardada['content_type']
+    )
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _ejecutar(view, request, args, kwargs, key, huella):
+    try:
+        response = view(request, *args, **kwargs)
+    except Exception:
+        cache.delete(key)
+        raise
+
+    if response.status_code >= 500 or response.streaming:
+        cache.delete(key)
+        return response
+
+    cache.set(key, {
+        'estado': 'completa',
+        'huella': huella,
+        'status': response.status_code,
+        'content': response.content,
+        'content_type': response.get('Content-Type'),
+    }, getattr(settings, 'IDEMPOTENCY_TTL', IDEMPOTENCY_TTL))
+    return response
+
+
+def idempotente(view):
+    """
+    Decorador para POST de la API. Usar con ninja.decorators.decorate_view,
+    debajo de limitar() para que los reintentos también cuenten.
+    Sin encabezado Idempotency-Key la request se ejecuta normalmente.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        clave = request.headers.get('Idempotency-Key')
+        if not clave:
+            return view(request, *args, **kwargs)
+        if len(clave) > IDEMPOTENCY_MAX_LARGO:
+            return _error(400, f'Idempotency-Key admite hasta {IDEMPOTENCY_MAX_LARGO} caracteres')
+
+        identidad = f'{identificar_cliente(request)}:{request.method}:{request.path}:{clave}'
+        key = 'idempotencia:' + hashlib.sha256(identidad.encode()).hexdigest()
+        huella = hashlib.sha256(request.body).hexdigest()
+
+        limite = time.monotonic() + getattr(settings, 'IDEMPOTENCY_ESPERA', IDEMPOTENCY_ESPERA)
+        while True:
+            if cache.add(key, {'estado': _EN_CURSO, 'huella': huella}, IDEMPOTENCY_BLOQUEO):
+                return _ejecutar(view, request, args, kwargs, key, huella)
+
+            guardada = cache.get(key)
+            if guardada is None:
+                # El primer intento falló o venció entre el add y el get
+                continue
+            if guardada['huella'] != huella:
+                return _error(422, 'Idempotency-Key ya usada con otro cuerpo')
+            if guardada['estado'] != _EN_CURSO:
+                return _reproducir(guardada)
+            if time.monotonic() >= limite:
+                return _error(409, 'Hay una request en curso con la misma Idempotency-Key', Retry_After='1')
+            time.sleep(_INTERVALO_ESPERA)
+
+    return wrapper
@@ -0,0 +1,255 @@
+"""
+Importación de extractos bancarios (CSV / OFX) en lote.
+Ubicación: apps/utils/importacion.py
+
+El archivo se lee como stream y se procesa en bloques: por cada bloque se
+resuelven las categorías/fuentes por nombre, se descartan los duplicados
+con UNA sola consulta por rango de fechas y se insertan las filas nuevas
+con bulk_create.
+
+Cada bloque confirma su propia transacción: una sola transacción para todo
+el archivo dejaría `updated_at` (la hora del bulk_create) muy por detrás del
+commit y una sincronización en curso se saltearía esas filas (el margen es
+SYNC_MARGEN_SEGUNDOS). Si la importación se corta, los bloques ya
+confirmados quedan guardados y reimportar el archivo los omite como
+duplicados.
+"""
+import csv
+import io
+import re
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from django.db import transaction
+from apps.utils.versionado import agrupar_versiones, marcar_cambio
+
+IMPORT_CHUNK_SIZE = 500
+
+FORMATOS_FECHA = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+
+# Caracteres leídos por vez del OFX: muchos extractos OFX/SGML vienen en una sola línea
+OFX_CHUNK_SIZE = 64 * 1024
+
+_OFX_TAG = re.compile(r'<(\w+)>([^<\r\n]*)')
+_OFX_APERTURA = re.compile(r'<STMTTRN>', re.IGNORECASE)
+_OFX_CIERRE = re.compile(r'</STMTTRN>', re.IGNORECASE)
+
+
+def _abrir_texto(archivo):
+    """Envuelve un archivo binario (UploadedFile u open(..., 'rb')) para leerlo como texto en stream."""
+    binario = getattr(archivo, 'file', archivo)
+    return io.TextIOWrapper(binario, encoding='utf-8-sig', newline='')
+
+
+def _parsear_fecha(valor):
+    valor = (valor or '').strip()
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Fecha inválida: '{valor}'")
+
+
+def _parsear_monto(valor):
+    valor = (valor or '').strip().replace(' ', '')
+    # Admite "1.234,56" además de "1234.56"
+    if ',' in valor:
+        valor = valor.replace('.', '').replace(',', '.')
+    try:
+        return Decimal(valor).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError(f"Monto inválido: '{valor}'")
+
+
+def leer_csv(archivo):
+    """
+    Lee un CSV con columnas fecha, monto, descripcion y categoria (o fuente).
+
+    Los montos van en positivo, como en la exportación. Un monto negativo o
+    cero (p. ej. una devolución en el CSV de un banco) es una fila con error:
+    no se importa con el signo invertido.
+
+    Yields:
+        dict con 'fecha', 'monto', 'descripcion', 'nombre' (categoría/fuente)
+        o 'error' si la fila no se pudo interpretar.
+    """
+    for numero, fila in enumerate(csv.DictReader(_abrir_texto(archivo)), start=2):
+        try:
+            monto = _parsear_monto(fila.get('monto'))
+            if monto <= 0:
+                raise ValueError(f"El monto debe ser positivo: '{monto}'")
+            yield {
+                'fila': numero,
+                'fecha': _parsear_fecha(fila.get('fecha')),
+                'monto': monto,
+                'descripcion': (fila.get('descripcion') or '').strip() or None,
+                'nombre': (fila.get('categoria') or fila.get('fuente') or '').strip(),
+            }
+        except ValueError as e:
+            yield {'fila': numero, 'error': str(e)}
+
+
+def _movimiento_ofx(bloque, numero, signo):
+    """Fila de un <STMTTRN>, o None si no corresponde al signo pedido."""
+    tags = {tag.upper(): valor.strip() for tag, valor in _OFX_TAG.findall(bloque)}
+    try:
+        monto = _parsear_monto(tags.get('TRNAMT'))
+        if (monto < 0) != (signo < 0) or monto == 0:
+            return None
+        return {
+            'fila': numero,
+            'fecha': datetime.strptime(tags.get('DTPOSTED', '')[:8], '%Y%m%d').date(),
+            'monto': abs(monto),
+            'descripcion': tags.get('MEMO') or tags.get('NAME') or None,
+            'nombre': '',
+        }
+    except ValueError as e:
+        return {'fila': numero, 'error': str(e)}
+
+
+def leer_ofx(archivo, signo):
+    """
+    Lee los movimientos (<STMTTRN>) de un extracto OFX.
+
+    El archivo se lee de a OFX_CHUNK_SIZE caracteres (no por línea) y cada
+    búsqueda de </STMTTRN> arranca donde terminó la anterior; lo ya procesado
+    se descarta al final de cada bloque, así el costo es lineal.
+
+    Args:
+        archivo: Archivo binario
+        signo: -1 para quedarse con los débitos (gastos), 1 para los créditos (ingresos)
+
+    Yields:
+        dict con 'fecha', 'monto', 'descripcion' y 'nombre' vacío
+        (el OFX no trae categoría; se usa la categoría por defecto).
+    """
+    texto = _abrir_texto(archivo)
+    buffer = ''
+    desde = 0
+    numero = 0
+    for parte in iter(lambda: texto.read(OFX_CHUNK_SIZE), ''):
+        buffer += parte
+        procesado = 0
+        while cierre := _OFX_CIERRE.search(buffer, desde):
+            apertura = _OFX_APERTURA.search(buffer, procesado, cierre.start())
+            bloque = buffer[apertura.start() if apertura else procesado:cierre.start()]
+            procesado = desde = cierre.end()
+            numero += 1
+            movimiento = _movimiento_ofx(bloque, numero, signo)
+            if movimiento:
+                yield movimiento
+
+        buffer = buffer[procesado:]
+        # Un </STMTTRN> puede haber quedado cortado entre dos bloques
+        desde = max(len(buffer) - len('</STMTTRN>') + 1, 0)
+
+
+def leer_extracto(archivo, formato, signo):
+    """Devuelve el lector correspondiente al formato ('csv' u 'ofx')."""
+    if formato == 'ofx':
+        return leer_ofx(archivo, signo)
+    return leer_csv(archivo)
+
+
+def _en_bloques(iterable, tamaño):
+    iterador = iter(iterable)
+    while bloque := list(islice(iterador, tamaño)):
+        yield bloque
+
+
+def importar_transacciones(usuario, filas, model, relacion_model, campo_relacion,
+                           nombre_defecto, chunk_size=IMPORT_CHUNK_SIZE, progreso=None):
+    """
+    Inserta en lote las filas leídas de un extracto, descartando duplicados.
+
+    Una fila es duplicada si ya hay en la base un movimiento con la misma
+    fecha, categoría/fuente y monto. Cada movimiento existente descarta una
+    sola fila del archivo, así dos compras iguales el mismo día se importan
+    las dos.
+
+    Args:
+        usuario: Usuario dueño de las transacciones
+        filas: Iterable de dicts (ver leer_csv / leer_ofx)
+        model: Gasto o Ingreso
+        relacion_model: Categoria o Fuente
+        campo_relacion: 'categoria' o 'fuente'
+        nombre_defecto: Nombre de categoría/fuente para filas sin nombre
+        chunk_size: Filas por bloque
+        progreso: Callable opcional progreso(resultado) llamado al cerrar cada bloque
+
+    Returns:
+        dict: {'procesadas', 'creadas', 'duplicadas', 'errores'}
+    """
+    campo_id = f'{campo_relacion}_id'
+    resultado = {'procesadas': 0, 'creadas': 0, 'duplicadas': 0, 'errores': []}
+
+    # Nombre normalizado -> id. Las categorías/fuentes de un usuario son pocas.
+    relaciones = {
+        nombre.strip().lower(): pk
+        for pk, nombre in relacion_model.objects.filter(usuario=usuario).values_list('id', 'nombre')
+    }
+
+    def resolver_relacion(nombre):
+        nombre = nombre or nombre_defecto
+        clave = nombre.lower()
+        if clave not in relaciones:
+            relaciones[clave] = relacion_model.objects.create(usuario=usuario, nombre=nombre).pk
+        return relaciones[clave]
+
+    # Filas ya contadas en bloques anteriores (creadas o descartadas por un
+    # movimiento existente): no vuelven a descontar de lo que hay en la base
+    contadas = Counter()
+
+    with agrupar_versiones():
+        for bloque in _en_bloques(filas, chunk_size):
+            with transaction.atomic():
+                validas = []
+                for fila in bloque:
+                    resultado['procesadas'] += 1
+                    if 'error' in fila:
+                        resultado['errores'].append({'fila': fila['fila'], 'error': fila['error']})
+                        continue
+                    fila[campo_id] = resolver_relacion(fila['nombre'])
+                    validas.append(fila)
+
+                if not validas:
+                    continue
+
+                # Una sola consulta por bloque para contar los movimientos existentes
+                fechas = [fila['fecha'] for fila in validas]
+                existentes = Counter(
+                    model.objects.filter(
+                        usuario=usuario,
+                        fecha__range=(min(fechas), max(fechas))
+                    ).values_list('fecha', campo_id, 'monto')
+                )
+                existentes.subtract(contadas)
+
+                nuevos = []
+                for fila in validas:
+                    clave = (fila['fecha'], fila[campo_id], fila['monto'])
+                    contadas[clave] += 1
+                    if existentes[clave] > 0:
+                        existentes[clave] -= 1
+                        resultado['duplicadas'] += 1
+                        continue
+                    nuevos.append(model(
+                        usuario=usuario,
+                        moneda=usuario.moneda,
+                        fecha=fila['fecha'],
+                        monto=fila['monto'],
+                        descripcion=fila['descripcion'],
+                        **{campo_id: fila[campo_id]},
+                    ))
+
+                model.objects.bulk_create(nuevos, batch_size=chunk_size)
+                resultado['creadas'] += len(nuevos)
+                if nuevos:
+                    marcar_cambio(usuario.id)
+
+            if progreso:
+                progreso(resultado)
+
+    return resultado
@@ -0,0 +1,165 @@
+"""
+Límite de requests por cliente (token bucket) sobre la cache compartida.
+Ubicación: apps/utils/limites.py
+
+Cada alcance de RATE_LIMITS define (capacidad, periodo): el cliente puede
+hacer ráfagas de hasta `capacidad` requests y recupera un token cada
+periodo / capacidad segundos. Sin tokens recibe 429 con Retry-After.
+
+El balde se guarda como un solo entero (GCRA): el momento, en milisegundos,
+en que volvería a estar lleno. Tomar un token es un cache.incr atómico, así
+que no hay carreras entre workers; la clave vence cuando el balde se llena y
+la próxima request arranca de cero con cache.add. Con varios workers CACHES
+debe ser una cache compartida (Redis/Memcached), igual que para los tokens.
+
+El cliente se identifica por su token de API, el usuario de la sesión o la
+IP, en ese orden. Se aplica por ruta: `decorate_view(limitar('api'))` en la
+API (también en las rutas async) y `limitar_vista('login')` en vistas de Django.
+"""
+import math
+import time
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from apps.usuario.models import ApiToken
+from apps.utils.api_tokens import verificar_token
+
+# alcance: (capacidad, periodo en segundos)
+RATE_LIMITS = {
+    'api': (120, 60),
+    'api_pesada': (10, 60),
+    'login': (10, 300),
+    'reenvio_verificacion': (3, 600),
+}
+
+
+def _ahora_ms():
+    return int(time.time() * 1000)
+
+
+def consumir(clave, capacidad, periodo):
+    """
+    Toma un token del balde `clave`.
+
+    Args:
+        clave: Identificador del balde (alcance + cliente)
+        capacidad: Tamaño de la ráfaga permitida
+        periodo: Segundos en los que se recupera el balde completo
+
+    Returns:
+        int: 0 si la request puede pasar, o los segundos a esperar
+    """
+    intervalo = math.ceil(periodo * 1000 / capacidad)
+    tolerancia = intervalo * capacidad
+    ahora = _ahora_ms()
+    # El valor guardado depende del intervalo: cambiar el límite empieza baldes nuevos
+    key = f'limite:{clave}:{capacidad}:{periodo}'
+
+    try:
+        lleno = cache.incr(key, intervalo)
+    except ValueError:
+        lleno = ahora + intervalo
+        if not cache.add(key, lleno, math.ceil(intervalo / 1000) + 1):
+            # Otra request creó el balde entre el incr y el add
+            lleno = cache.incr(key, intervalo)
+
+    espera = lleno - ahora - tolerancia
+    if espera > 0:
+        # Las requests rechazadas no consumen tokens
+        cache.decr(key, intervalo)
+        return math.ceil(espera / 1000)
+
+    cache.touch(key, max(math.ceil((lleno - ahora) / 1000), 0) + 1)
+    return 0
+
+
+def identificar_cliente(request):
+    """Token de API, usuario de la sesión o IP (la auth de Ninja corre después)."""
+    encabezado = request.headers.get('Authorization', '')
+    if encabezado[:7].lower() == 'bearer ':
+        token = encabezado[7:]
+        if verificar_token(token):
+            return f'token:{ApiToken.hash(token)}'
+
+    if request.user.is_authenticated:
+        return f'usuario:{request.user.pk}'
+
+    encabezado_ip = getattr(settings, 'RATE_LIMIT_IP_HEADER', None)
+    ip = request.META.get(encabezado_ip, '') if encabezado_ip else ''
+    # Detrás de un proxy confiable, el primer valor es el cliente original
+    ip = ip.split(',')[0].strip() or request.META.get('REMOTE_ADDR', '')
+    return f'ip:{ip}'
+
+
+def espera_limite(request, alcance):
+    """
+    Consume un token del alcance para el cliente del request.
+
+    Returns:
+        int: 0 si puede pasar, o segundos para el Retry-After
+    """
+    if not getattr(settings, 'RATE_LIMIT_ENABLED', True):
+        return 0
+    limites = getattr(settings, 'RATE_LIMITS', RATE_LIMITS)
+    capacidad, periodo = limites.get(alcance, RATE_LIMITS[alcance])
+    return consumir(f'{alcance}:{identificar_cliente(request)}', capacidad, periodo)
+
+
+def _respuesta_limite(espera):
+    response = JsonResponse({'detail': f'Demasiadas solicitudes. Reintentá en {espera} segundos.'}, status=429)
+    response['Retry-After'] = str(espera)
+    return response
+
+
+def limitar(alcance):
+    """
+    Decorador para rutas de la API. Usar con ninja.decorators.decorate_view,
+    por encima de respuesta_condicional para que los 304 también cuenten.
+
+    Responde 429 {"detail": ...} con Retry-After sin ejecutar el endpoint.
+    En las rutas async la cache y la verificación del token corren en un
+    thread (sync_to_async), igual que la autenticación de Ninja.
+    """
+    def decorador(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper_async(request, *args, **kwargs):
+                espera = await sync_to_async(espera_limite)(request, alcance)
+                if espera:
+                    return _respuesta_limite(espera)
+                return await view(request, *args, **kwargs)
+            return wrapper_async
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            espera = espera_limite(request, alcance)
+            if espera:
+                return _respuesta_limite(espera)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorador
+
+
+def limitar_vista(alcance, metodos=('POST',)):
+    """
+    Decorador para vistas de Django (con method_decorator en las basadas en clase).
+    Solo cuenta los métodos indicados: mostrar el formulario no consume tokens.
+    """
+    def decorador(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in metodos:
+                espera = espera_limite(request, alcance)
+                if espera:
+                    response = HttpResponse(
+                        f'Demasiados intentos. Probá de nuevo en {espera} segundos.',
+                        status=429,
+                        content_type='text/plain; charset=utf-8',
+                    )
+                    response['Retry-After'] = str(espera)
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorador
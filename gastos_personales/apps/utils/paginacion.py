@@ -0,0 +1,120 @@
+"""
+Paginación por keyset (cursor) para los listados HTML.
+Ubicación: apps/utils/paginacion.py
+
+En lugar de OFFSET + COUNT(*), cada página pide las filas posteriores a la
+última mostrada según `keyset_ordering` (p. ej. fecha DESC, id DESC). La
+consulta usa el índice y cuesta lo mismo en la primera página que en la
+número mil. El cursor viaja en ?cursor= y es opaco para el cliente.
+
+El conteo es opcional y aproximado: se cuentan como máximo
+KEYSET_CONTEO_LIMITE filas, y el template muestra "1000+" si se llega al
+límite. Solo se calcula en la primera página.
+"""
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+KEYSET_CONTEO_LIMITE = 1000
+
+
+def _codificar(valores):
+    crudo = json.dumps(valores, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip('=')
+
+
+def _decodificar(cursor):
+    relleno = '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(cursor + relleno))
+
+
+def contar_aproximado(queryset, limite=KEYSET_CONTEO_LIMITE):
+    """
+    Cuenta hasta `limite` filas (+1 para saber si hay más).
+
+    Returns:
+        dict: {'cantidad': int, 'aproximado': bool}
+    """
+    cantidad = queryset.order_by()[:limite + 1].count()
+    if cantidad > limite:
+        return {'cantidad': limite, 'aproximado': True}
+    return {'cantidad': cantidad, 'aproximado': False}
+
+
+class PaginaKeyset:
+    """Página de un listado por cursor; reemplaza a page_obj en el template."""
+
+    def __init__(self, object_list, cursor_siguiente):
+        self.object_list = object_list
+        self.cursor_siguiente = cursor_siguiente
+
+    def has_next(self):
+        return self.cursor_siguiente is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin para ListView. La vista debe ordenar con `keyset_ordering` y pasar
+    cada queryset por aplicar_cursor antes de unirlo (p. ej. con el archivo).
+    """
+    keyset_ordering = ('-fecha', '-id')
+    keyset_conteo = True
+    cursor_param = 'cursor'
+
+    def get_cursor(self):
+        """Valores del cursor del request, o None (primera página o cursor inválido)."""
+        if not hasattr(self, '_cursor'):
+            self._cursor = None
+            cursor = self.request.GET.get(self.cursor_param)
+            if cursor:
+                try:
+                    valores = _decodificar(cursor)
+                    campos = [self.model._meta.get_field(campo.lstrip('-')) for campo in self.keyset_ordering]
+                    if len(valores) == len(campos):
+                        self._cursor = [campo.to_python(valor) for campo, valor in zip(campos, valores)]
+                except (ValueError, TypeError, ValidationError):
+                    self._cursor = None
+        return self._cursor
+
+    def aplicar_cursor(self, queryset):
+        """Filtra las filas posteriores al cursor en el orden del keyset."""
+        valores = self.get_cursor()
+        if valores is None:
+            return queryset
+
+        # (a < x) OR (a = x AND b < y) OR ... según la dirección de cada campo
+        condicion = Q()
+        iguales = {}
+        for orden, valor in zip(self.keyset_ordering, valores):
+            campo = orden.lstrip('-')
+            lookup = 'lt' if orden.startswith('-') else 'gt'
+            condicion |= Q(**iguales, **{f'{campo}__{lookup}': valor})
+            iguales[campo] = valor
+        return queryset.filter(condicion)
+
+    def paginate_queryset(self, queryset, page_size):
+        filas = list(queryset[:page_size + 1])
+        hay_mas = len(filas) > page_size
+        filas = filas[:page_size]
+
+        cursor_siguiente = None
+        if hay_mas:
+            ultima = filas[-1]
+            cursor_siguiente = _codificar([
+                getattr(ultima, campo.lstrip('-')) for campo in self.keyset_ordering
+            ])
+        # (paginator, page, object_list, is_paginated), como MultipleObjectMixin
+        return None, PaginaKeyset(filas, cursor_siguiente), filas, hay_mas
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.keyset_conteo and self.get_cursor() is None:
+            context['conteo'] = contar_aproximado(self.object_list)
+        return context
@@ -0,0 +1,245 @@
+"""
+Particionado por fecha de las tablas de Gasto e Ingreso (solo Postgres).
+Ubicación: apps/utils/particiones.py
+
+Con DB_PARTITIONING=year|month las tablas se convierten en tablas
+particionadas por RANGE (fecha). Postgres descarta del plan las particiones
+fuera del rango filtrado (partition pruning): una consulta de los últimos
+meses lee una o dos particiones en lugar de todo el historial.
+
+- Las migraciones `particionar` de gasto e ingreso convierten las tablas.
+- `python manage.py crear_particiones` crea por adelantado las particiones
+  futuras; conviene correrlo periódicamente (cron).
+- Una partición DEFAULT recibe las filas que no caen en ningún rango; al crear
+  una partición nueva sus filas se mueven desde la DEFAULT.
+
+Postgres exige que la PK de una tabla particionada incluya la columna de
+partición, por lo que pasa a ser (id, fecha). El ORM sigue usando `id`.
+"""
+from datetime import date
+from django.conf import settings
+
+INTERVALOS = ('year', 'month')
+COLUMNA_PARTICION = 'fecha'
+PERIODOS_ADELANTE = 3
+
+
+def intervalo_configurado(connection):
+    """Devuelve 'year' o 'month' si el particionado está activo para la conexión, o None."""
+    intervalo = getattr(settings, 'DB_PARTITIONING', '')
+    if connection.vendor != 'postgresql' or intervalo not in INTERVALOS:
+        return None
+    return intervalo
+
+
+def _inicio_periodo(fecha, intervalo):
+    if intervalo == 'year':
+        return date(fecha.year, 1, 1)
+    return date(fecha.year, fecha.month, 1)
+
+
+def _siguiente_periodo(inicio, intervalo):
+    if intervalo == 'year':
+        return date(inicio.year + 1, 1, 1)
+    return date(inicio.year + inicio.month // 12, inicio.month % 12 + 1, 1)
+
+
+def rangos_particiones(desde, hasta, intervalo):
+    """
+    Genera los rangos [inicio, fin) que cubren desde..hasta inclusive.
+
+    Returns:
+        Iterador de (sufijo, inicio, fin), p. ej. ('p2024_03', date(2024, 3, 1), date(2024, 4, 1))
+    """
+    inicio = _inicio_periodo(desde, intervalo)
+    while inicio <= hasta:
+        fin = _siguiente_periodo(inicio, intervalo)
+        if intervalo == 'year':
+            sufijo = f'p{inicio.year}'
+        else:
+            sufijo = f'p{inicio.year}_{inicio.month:02d}'
+        yield sufijo, inicio, fin
+        inicio = fin
+
+
+def fin_horizonte(intervalo, periodos=PERIODOS_ADELANTE, hoy=None):
+    """Última fecha que deben cubrir las particiones: hoy + N periodos."""
+    fecha = _inicio_periodo(hoy or date.today(), intervalo)
+    for _ in range(periodos):
+        fecha = _siguiente_periodo(fecha, intervalo)
+    return fecha
+
+
+def esta_particionada(cursor, tabla):
+    cursor.execute(
+        'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))',
+        [tabla],
+    )
+    return cursor.fetchone()[0]
+
+
+def crear_particiones(cursor, tabla, desde, hasta, intervalo):
+    """
+    Crea las particiones de `tabla` que falten entre dos fechas.
+
+    Cada partición se arma como tabla suelta, recibe las filas de su rango que
+    hubieran caído en la DEFAULT y recién después se adjunta al padre.
+
+    Returns:
+        Lista con los nombres de las particiones creadas
+    """
+    default = f'{tabla}_default'
+    cursor.execute('SELECT to_regclass(%s)', [default])
+    hay_default = cursor.fetchone()[0] is not None
+
+    creadas = []
+    for sufijo, inicio, fin in rangos_particiones(desde, hasta, intervalo):
+        nombre = f'{tabla}_{sufijo}'
+        cursor.execute('SELECT to_regclass(%s)', [nombre])
+        if cursor.fetchone()[0] is not None:
+            continue
+
+        cursor.execute(f'CREATE TABLE "{nombre}" (LIKE "{tabla}" INCLUDING DEFAULTS)')
+        if hay_default:
+            cursor.execute(
+                f'WITH movidas AS ('
+                f'  DELETE FROM "{default}" WHERE {COLUMNA_PARTICION} >= %s AND {COLUMNA_PARTICION} < %s'
+                f'  RETURNING *'
+                f') INSERT INTO "{nombre}" SELECT * FROM movidas',
+                [inicio, fin],
+            )
+        cursor.execute(
+            f'ALTER TABLE "{tabla}" ATTACH PARTITION "{nombre}" FOR VALUES FROM (%s) TO (%s)',
+            [inicio, fin],
+        )
+        creadas.append(nombre)
+    return creadas
+
+
+def _definiciones(cursor, tabla):
+    """Índices (sin la PK), foreign keys y triggers de la tabla, para recrearlos tras reconstruirla."""
+    cursor.execute(
+        """
+        SELECT replace(indexdef, ' ON ONLY ', ' ON ')
+        FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s
+          AND indexname NOT IN (
+              SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'p'
+          )
+        """,
+        [tabla, tabla],
+    )
+    indices = [fila[0] for fila in cursor.fetchall()]
+
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [tabla],
+    )
+    foreign_keys = cursor.fetchall()
+
+    # Los triggers propios (p. ej. los del índice de búsqueda); no los
+    # internos de las FK ni los clonados en las particiones
+    cursor.execute(
+        'SELECT pg_get_triggerdef(oid) FROM pg_trigger '
+        'WHERE tgrelid = to_regclass(%s) AND NOT tgisinternal AND tgparentid = 0',
+        [tabla],
+    )
+    triggers = [fila[0] for fila in cursor.fetchall()]
+    return indices, foreign_keys, triggers
+
+
+def _reconstruir(cursor, tabla, particion, pk, antes_de_copiar=None):
+    """
+    Reemplaza `tabla` por una copia con otra estructura conservando datos,
+    índices, foreign keys, triggers y el próximo valor del id.
+
+    La identidad del id se agrega recién cuando la tabla anterior (y su
+    secuencia) ya no existe: así la secuencia nueva conserva el nombre
+    `<tabla>_id_seq` y arranca después del id más alto copiado. Los triggers
+    se recrean después de copiar las filas, para que la copia no los dispare.
+    """
+    indices, foreign_keys, triggers = _definiciones(cursor, tabla)
+    anterior = f'{tabla}_anterior'
+
+    cursor.execute(f'ALTER TABLE "{tabla}" RENAME TO "{anterior}"')
+    cursor.execute(f'CREATE TABLE "{tabla}" (LIKE "{anterior}" INCLUDING DEFAULTS) {particion}')
+    if antes_de_copiar:
+        antes_de_copiar()
+    cursor.execute(f'INSERT INTO "{tabla}" SELECT * FROM "{anterior}"')
+    cursor.execute(f'DROP TABLE "{anterior}"')
+
+    cursor.execute(f'ALTER TABLE "{tabla}" ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM \"{tabla}\"",
+        [tabla],
+    )
+    cursor.execute(f'ALTER TABLE "{tabla}" ADD PRIMARY KEY ({pk})')
+    for indice in indices:
+        cursor.execute(indice)
+    for nombre, definicion in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{tabla}" ADD CONSTRAINT "{nombre}" {definicion}')
+    for trigger in triggers:
+        cursor.execute(trigger)
+
+
+def particionar_tabla(cursor, tabla, intervalo, periodos=PERIODOS_ADELANTE):
+    """
+    Convierte `tabla` en una tabla particionada por fecha.
+
+    Crea particiones desde la fecha más antigua hasta `periodos` periodos
+    después de hoy, más la partición DEFAULT.
+
+    Returns:
+        False si la tabla ya estaba particionada, True si se convirtió
+    """
+    if esta_particionada(cursor, tabla):
+        return False
+
+    cursor.execute(f'SELECT MIN({COLUMNA_PARTICION}) FROM "{tabla}"')
+    desde = cursor.fetchone()[0] or date.today()
+
+    def preparar_particiones():
+        crear_particiones(cursor, tabla, desde, fin_horizonte(intervalo, periodos), intervalo)
+        cursor.execute(f'CREATE TABLE "{tabla}_default" PARTITION OF "{tabla}" DEFAULT')
+
+    _reconstruir(
+        cursor,
+        tabla,
+        f'PARTITION BY RANGE ({COLUMNA_PARTICION})',
+        f'id, {COLUMNA_PARTICION}',
+        antes_de_copiar=preparar_particiones,
+    )
+    return True
+
+
+def desparticionar_tabla(cursor, tabla):
+    """Vuelve `tabla` a una tabla común (PK solo en id). Borra las particiones."""
+    if not esta_particionada(cursor, tabla):
+        return False
+    _reconstruir(cursor, tabla, '', 'id')
+    return True
+
+
+# -------------------------------------------------------
+# Operaciones para migraciones
+# -------------------------------------------------------
+def particionar_modelo(app_label, model_name):
+    """Devuelve el par (forward, reverse) para migrations.RunPython."""
+
+    def forward(apps, schema_editor):
+        intervalo = intervalo_configurado(schema_editor.connection)
+        if not intervalo:
+            return
+        tabla = apps.get_model(app_label, model_name)._meta.db_table
+        with schema_editor.connection.cursor() as cursor:
+            particionar_tabla(cursor, tabla, intervalo)
+
+    def reverse(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        tabla = apps.get_model(app_label, model_name)._meta.db_table
+        with schema_editor.connection.cursor() as cursor:
+            desparticionar_tabla(cursor, tabla)
+
+    return forward, reverse
@@ -0,0 +1,102 @@
+"""
+Ruteo de lecturas a una réplica de la base de datos.
+Ubicación: apps/utils/replicas.py
+
+Se activa definiendo DATABASE_REPLICA_URL (ver master/settings.py):
+- ReplicaMiddleware marca las requests de solo lectura (GET/HEAD/OPTIONS)
+  para que sus consultas vayan al alias 'replica'.
+- Después de escribir en un modelo de la aplicación (apps.*) el cliente
+  queda "pineado" al primario durante REPLICA_PIN_SECONDS, así lee lo que
+  acaba de escribir aunque la réplica tenga lag. El pin se guarda en la cache
+  compartida por token de API o usuario (identificar_cliente), así vale para
+  todas sus sesiones y clientes; guardar la sesión no cuenta como escritura.
+- Si la réplica no responde, las lecturas vuelven al primario; se reintenta
+  cada REPLICA_RETRY_SECONDS.
+
+Para probarlo localmente con dos archivos SQLite:
+    DATABASE_REPLICA_URL=sqlite:///db_replica.sqlite3
+    python manage.py migrate && python manage.py migrate --database replica
+"""
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+REPLICA_ALIAS = 'replica'
+PIN_PREFIJO = 'replica_pin'
+METODOS_LECTURA = ('GET', 'HEAD', 'OPTIONS')
+
+_leer_de_replica = ContextVar('leer_de_replica', default=False)
+_hubo_escritura = ContextVar('hubo_escritura', default=False)
+
+_estado_replica = {'disponible': True, 'verificado': 0.0}
+
+
+def replica_disponible():
+    """Verifica (con cache por proceso) que la réplica acepte conexiones."""
+    ahora = time.monotonic()
+    if ahora - _estado_replica['verificado'] < getattr(settings, 'REPLICA_RETRY_SECONDS', 10):
+        return _estado_replica['disponible']
+
+    try:
+        connections[REPLICA_ALIAS].ensure_connection()
+        disponible = True
+    except DatabaseError:
+        disponible = False
+
+    _estado_replica.update(disponible=disponible, verificado=ahora)
+    return disponible
+
+
+class ReplicaRouter:
+    """Envía las lecturas a la réplica solo cuando ReplicaMiddleware lo habilitó."""
+
+    def db_for_read(self, model, **hints):
+        if _leer_de_replica.get() and replica_disponible():
+            return REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        # Sesiones, admin, contenttypes... no cambian lo que lee la API
+        if model._meta.app_config.name.startswith('apps.'):
+            _hubo_escritura.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica y primario tienen los mismos datos
+        return True
+
+
+def _clave_pin(request):
+    # Importado acá: el router se carga antes que los modelos
+    from apps.utils.limites import identificar_cliente
+    return f'{PIN_PREFIJO}:{identificar_cliente(request)}'
+
+
+class ReplicaMiddleware:
+    """
+    Decide por request si las lecturas pueden ir a la réplica.
+    Va después de AuthenticationMiddleware: el pin depende del usuario.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        solo_lectura = (
+            request.method in METODOS_LECTURA
+            and not cache.get(_clave_pin(request))
+        )
+        token_replica = _leer_de_replica.set(solo_lectura)
+        token_escritura = _hubo_escritura.set(False)
+        try:
+            response = self.get_response(request)
+            if _hubo_escritura.get():
+                # Read-your-writes: las próximas lecturas del cliente van al primario.
+                # La clave se calcula de nuevo: un login cambia el usuario del request
+                cache.set(_clave_pin(request), True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+            return response
+        finally:
+            _leer_de_replica.reset(token_replica)
+            _hubo_escritura.reset(token_escritura)
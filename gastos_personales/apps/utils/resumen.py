@@ -0,0 +1,139 @@
+"""
+Resumen mensual de las páginas de Gastos e Ingresos.
+Ubicación: apps/utils/resumen.py
+
+resumen_mensual trae en una sola consulta (UNION ALL de dos GROUP BY) los
+subtotales del mes actual y del anterior de gastos por categoría e ingresos
+por fuente, separados por moneda. Con eso arma todas las cifras del
+encabezado de ambas páginas: total del mes, variación contra el mes
+anterior, distribución y saldo, todo convertido a la moneda del usuario.
+Cada página pide solo los tipos que muestra (tipos=...): la de Ingresos no
+agrupa gastos que después descarta.
+Los subtotales en monedas sin tasa de cambio no se suman (mezclarían
+monedas): esas monedas se informan en 'sin_convertir'.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db.models import CharField, F, Sum, Value
+from django.db.models.functions import ExtractMonth, ExtractYear
+from apps.gasto.models import Gasto
+from apps.ingreso.models import Ingreso
+from apps.utils.calculations import calcular_crecimiento
+from apps.utils.currency_service import CurrencyService
+
+COLOR_DEFECTO = '#9CA3AF'
+ICONO_DEFECTO = 'fas fa-circle'
+
+# tipo -> (modelo, relación por la que se agrupa, si la relación tiene color/ícono)
+TIPOS = {
+    'gastos': (Gasto, 'categoria', True),
+    'ingresos': (Ingreso, 'fuente', False),
+}
+
+
+def _subtotales(model, tipo, relacion, usuario, desde, hasta, estilos=True):
+    """Subtotales por (año, mes, nombre de la relación, color, ícono, moneda)."""
+    sin_estilo = Value(None, output_field=CharField())
+    return (
+        model.objects
+        .filter(usuario=usuario, fecha__gte=desde, fecha__lt=hasta)
+        .annotate(
+            tipo=Value(tipo, output_field=CharField()),
+            anio=ExtractYear('fecha'),
+            mes_numero=ExtractMonth('fecha'),
+            nombre=F(f'{relacion}__nombre'),
+            color=F(f'{relacion}__color__codigo_hex') if estilos else sin_estilo,
+            icono=F(f'{relacion}__icono__icono') if estilos else sin_estilo,
+            abreviatura=F('moneda__abreviatura'),
+        )
+        .values_list('tipo', 'anio', 'mes_numero', 'nombre', 'color', 'icono', 'abreviatura')
+        .annotate(total=Sum('monto'))
+        .order_by()
+    )
+
+
+def _distribucion(grupos, total, clave):
+    items = [
+        {
+            clave: nombre,
+            'total': monto,
+            'porcentaje': round((monto / total * 100), 2) if total > 0 else 0,
+            'color': color,
+            'icono': icono,
+        }
+        for nombre, (monto, color, icono) in grupos.items()
+    ]
+    items.sort(key=lambda x: x['porcentaje'], reverse=True)
+    return items
+
+
+def resumen_mensual(usuario, moneda, hoy=None, tipos=tuple(TIPOS)):
+    """
+    Cifras del encabezado de las páginas de Gastos e Ingresos.
+
+    Args:
+        usuario: Usuario autenticado
+        moneda: Abreviatura de la moneda del usuario
+        hoy: Fecha de referencia (por defecto: hoy)
+        tipos: Tipos a resumir, 'gastos' y/o 'ingresos' (por defecto: ambos)
+
+    Returns:
+        dict: {
+            'gastos' / 'ingresos': {'total_mes', 'total_mes_anterior', 'variacion_porcentual', 'distribucion'},
+            'saldo': Decimal (ingresos - gastos del mes; solo si se piden ambos tipos),
+            'sin_convertir': Monedas sin tasa, fuera de los totales (ordenadas)
+        }
+        Los items de la distribución tienen 'categoria' (gastos) o 'fuente'
+        (ingresos), 'total', 'porcentaje', 'color' e 'icono'.
+    """
+    hoy = hoy or date.today()
+    inicio_actual = hoy.replace(day=1)
+    inicio_anterior = (inicio_actual - timedelta(days=1)).replace(day=1)
+    inicio_siguiente = (inicio_actual + timedelta(days=32)).replace(day=1)
+
+    consultas = []
+    for tipo in tipos:
+        model, relacion, estilos = TIPOS[tipo]
+        consultas.append(_subtotales(model, tipo, relacion, usuario, inicio_anterior, inicio_siguiente, estilos=estilos))
+    filas = consultas[0].union(*consultas[1:], all=True) if len(consultas) > 1 else consultas[0]
+
+    # Las tasas se piden solo para las monedas que aparecen
+    tasas = {moneda: Decimal('1')}
+    datos = {
+        tipo: {'total_mes': Decimal('0.00'), 'total_mes_anterior': Decimal('0.00'), 'grupos': {}}
+        for tipo in tipos
+    }
+    sin_nombre = {'gastos': 'Sin categoría', 'ingresos': 'Sin fuente'}
+
+    for tipo, anio, mes, nombre, color, icono, abreviatura, subtotal in filas:
+        abreviatura = abreviatura or 'ARS'
+        if abreviatura not in tasas:
+            tasas[abreviatura] = CurrencyService.get_exchange_rate(abreviatura, moneda)
+        if not tasas[abreviatura]:
+            continue
+        convertido = subtotal * tasas[abreviatura]
+
+        if (anio, mes) != (inicio_actual.year, inicio_actual.month):
+            datos[tipo]['total_mes_anterior'] += convertido
+            continue
+
+        datos[tipo]['total_mes'] += convertido
+        grupo = datos[tipo]['grupos'].setdefault(
+            nombre or sin_nombre[tipo], [Decimal('0.00'), color or COLOR_DEFECTO, icono or ICONO_DEFECTO]
+        )
+        grupo[0] += convertido
+
+    resumen = {}
+    for tipo in tipos:
+        clave = TIPOS[tipo][1]
+        actual, anterior = datos[tipo]['total_mes'], datos[tipo]['total_mes_anterior']
+        resumen[tipo] = {
+            'total_mes': actual,
+            'total_mes_anterior': anterior,
+            'variacion_porcentual': calcular_crecimiento(actual, anterior),
+            'distribucion': _distribucion(datos[tipo]['grupos'], actual, clave),
+        }
+    if 'gastos' in resumen and 'ingresos' in resumen:
+        resumen['saldo'] = resumen['ingresos']['total_mes'] - resumen['gastos']['total_mes']
+    resumen['sin_convertir'] = sorted(abreviatura for abreviatura, tasa in tasas.items() if not tasa)
+    return resumen
@@ -0,0 +1,199 @@
+"""
+Serialización rápida para listados grandes de la API.
+Ubicación: apps/utils/serializacion.py
+
+El camino normal arma instancias de modelo con select_related, Ninja llama a
+los resolve_* del schema por objeto y valida cada fila con pydantic. Para
+miles de filas eso domina el tiempo de respuesta.
+
+Con settings.API_VALUES_FAST_PATH los endpoints de listado proyectan el
+queryset con values_list() directamente a dicts con las mismas claves del
+schema y devuelven la respuesta ya renderizada (sin validación por fila).
+
+El mismo camino atiende `?fields=` (sparse fieldsets): solo se seleccionan
+las columnas pedidas y solo se hacen los JOIN que esas columnas necesitan.
+
+Formato columnar: con `Accept: application/vnd.spendwise.columnar+json` (o
+`application/x-msgpack`) los listados devuelven una lista por columna en
+lugar de un objeto por fila, los montos en centavos enteros y los nombres
+de categorías/fuentes y monedas una sola vez en tablas {id: nombre}.
+MessagePack es opcional (pip install msgpack); sin el paquete no se ofrece.
+"""
+from datetime import date
+from decimal import Decimal
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_vary_headers
+from ninja.errors import HttpError
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MEDIA_JSON = 'application/json'
+MEDIA_COLUMNAR = 'application/vnd.spendwise.columnar+json'
+MEDIA_MSGPACK = 'application/x-msgpack'
+
+
+def fast_path_activo():
+    return getattr(settings, 'API_VALUES_FAST_PATH', False)
+
+
+def proyectar(queryset, campos):
+    """
+    Proyecta un queryset a una lista de dicts.
+
+    Args:
+        queryset: QuerySet (también sirve una unión con el archivo)
+        campos: dict {clave de salida: lookup del ORM}, en el orden del schema
+
+    Returns:
+        list[dict]
+    """
+    claves = tuple(campos)
+    filas, posiciones = _filas(queryset, list(campos.values()))
+    if posiciones == list(range(len(claves))):
+        return [dict(zip(claves, fila)) for fila in filas]
+    return [dict(zip(claves, [fila[i] for i in posiciones])) for fila in filas]
+
+
+def _filas(queryset, lookups):
+    """
+    values_list() de `lookups` pidiendo cada columna una sola vez: con un
+    nombre repetido values_list() anota el queryset, y una unión con el
+    archivo no admite annotate().
+
+    Returns:
+        tuple: (filas, posiciones), donde posiciones[i] es el índice del
+        lookup i en cada fila. Las filas pueden traer columnas de más al final.
+    """
+    unicos = list(dict.fromkeys(lookups))
+    if queryset.query.combinator:
+        # En una unión el ORDER BY solo puede usar columnas seleccionadas:
+        # se agregan al final y quien consume las filas las ignora
+        unicos += [
+            orden.lstrip('-') for orden in queryset.query.order_by
+            if orden.lstrip('-') not in unicos
+        ]
+    return queryset.values_list(*unicos), [unicos.index(lookup) for lookup in lookups]
+
+
+def campos_pedidos(fields, campos):
+    """
+    Interpreta el parámetro `fields` (claves separadas por comas).
+
+    Args:
+        fields: Valor de ?fields= o None
+        campos: dict {clave de salida: lookup del ORM} del schema completo
+
+    Returns:
+        dict con el subconjunto pedido en el orden del schema, o None si no se pidió
+
+    Raises:
+        HttpError 400 si alguna clave no existe en el schema
+    """
+    if not fields:
+        return None
+
+    pedidos = {campo.strip() for campo in fields.split(',') if campo.strip()}
+    desconocidos = pedidos - campos.keys()
+    if desconocidos:
+        raise HttpError(400, f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    return {clave: lookup for clave, lookup in campos.items() if clave in pedidos} or None
+
+
+def respuesta_proyectada(router, request, queryset, campos, detalle=False):
+    """
+    Renderiza la proyección con el renderer de la API (sin validar contra el schema).
+    Con detalle=True devuelve el único objeto del queryset o 404.
+    """
+    datos = proyectar(queryset, campos)
+    if detalle:
+        if not datos:
+            raise Http404
+        datos = datos[0]
+    return router.api.create_response(request, datos, status=200)
+
+
+# -------------------------------------------------------
+# Formato columnar
+# -------------------------------------------------------
+def formato_columnar(request):
+    """
+    Negocia el formato según el header Accept.
+
+    Returns:
+        MEDIA_COLUMNAR, MEDIA_MSGPACK o None (JSON por fila, el default)
+    """
+    ofrecidos = [MEDIA_JSON, MEDIA_COLUMNAR] + ([MEDIA_MSGPACK] if msgpack else [])
+    preferido = request.get_preferred_type(ofrecidos)
+    return preferido if preferido in (MEDIA_COLUMNAR, MEDIA_MSGPACK) else None
+
+
+def columnar(queryset, columnas, diccionarios=None):
+    """
+    Arma la representación columnar de un queryset en una sola pasada.
+
+    Args:
+        queryset: QuerySet (también sirve una unión con el archivo)
+        columnas: dict {columna de salida: lookup del ORM}. Las columnas
+            terminadas en `_cents` se convierten de Decimal a centavos enteros
+        diccionarios: dict {tabla de salida: (lookup del id, lookup del nombre)}
+
+    Returns:
+        dict: {'filas': N, <columna>: [...], <tabla>: {id: nombre}}
+    """
+    diccionarios = diccionarios or {}
+    lookups = list(columnas.values())
+    for lookup_id, lookup_nombre in diccionarios.values():
+        lookups += [lookup_id, lookup_nombre]
+
+    # El id de cada tabla suele ser también una columna (categoria_id, moneda_id):
+    # _filas lo pide una sola vez y las posiciones apuntan a la misma columna
+    resultado, posiciones = _filas(queryset, lookups)
+    n = len(columnas)
+    indices = posiciones[:n]
+    valores = [[] for _ in range(n)]
+    tablas = {tabla: {} for tabla in diccionarios}
+    pares = [
+        (tablas[tabla], posiciones[n + 2 * i], posiciones[n + 2 * i + 1])
+        for i, tabla in enumerate(diccionarios)
+    ]
+
+    filas = 0
+    for fila in resultado:
+        filas += 1
+        for lista, i in zip(valores, indices):
+            lista.append(fila[i])
+        for tabla, i_id, i_nombre in pares:
+            if fila[i_id] is not None:
+                tabla[str(fila[i_id])] = fila[i_nombre]
+
+    datos = {'filas': filas}
+    for columna, lista in zip(columnas, valores):
+        if columna.endswith('_cents'):
+            lista = [None if v is None else int(v * 100) for v in lista]
+        datos[columna] = lista
+    datos.update(tablas)
+    return datos
+
+
+def _msgpack_default(valor):
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f'Tipo no serializable: {type(valor).__name__}')
+
+
+def respuesta_columnar(router, request, datos, formato):
+    """Renderiza `datos` en el formato negociado (JSON con el renderer de la API, o MessagePack)."""
+    if formato == MEDIA_MSGPACK:
+        contenido = msgpack.packb(datos, default=_msgpack_default)
+    else:
+        contenido = router.api.renderer.render(request, datos, response_status=200)
+    response = HttpResponse(contenido, content_type=formato)
+    patch_vary_headers(response, ('Accept',))
+    return response
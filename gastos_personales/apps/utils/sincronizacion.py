@@ -0,0 +1,164 @@
+"""
+Sincronización incremental para clientes offline (GET /api/sync).
+Ubicación: apps/utils/sincronizacion.py
+
+Gasto, Ingreso, Categoria y Fuente tienen `updated_at` (auto_now) y cada
+baja deja un registro Eliminacion (señal post_delete, conectada en
+apps/utils/apps.py). Con eso una sincronización devuelve solo lo que cambió
+desde el cursor anterior, en todas las entidades a la vez.
+
+El cursor es opaco para el cliente (microsegundos desde epoch). El cursor
+devuelto queda SYNC_MARGEN_SEGUNDOS antes del momento de la consulta: una
+transacción que confirma tarde con un updated_at anterior se incluye en la
+siguiente sincronización. Las filas repetidas son inofensivas porque el
+cliente las aplica por id.
+
+Las eliminaciones se guardan SYNC_RETENCION_DIAS (`manage.py
+purgar_eliminaciones`). Un cursor más viejo que eso recibe un snapshot
+completo (`completo: true`) y el cliente debe reemplazar sus datos.
+
+Al borrar una categoría sus gastos se eliminan (y se informan); al borrar una
+fuente o moneda las referencias quedan en null sin tocar updated_at, así que
+el cliente debe limpiar las referencias a fuentes eliminadas.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.utils import timezone
+from ninja.errors import HttpError
+from apps.usuario.models import Eliminacion
+from apps.utils.serializacion import proyectar
+
+SYNC_MARGEN_SEGUNDOS = 5
+SYNC_RETENCION_DIAS = 90
+
+CATEGORIA_SYNC_CAMPOS = {
+    'id': 'id',
+    'nombre': 'nombre',
+    'icono': 'icono__icono',
+    'color': 'color__nombre',
+}
+FUENTE_SYNC_CAMPOS = {
+    'id': 'id',
+    'nombre': 'nombre',
+}
+
+_registrando = ContextVar('registrar_eliminaciones', default=True)
+
+
+def _entidades():
+    """(clave de la respuesta, modelo, tipo de Eliminacion, campos de salida)."""
+    from apps.gasto.models import Gasto
+    from apps.gasto.schemas import GASTO_OUT_CAMPOS
+    from apps.ingreso.models import Ingreso, Fuente
+    from apps.ingreso.schemas import INGRESO_OUT_CAMPOS
+    from apps.categoria.models import Categoria
+
+    return (
+        ('gastos', Gasto, Eliminacion.TIPO_GASTO, GASTO_OUT_CAMPOS),
+        ('ingresos', Ingreso, Eliminacion.TIPO_INGRESO, INGRESO_OUT_CAMPOS),
+        ('categorias', Categoria, Eliminacion.TIPO_CATEGORIA, CATEGORIA_SYNC_CAMPOS),
+        ('fuentes', Fuente, Eliminacion.TIPO_FUENTE, FUENTE_SYNC_CAMPOS),
+    )
+
+
+# -------------------------------------------------------
+# Cursor
+# -------------------------------------------------------
+def codificar_cursor(momento):
+    return str(int(momento.timestamp() * 1_000_000))
+
+
+def decodificar_cursor(cursor):
+    """
+    Raises:
+        HttpError 400 si el cursor no es válido
+    """
+    try:
+        return datetime.fromtimestamp(int(cursor) / 1_000_000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise HttpError(400, 'Cursor inválido')
+
+
+# -------------------------------------------------------
+# Cambios
+# -------------------------------------------------------
+def cambios_desde(usuario, since=None):
+    """
+    Filas modificadas y eliminadas del usuario desde el cursor `since`.
+
+    Args:
+        usuario: Usuario autenticado
+        since: Cursor devuelto por la sincronización anterior (None = snapshot completo)
+
+    Returns:
+        dict: {'cursor', 'completo', 'gastos', 'ingresos', 'categorias', 'fuentes', 'eliminados'}
+    """
+    ahora = timezone.now()
+    desde = decodificar_cursor(since) if since else None
+    retencion = timedelta(days=getattr(settings, 'SYNC_RETENCION_DIAS', SYNC_RETENCION_DIAS))
+    if desde and desde < ahora - retencion:
+        desde = None
+
+    respuesta = {
+        'cursor': codificar_cursor(ahora - timedelta(seconds=SYNC_MARGEN_SEGUNDOS)),
+        'completo': desde is None,
+        'eliminados': {},
+    }
+
+    for clave, model, _, campos in _entidades():
+        queryset = model.objects.filter(usuario=usuario)
+        if desde:
+            queryset = queryset.filter(updated_at__gt=desde)
+        respuesta[clave] = proyectar(queryset.order_by('id'), campos)
+        respuesta['eliminados'][clave] = []
+
+    if desde:
+        tipos = {tipo: clave for clave, _, tipo, _ in _entidades()}
+        eliminaciones = (
+            Eliminacion.objects
+            .filter(usuario=usuario, eliminado__gt=desde)
+            .order_by('id')
+            .values_list('tipo', 'objeto_id')
+        )
+        for tipo, objeto_id in eliminaciones:
+            respuesta['eliminados'][tipos[tipo]].append(objeto_id)
+
+    return respuesta
+
+
+# -------------------------------------------------------
+# Eliminaciones
+# -------------------------------------------------------
+@contextmanager
+def sin_eliminaciones():
+    """
+    Desactiva el registro de eliminaciones en el bloque. Para borrados que no
+    son bajas para el cliente (p. ej. mover filas al archivo).
+    """
+    token = _registrando.set(False)
+    try:
+        yield
+    finally:
+        _registrando.reset(token)
+
+
+def registrar_eliminacion(sender, instance, **kwargs):
+    """post_delete de Gasto, Ingreso, Categoria y Fuente."""
+    if not _registrando.get():
+        return
+    tipo = {model: tipo for _, model, tipo, _ in _entidades()}[sender]
+    Eliminacion.objects.create(usuario_id=instance.usuario_id, tipo=tipo, objeto_id=instance.pk)
+
+
+def purgar_eliminaciones(dias=None):
+    """
+    Borra los registros de eliminación más viejos que la retención.
+
+    Returns:
+        int: Cantidad de registros borrados
+    """
+    dias = dias or getattr(settings, 'SYNC_RETENCION_DIAS', SYNC_RETENCION_DIAS)
+    borrados, _ = Eliminacion.objects.filter(eliminado__lt=timezone.now() - timedelta(days=dias)).delete()
+    return borrados
@@ -0,0 +1,24 @@
+"""
+Perfil de performance para SQLite.
+Ubicación: apps/utils/sqlite.py
+
+Se conecta a la señal connection_created (ver apps/utils/apps.py) y aplica
+settings.SQLITE_PRAGMAS a cada conexión nueva: WAL, synchronous=NORMAL,
+busy_timeout, cache y mmap. Con SQLITE_TUNING=False queda el comportamiento
+por defecto de SQLite.
+"""
+from django.conf import settings
+
+
+def configurar_sqlite(sender, connection, **kwargs):
+    """Aplica los PRAGMAs configurados si la conexión es SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+
+    with connection.cursor() as cursor:
+        for nombre, valor in pragmas.items():
+            cursor.execute(f'PRAGMA {nombre} = {valor}')
@@ -0,0 +1,45 @@
+"""Datos compartidos por los tests de la API."""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from apps.categoria.models import Categoria
+from apps.gasto.models import Gasto
+from apps.usuario.models import Moneda
+
+
+class ApiTestCase(TestCase):
+    """Usuario logueado con moneda ARS, la categoría Comida y dos gastos (enero y febrero de 2024)."""
+
+    def setUp(self):
+        User = get_user_model()
+
+        self.user = User.objects.create_user(
+            username='api_user',
+            email='api@example.com',
+            password='12345'
+        )
+        self.moneda_ars = Moneda.objects.create(
+            usuario=self.user, moneda='Peso Argentino', abreviatura='ARS'
+        )
+        self.user.moneda = self.moneda_ars
+        self.user.save()
+
+        self.cat_comida = Categoria.objects.create(nombre='Comida', usuario=self.user)
+
+        Gasto.objects.create(
+            usuario=self.user,
+            fecha='2024-01-10',
+            categoria=self.cat_comida,
+            monto=500,
+            moneda=self.moneda_ars,
+            descripcion='Supermercado'
+        )
+        Gasto.objects.create(
+            usuario=self.user,
+            fecha='2024-02-15',
+            categoria=self.cat_comida,
+            monto=800,
+            moneda=self.moneda_ars,
+            descripcion='Verdulería'
+        )
+
+        self.client.force_login(self.user)
@@ -0,0 +1,39 @@
+from decimal import Decimal
+from unittest.mock import patch
+from apps.categoria.models import Categoria
+from apps.utils.tests.base import ApiTestCase
+
+
+class BootstrapTests(ApiTestCase):
+    @patch('apps.utils.currency_service.CurrencyService.get_all_rates', return_value={'USD': Decimal('1000')})
+    def test_bootstrap_consultas_fijas_y_etag(self, _):
+        response = self.client.get('/api/bootstrap')
+        self.assertEqual(response.status_code, 200)
+        datos = response.json()
+        self.assertEqual(datos['moneda'], 'ARS')
+        self.assertEqual(datos['tasas'], {'base': 'ARS', 'tasas': {'USD': 1000.0}})
+        self.assertEqual([c['nombre'] for c in datos['categorias']], ['Comida'])
+        self.assertEqual(len(datos['gastos']), 2)
+        etag = response['ETag']
+
+        # Sesión, usuario, versión y cinco proyecciones, con más datos también
+        for i in range(5):
+            Categoria.objects.create(nombre=f'Extra {i}', usuario=self.user)
+        with self.assertNumQueries(8):
+            self.client.get('/api/bootstrap')
+
+        # Las categorías nuevas cambiaron la versión de datos
+        response = self.client.get('/api/bootstrap', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/bootstrap', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_bootstrap_etag_cambia_con_las_tasas(self):
+        with patch('apps.utils.currency_service.CurrencyService.get_all_rates', return_value={'USD': Decimal('1000')}):
+            etag = self.client.get('/api/bootstrap')['ETag']
+        with patch('apps.utils.currency_service.CurrencyService.get_all_rates', return_value={'USD': Decimal('1100')}):
+            response = self.client.get('/api/bootstrap', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tasas']['tasas'], {'USD': 1100.0})
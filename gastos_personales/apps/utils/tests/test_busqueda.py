@@ -0,0 +1,34 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
+from django.test import TransactionTestCase
+from apps.categoria.models import Categoria
+from apps.gasto.models import Gasto
+from apps.usuario.models import Moneda
+from apps.utils.busqueda import borrar_indice, buscar, indice_completo
+
+
+class ReponerIndicesTests(TransactionTestCase):
+    # El schema editor de SQLite no se puede usar dentro de la transacción de un TestCase
+
+    def test_post_migrate_repone_indice_incompleto(self):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest('Sin índice de búsqueda en este motor')
+        usuario = get_user_model().objects.create_user(username='busqueda', password='12345')
+        moneda = Moneda.objects.create(usuario=usuario, moneda='Peso Argentino', abreviatura='ARS')
+        categoria = Categoria.objects.create(nombre='Comida', usuario=usuario)
+        self.addCleanup(Gasto.objects.all().delete)
+
+        with connection.schema_editor() as schema_editor:
+            borrar_indice(schema_editor, Gasto)
+        self.assertFalse(indice_completo(connection, Gasto))
+        # Fila cargada sin triggers: la recoge la carga inicial al reponer
+        gasto = Gasto.objects.create(usuario=usuario, categoria=categoria, moneda=moneda,
+                                     fecha='2024-03-01', monto=100, descripcion='Café')
+
+        emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias,
+                                 apps=apps, plan=[])
+
+        self.assertTrue(indice_completo(connection, Gasto))
+        self.assertEqual(list(buscar(Gasto.objects.all(), 'cafe comida', [])), [gasto])
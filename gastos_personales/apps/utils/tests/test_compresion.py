@@ -0,0 +1,51 @@
+import gzip
+import json
+from unittest import skipUnless
+from django.test import override_settings
+from django.urls import reverse
+from apps.utils.compresion import acepta_codificacion, brotli
+from apps.utils.tests.base import ApiTestCase
+
+
+class CompresionTests(ApiTestCase):
+    @override_settings(COMPRESSION_MIN_BYTES=100)
+    def test_compresion_gzip_con_umbral(self):
+        sin_comprimir = self.client.get('/api/gastos/')
+        response = self.client.get('/api/gastos/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), sin_comprimir.json())
+
+        # El ETag queda débil y sigue validando
+        self.assertTrue(response['ETag'].startswith('W/'))
+        response = self.client.get(
+            '/api/gastos/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # Por debajo del umbral no se comprime
+        gasto_id = sin_comprimir.json()[0]['id']
+        response = self.client.get(f'/api/gastos/{gasto_id}', {'fields': 'monto'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_acepta_codificacion_respeta_q(self):
+        self.assertTrue(acepta_codificacion('gzip, deflate, br', 'br'))
+        self.assertTrue(acepta_codificacion('br;q=0.5, gzip', 'br'))
+        self.assertFalse(acepta_codificacion('gzip, br;q=0', 'br'))
+        self.assertFalse(acepta_codificacion('gzip, br ; q=0.000', 'br'))
+        self.assertFalse(acepta_codificacion('gzip, brotli', 'br'))
+
+    @skipUnless(brotli, 'brotli no está instalado')
+    @override_settings(COMPRESSION_MIN_BYTES=100)
+    def test_brotli_solo_fuera_del_html(self):
+        sin_comprimir = self.client.get('/api/gastos/')
+        response = self.client.get('/api/gastos/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(brotli.decompress(response.content)), sin_comprimir.json())
+
+        response = self.client.get('/api/gastos/', HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+        # El HTML (con token CSRF) usa gzip, que agrega el relleno contra BREACH
+        response = self.client.get(reverse('gastos'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
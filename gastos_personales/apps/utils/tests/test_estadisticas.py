@@ -0,0 +1,78 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from apps.gasto.models import Gasto
+from apps.ingreso.models import Ingreso, Fuente
+from apps.usuario.models import Moneda
+from apps.utils.archivo import archivar
+from apps.utils.tests.base import ApiTestCase
+
+
+class EstadisticasTests(ApiTestCase):
+    @patch(
+        'apps.utils.currency_service.CurrencyService.get_exchange_rate',
+        side_effect=lambda origen, destino: Decimal('1') if origen == destino else Decimal('1000'),
+    )
+    def test_estadisticas_agregadas_con_archivo(self, _):
+        moneda_usd = Moneda.objects.create(usuario=self.user, moneda='Dólar', abreviatura='USD')
+        fuente = Fuente.objects.create(usuario=self.user, nombre='Sueldo')
+        Ingreso.objects.create(usuario=self.user, fuente=fuente, moneda=moneda_usd, fecha=date.today(), monto=2)
+        # Enero queda en el archivo: se cuenta desde los resúmenes mensuales
+        archivar(Gasto, date(2024, 2, 1))
+
+        with self.assertNumQueries(6):
+            datos = self.client.get('/api/estadisticas/total', {'tipo': 'gastos'}).json()
+        self.assertEqual((datos['total'], datos['cantidad'], datos['moneda']), (1300.0, 2, 'ARS'))
+
+        datos = self.client.get('/api/estadisticas/total', {'tipo': 'gastos', 'year': 2024, 'mes': 1}).json()
+        self.assertEqual(datos['total'], 500.0)
+
+        datos = self.client.get('/api/estadisticas/saldo').json()
+        self.assertEqual((datos['total_ingresos'], datos['total_gastos'], datos['saldo_restante']), (2000.0, 1300.0, 700.0))
+
+        datos = self.client.get('/api/estadisticas/distribucion', {'tipo': 'gastos'}).json()
+        self.assertEqual(datos['items'], [
+            {'id': self.cat_comida.id, 'nombre': 'Comida', 'total': 1300.0, 'cantidad': 2, 'porcentaje': 100.0}
+        ])
+
+        datos = self.client.get('/api/estadisticas/variacion', {'tipo': 'ingresos'}).json()
+        self.assertEqual((datos['total_mes_actual'], datos['total_mes_anterior'], datos['variacion_porcentual']), (2000.0, 0.0, 100.0))
+
+        # Más transacciones no agregan consultas
+        for i in range(10):
+            Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=moneda_usd, fecha=date.today(), monto=1)
+        with self.assertNumQueries(6):
+            datos = self.client.get('/api/estadisticas/total', {'tipo': 'gastos'}).json()
+        self.assertEqual(datos['total'], 11300.0)
+
+    def test_distribucion_incluye_filas_sin_fuente(self):
+        sueldo = Fuente.objects.create(usuario=self.user, nombre='Sueldo')
+        Ingreso.objects.create(usuario=self.user, fuente=sueldo, moneda=self.moneda_ars, fecha=date(2024, 1, 5), monto=300)
+        # Al borrar una fuente sus ingresos quedan con fuente null
+        Ingreso.objects.create(usuario=self.user, fuente=None, moneda=self.moneda_ars, fecha=date(2024, 1, 6), monto=100)
+
+        datos = self.client.get('/api/estadisticas/distribucion', {'tipo': 'ingresos'}).json()
+        self.assertEqual(datos['total'], 400.0)
+        self.assertEqual(
+            [(item['id'], item['nombre'], item['porcentaje']) for item in datos['items']],
+            [(sueldo.id, 'Sueldo', 75.0), (None, 'Sin fuente', 25.0)],
+        )
+
+    @patch(
+        'apps.utils.currency_service.CurrencyService.get_exchange_rate',
+        side_effect=lambda origen, destino: Decimal('1') if origen == destino else None,
+    )
+    def test_saldo_sin_tasa_no_mezcla_monedas(self, _):
+        moneda_usd = Moneda.objects.create(usuario=self.user, moneda='Dólar', abreviatura='USD')
+        fuente = Fuente.objects.create(usuario=self.user, nombre='Sueldo')
+        Ingreso.objects.create(usuario=self.user, fuente=fuente, moneda=self.moneda_ars, fecha=date.today(), monto=1000)
+        Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=self.moneda_ars, fecha=date.today(), monto=300)
+        Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=moneda_usd, fecha=date.today(), monto=50)
+
+        hoy = date.today()
+        for ruta in (f'/api/estadisticas/saldo?year={hoy.year}&mes={hoy.month}', '/api/async/estadisticas/saldo'):
+            datos = self.client.get(ruta).json()
+            self.assertEqual((datos['total_ingresos'], datos['total_gastos'], datos['saldo_restante']), (1000.0, 300.0, 700.0))
+            self.assertEqual(datos['sin_convertir'], ['USD'])
+        total = self.client.get(f'/api/estadisticas/total?year={hoy.year}&mes={hoy.month}').json()
+        self.assertEqual((total['total'], total['cantidad']), (300.0, 2))
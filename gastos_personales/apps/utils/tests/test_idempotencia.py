@@ -0,0 +1,43 @@
+import hashlib
+import json
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.gasto.models import Gasto
+from apps.utils.tests.base import ApiTestCase
+
+
+class IdempotenciaTests(ApiTestCase):
+    @override_settings(IDEMPOTENCY_ESPERA=0)
+    def test_idempotency_key_reproduce_la_respuesta(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        payload = {'categoria': self.cat_comida.id, 'fecha': '2024-03-01', 'monto': 250, 'descripcion': 'Taxi'}
+        crear = lambda datos, clave: self.client.post(
+            '/api/gastos/', json.dumps(datos), content_type='application/json', HTTP_IDEMPOTENCY_KEY=clave
+        )
+
+        primera = crear(payload, 'clave-1')
+        self.assertEqual(primera.status_code, 200)
+
+        with CaptureQueriesContext(connection) as consultas:
+            repetida = crear(payload, 'clave-1')
+        self.assertEqual(repetida.json(), primera.json())
+        self.assertEqual(repetida['Idempotent-Replayed'], 'true')
+        self.assertFalse([q for q in consultas.captured_queries if 'gasto_gasto' in q['sql']])
+        self.assertEqual(Gasto.objects.filter(descripcion='Taxi').count(), 1)
+
+        # Misma clave con otro cuerpo
+        self.assertEqual(crear({**payload, 'monto': 300}, 'clave-1').status_code, 422)
+
+        # Un reintento mientras el primero sigue en curso espera y, si no termina, recibe 409
+        cuerpo = json.dumps(payload)
+        identidad = f'usuario:{self.user.pk}:POST:/api/gastos/:clave-2'
+        cache.add(
+            'idempotencia:' + hashlib.sha256(identidad.encode()).hexdigest(),
+            {'estado': 'en_curso', 'huella': hashlib.sha256(cuerpo.encode()).hexdigest()},
+        )
+        response = crear(payload, 'clave-2')
+        self.assertEqual((response.status_code, response['Retry-After']), (409, '1'))
+        self.assertEqual(Gasto.objects.filter(descripcion='Taxi').count(), 1)
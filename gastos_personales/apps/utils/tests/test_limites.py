@@ -0,0 +1,58 @@
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from apps.utils.tests.base import ApiTestCase
+
+
+# Reloj fijo: el Retry-After no depende de cuánto tarde el test
+AHORA_MS = 1_700_000_000_000
+
+
+@patch('apps.utils.limites._ahora_ms', return_value=AHORA_MS)
+class LimitesTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    @override_settings(RATE_LIMITS={'api': (2, 60)})
+    def test_limite_de_requests_por_cliente(self, ahora_ms):
+        for _ in range(2):
+            self.assertEqual(self.client.get('/api/gastos/').status_code, 200)
+
+        response = self.client.get('/api/gastos/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+
+        # Otro usuario tiene su propio balde
+        otro = get_user_model().objects.create_user(username='otro_limite', password='12345')
+        self.client.force_login(otro)
+        self.assertEqual(self.client.get('/api/gastos/').status_code, 200)
+
+        # El balde se recupera de a un token por intervalo
+        self.client.force_login(self.user)
+        ahora_ms.return_value = AHORA_MS + 30_000
+        self.assertEqual(self.client.get('/api/gastos/').status_code, 200)
+        self.assertEqual(self.client.get('/api/gastos/').status_code, 429)
+
+    @override_settings(RATE_LIMITS={'api': (3, 60)})
+    def test_limite_en_detalle_y_escrituras(self, ahora_ms):
+        gasto_id = self.client.get('/api/gastos/').json()[0]['id']
+        self.assertEqual(self.client.get(f'/api/gastos/{gasto_id}').status_code, 200)
+        self.assertEqual(self.client.delete(f'/api/categorias/999999').status_code, 404)
+
+        # El balde es uno solo para todas las rutas 'api' del cliente
+        self.assertEqual(self.client.put(f'/api/gastos/{gasto_id}', {'monto': '1.00'}, content_type='application/json').status_code, 429)
+        self.assertEqual(self.client.post('/api/ingresos/', {}, content_type='application/json').status_code, 429)
+        self.assertEqual(self.client.delete(f'/api/gastos/{gasto_id}').status_code, 429)
+
+    @override_settings(RATE_LIMITS={'api': (2, 60)})
+    def test_limite_en_rutas_async_y_estadisticas(self, ahora_ms):
+        self.assertEqual(self.client.get('/api/async/gastos/').status_code, 200)
+        self.assertEqual(self.client.get('/api/estadisticas/total').status_code, 200)
+
+        response = self.client.get('/api/async/gastos/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertEqual(self.client.get('/api/bootstrap').status_code, 429)
@@ -0,0 +1,52 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from apps.categoria.models import Categoria
+from apps.gasto.models import Gasto
+from apps.usuario.models import Moneda
+from apps.utils.busqueda import buscar, indice_completo
+from apps.utils.particiones import desparticionar_tabla, fin_horizonte, particionar_tabla, rangos_particiones
+
+
+class ParticionesTests(SimpleTestCase):
+    def test_rangos_particiones(self):
+        mensuales = list(rangos_particiones(date(2024, 11, 15), date(2025, 1, 1), 'month'))
+        self.assertEqual(mensuales, [
+            ('p2024_11', date(2024, 11, 1), date(2024, 12, 1)),
+            ('p2024_12', date(2024, 12, 1), date(2025, 1, 1)),
+            ('p2025_01', date(2025, 1, 1), date(2025, 2, 1)),
+        ])
+
+        anuales = list(rangos_particiones(date(2023, 6, 1), fin_horizonte('year', 1, hoy=date(2024, 3, 1)), 'year'))
+        self.assertEqual([sufijo for sufijo, _, _ in anuales], ['p2023', 'p2024', 'p2025'])
+
+
+class ReconstruirTablaTests(TransactionTestCase):
+    def test_particionar_conserva_el_indice_de_busqueda(self):
+        if connection.vendor != 'postgresql':
+            self.skipTest('El particionado es solo de Postgres')
+        usuario = get_user_model().objects.create_user(username='particiones', password='12345')
+        moneda = Moneda.objects.create(usuario=usuario, moneda='Peso Argentino', abreviatura='ARS')
+        categoria = Categoria.objects.create(nombre='Comida', usuario=usuario)
+        anterior = Gasto.objects.create(usuario=usuario, categoria=categoria, moneda=moneda,
+                                        fecha='2024-03-01', monto=100, descripcion='Café')
+        self.addCleanup(Gasto.objects.all().delete)
+        tabla = Gasto._meta.db_table
+
+        with connection.cursor() as cursor:
+            particionar_tabla(cursor, tabla, 'year', periodos=1)
+        self.addCleanup(self._desparticionar, tabla)
+        self.assertTrue(indice_completo(connection, Gasto))
+        nuevo = Gasto.objects.create(usuario=usuario, categoria=categoria, moneda=moneda,
+                                     fecha=date.today(), monto=50, descripcion='Café con leche')
+        self.assertEqual(set(buscar(Gasto.objects.all(), 'cafe', [])), {anterior, nuevo})
+
+        self._desparticionar(tabla)
+        self.assertTrue(indice_completo(connection, Gasto))
+        nuevo.delete()
+        self.assertEqual(list(buscar(Gasto.objects.all(), 'cafe comida', [])), [anterior])
+
+    def _desparticionar(self, tabla):
+        with connection.cursor() as cursor:
+            desparticionar_tabla(cursor, tabla)
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+from apps.gasto.models import Gasto
+from apps.utils.replicas import ReplicaMiddleware, ReplicaRouter
+from apps.utils.tests.base import ApiTestCase
+
+
+class ReplicaTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_router_replica_lecturas_y_pin_tras_escritura(self):
+        router = ReplicaRouter()
+        rutas = []
+        otro = get_user_model().objects.create_user(username='otro_replica', password='12345')
+
+        def vista(request):
+            rutas.append(router.db_for_read(Gasto))
+            if request.method == 'POST':
+                router.db_for_write(request.modelo)
+            return HttpResponse()
+
+        middleware = ReplicaMiddleware(vista)
+        factory = RequestFactory()
+
+        def request(metodo, usuario, modelo=None):
+            req = getattr(factory, metodo)('/api/gastos/')
+            req.user = usuario
+            req.modelo = modelo
+            return middleware(req)
+
+        with patch('apps.utils.replicas.replica_disponible', return_value=True):
+            request('get', self.user)
+            # Guardar la sesión no pinea al primario
+            request('post', self.user, Session)
+            request('get', self.user)
+            request('post', self.user, Gasto)
+            # El pin es del usuario, no de la cookie del cliente que escribió
+            request('get', self.user)
+            request('get', otro)
+
+        with patch('apps.utils.replicas.replica_disponible', return_value=False):
+            request('get', otro)
+
+        self.assertEqual(rutas, ['replica', 'default', 'replica', 'default', 'default', 'replica', 'default'])
+        # Fuera de una request todo va al primario
+        self.assertEqual(router.db_for_read(Gasto), 'default')
@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+from django.urls import reverse
+from apps.categoria.models import Categoria
+from apps.gasto.models import Gasto
+from apps.ingreso.models import Ingreso, Fuente
+from apps.usuario.models import Moneda
+from apps.utils.resumen import resumen_mensual
+from apps.utils.tests.base import ApiTestCase
+
+
+class ResumenTests(ApiTestCase):
+    def test_resumen_mensual_en_una_consulta(self):
+        hoy = date.today()
+        mes_anterior = hoy.replace(day=1) - timedelta(days=1)
+        moneda_usd = Moneda.objects.create(usuario=self.user, moneda='Dólar', abreviatura='USD')
+        cat_auto = Categoria.objects.create(nombre='Auto', usuario=self.user)
+        fuente = Fuente.objects.create(usuario=self.user, nombre='Sueldo')
+        Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=self.moneda_ars, fecha=hoy, monto=300)
+        Gasto.objects.create(usuario=self.user, categoria=cat_auto, moneda=moneda_usd, fecha=hoy, monto=1)
+        Gasto.objects.create(usuario=self.user, categoria=cat_auto, moneda=self.moneda_ars, fecha=mes_anterior, monto=650)
+        Ingreso.objects.create(usuario=self.user, fuente=fuente, moneda=self.moneda_ars, fecha=hoy, monto=5000)
+
+        with patch('apps.utils.currency_service.CurrencyService.get_exchange_rate', return_value=Decimal('1000')) as tasa, \
+             self.assertNumQueries(1):
+            resumen = resumen_mensual(self.user, 'ARS', hoy)
+        tasa.assert_called_once_with('USD', 'ARS')
+
+        gastos = resumen['gastos']
+        self.assertEqual((gastos['total_mes'], gastos['total_mes_anterior']), (Decimal('1300'), Decimal('650')))
+        self.assertEqual(gastos['variacion_porcentual'], 100)
+        self.assertEqual([(i['categoria'], i['porcentaje']) for i in gastos['distribucion']], [('Auto', Decimal('76.92')), ('Comida', Decimal('23.08'))])
+        self.assertEqual(resumen['ingresos']['distribucion'][0]['fuente'], 'Sueldo')
+        self.assertEqual(resumen['saldo'], Decimal('3700'))
+
+        with patch('apps.utils.currency_service.CurrencyService.get_exchange_rate', return_value=Decimal('1000')):
+            response = self.client.get(reverse('gastos'))
+        self.assertEqual(response.context['total_gastos_mensual'], Decimal('1300'))
+        self.assertEqual(response.context['conteo'], {'cantidad': 5, 'aproximado': False})
+        response = self.client.get(reverse('ingresos'))
+        self.assertEqual(response.context['total_ingresos_mensual'], Decimal('5000'))
+
+    def test_monedas_sin_tasa_quedan_fuera_de_los_totales(self):
+        hoy = date.today()
+        moneda_usd = Moneda.objects.create(usuario=self.user, moneda='Dólar', abreviatura='USD')
+        Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=self.moneda_ars, fecha=hoy, monto=300)
+        Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=moneda_usd, fecha=hoy, monto=5)
+
+        with patch('apps.utils.currency_service.CurrencyService.get_exchange_rate', return_value=None):
+            resumen = resumen_mensual(self.user, 'ARS', hoy)
+            response = self.client.get(reverse('gastos'))
+
+        self.assertEqual(resumen['gastos']['total_mes'], Decimal('300'))
+        self.assertEqual(resumen['sin_convertir'], ['USD'])
+        self.assertContains(response, 'Sin tasa de cambio para USD')
+
+    def test_resumen_solo_de_los_tipos_pedidos(self):
+        hoy = date.today()
+        fuente = Fuente.objects.create(usuario=self.user, nombre='Sueldo')
+        Gasto.objects.create(usuario=self.user, categoria=self.cat_comida, moneda=self.moneda_ars, fecha=hoy, monto=300)
+        Ingreso.objects.create(usuario=self.user, fuente=fuente, moneda=self.moneda_ars, fecha=hoy, monto=5000)
+
+        with self.assertNumQueries(1) as consultas:
+            resumen = resumen_mensual(self.user, 'ARS', hoy, tipos=('ingresos',))
+        sql = consultas.captured_queries[0]['sql']
+        self.assertNotIn(Gasto._meta.db_table, sql)
+        self.assertNotIn('UNION', sql.upper())
+        self.assertEqual(set(resumen), {'ingresos', 'sin_convertir'})
+        self.assertEqual(resumen['ingresos']['total_mes'], Decimal('5000'))
@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+from django.utils import timezone
+from apps.categoria.models import Categoria
+from apps.gasto.models import Gasto
+from apps.usuario.models import Eliminacion
+from apps.utils.archivo import archivar
+from apps.utils.tests.base import ApiTestCase
+
+
+class SincronizacionTests(ApiTestCase):
+    def test_sync_devuelve_solo_cambios_y_bajas(self):
+        response = self.client.get('/api/sync')
+        self.assertEqual(response.status_code, 200)
+        datos = response.json()
+        self.assertTrue(datos['completo'])
+        self.assertEqual(len(datos['gastos']), 2)
+        self.assertEqual([c['nombre'] for c in datos['categorias']], ['Comida'])
+
+        # Todo lo existente quedó sincronizado antes del cursor
+        hace_una_hora = timezone.now() - timedelta(hours=1)
+        Gasto.objects.update(updated_at=hace_una_hora)
+        Categoria.objects.update(updated_at=hace_una_hora)
+        cursor = self.client.get('/api/sync').json()['cursor']
+
+        modificado, eliminado = Gasto.objects.order_by('fecha')
+        response = self.client.post(
+            '/api/gastos/batch',
+            {'operaciones': [{'op': 'update', 'id': modificado.id, 'monto': '650'}]},
+            content_type='application/json',
+        )
+        self.assertTrue(response.json()[0]['ok'])
+        eliminado_id = eliminado.id
+        eliminado.delete()
+
+        datos = self.client.get('/api/sync', {'since': cursor}).json()
+        self.assertFalse(datos['completo'])
+        self.assertEqual([(g['id'], g['monto']) for g in datos['gastos']], [(modificado.id, '650.00')])
+        self.assertEqual(datos['categorias'], [])
+        self.assertEqual(datos['eliminados']['gastos'], [eliminado_id])
+
+        # Archivar no es una baja
+        archivar(Gasto, date(2025, 1, 1))
+        self.assertEqual(Eliminacion.objects.count(), 1)
+
+        self.assertEqual(self.client.get('/api/sync', {'since': 'x'}).status_code, 400)
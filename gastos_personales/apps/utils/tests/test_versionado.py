@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from apps.categoria.models import Color
+from apps.gasto.models import Gasto
+from apps.utils.versionado import version_datos
+from apps.utils.tests.base import ApiTestCase
+
+
+class VersionadoTests(ApiTestCase):
+    def test_etag_304_y_cambio_tras_escritura(self):
+        response = self.client.get('/api/gastos/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        # Sin cambios: 304 sin evaluar el listado (solo sesión, usuario y versión)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/gastos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Otros filtros son otra representación
+        response = self.client.get('/api/gastos/', {'year': 2024}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Cualquier escritura del usuario cambia la versión
+        Gasto.objects.filter(usuario=self.user).first().delete()
+        response = self.client.get('/api/gastos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_datos_compartidos_cambian_el_etag_sin_tocar_usuarios(self):
+        otro = get_user_model().objects.create_user(username='otro_version', password='12345')
+        version_otro = version_datos(otro.id)[0]
+        etag = self.client.get('/api/categorias/')['ETag']
+
+        Color.objects.create(nombre='Rojo', codigo_hex='#FF0000')
+
+        response = self.client.get('/api/categorias/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(version_datos(otro.id)[0], version_otro)
+
+    def test_etag_304_en_rutas_async(self):
+        gasto = Gasto.objects.filter(usuario=self.user).first()
+        etags = {}
+        for ruta in ('/api/async/gastos/', f'/api/async/gastos/{gasto.id}', '/api/async/estadisticas/saldo'):
+            response = self.client.get(ruta)
+            self.assertEqual(response.status_code, 200)
+            etags[ruta] = response['ETag']
+            self.assertEqual(self.client.get(ruta, HTTP_IF_NONE_MATCH=etags[ruta]).status_code, 304)
+
+        # Una escritura invalida también las representaciones async
+        gasto.delete()
+        response = self.client.get('/api/async/gastos/', HTTP_IF_NONE_MATCH=etags['/api/async/gastos/'])
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,228 @@
+"""
+Versión de datos por usuario y GETs condicionales (ETag / Last-Modified).
+Ubicación: apps/utils/versionado.py
+
+Cada escritura de gastos, ingresos, categorías, fuentes o monedas de un
+usuario incrementa su VersionDatos (señales en apps/utils/apps.py; las
+operaciones masivas llaman a marcar_cambio dentro de agrupar_versiones).
+Los cambios en datos compartidos (colores, íconos, categorías sin usuario)
+incrementan la fila única de VersionCompartida, que entra en el ETag de
+todos: no se escribe la versión de cada usuario.
+
+respuesta_condicional arma un ETag fuerte y Last-Modified a partir de esa
+versión y responde 304 antes de ejecutar el endpoint, así un polling sin
+cambios cuesta una sola consulta por clave primaria.
+"""
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db.models import F, Subquery
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+from apps.usuario.models import ApiToken, VersionCompartida, VersionDatos
+from apps.utils.api_tokens import verificar_token
+
+_agrupando = ContextVar('versiones_agrupadas', default=None)
+
+VERSION_COMPARTIDA_ID = 1
+
+
+def _incrementar(usuario_id):
+    ahora = timezone.now()
+    if usuario_id is None:
+        # Datos compartidos (categorías globales, colores, íconos): una sola fila para todos
+        model, filtro = VersionCompartida, {'pk': VERSION_COMPARTIDA_ID}
+    else:
+        model, filtro = VersionDatos, {'usuario_id': usuario_id}
+
+    actualizadas = model.objects.filter(**filtro).update(version=F('version') + 1, modificado=ahora)
+    if not actualizadas:
+        model.objects.get_or_create(**filtro, defaults={'version': 1, 'modificado': ahora})
+
+
+def marcar_cambio(usuario_id):
+    """Registra una escritura de datos del usuario (None = de todos los usuarios)."""
+    pendientes = _agrupando.get()
+    if pendientes is not None:
+        pendientes.add(usuario_id)
+    else:
+        _incrementar(usuario_id)
+
+
+@contextmanager
+def agrupar_versiones():
+    """
+    Junta los cambios del bloque y aplica un solo incremento por usuario al
+    salir. Pensado para operaciones masivas (lotes, importaciones, archivo).
+    """
+    pendientes = set()
+    token = _agrupando.set(pendientes)
+    try:
+        yield pendientes
+    finally:
+        _agrupando.reset(token)
+
+    for usuario_id in pendientes:
+        _incrementar(usuario_id)
+
+
+def version_datos(usuario_id):
+    """
+    Returns:
+        tuple: (version, modificado) del usuario
+    """
+    fila = VersionDatos.objects.filter(usuario_id=usuario_id).values_list('version', 'modificado').first()
+    if fila is None:
+        obj, _ = VersionDatos.objects.get_or_create(
+            usuario_id=usuario_id, defaults={'modificado': timezone.now()}
+        )
+        fila = (obj.version, obj.modificado)
+    return fila
+
+
+def version_compartida():
+    """
+    Returns:
+        tuple: (version, modificado) de los datos compartidos; (0, None) si nunca cambiaron
+    """
+    fila = VersionCompartida.objects.filter(pk=VERSION_COMPARTIDA_ID).values_list('version', 'modificado').first()
+    return fila or (0, None)
+
+
+def _versiones(usuario_id):
+    """
+    Versión del usuario y la compartida en una sola consulta.
+
+    Returns:
+        tuple: ('<usuario>.<compartida>', modificado más reciente de las dos)
+    """
+    compartida = VersionCompartida.objects.filter(pk=VERSION_COMPARTIDA_ID)
+    fila = (
+        VersionDatos.objects.filter(usuario_id=usuario_id)
+        .annotate(
+            compartida=Subquery(compartida.values('version')[:1]),
+            compartida_modificado=Subquery(compartida.values('modificado')[:1]),
+        )
+        .values_list('version', 'modificado', 'compartida', 'compartida_modificado')
+        .first()
+    )
+    if fila is None:
+        fila = (*version_datos(usuario_id), *version_compartida())
+    version, modificado, version_comp, modificado_comp = fila
+    if modificado_comp and modificado_comp > modificado:
+        modificado = modificado_comp
+    return f'{version}.{version_comp or 0}', modificado
+
+
+# -------------------------------------------------------
+# Señales
+# -------------------------------------------------------
+def cambio_en_datos_usuario(sender, instance, **kwargs):
+    """post_save/post_delete de modelos con FK `usuario` (null = compartido)."""
+    marcar_cambio(instance.usuario_id)
+
+
+def cambio_en_datos_compartidos(sender, instance, **kwargs):
+    """post_save/post_delete de Color e Icono."""
+    marcar_cambio(None)
+
+
+def cambio_en_usuario(sender, instance, created=False, update_fields=None, **kwargs):
+    """post_save del usuario: su username y moneda aparecen en las respuestas."""
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    marcar_cambio(instance.pk)
+
+
+# -------------------------------------------------------
+# GETs condicionales
+# -------------------------------------------------------
+def _usuario_id(request):
+    """Usuario del request, por sesión o Bearer (la auth de Ninja corre después)."""
+    if request.user.is_authenticated:
+        return request.user.pk
+
+    encabezado = request.headers.get('Authorization', '')
+    if encabezado[:7].lower() == 'bearer ':
+        usuario = verificar_token(encabezado[7:], ApiToken.SCOPE_READ)
+        if usuario:
+            return usuario.pk
+    return None
+
+
+def _version_request(request):
+    if not hasattr(request, '_version_datos'):
+        usuario_id = _usuario_id(request)
+        request._version_datos = (usuario_id, *_versiones(usuario_id)) if usuario_id else None
+    return request._version_datos
+
+
+def _etag_func(extra=None):
+    def _calcular(request):
+        datos = _version_request(request)
+        if datos is None:
+            return None
+        usuario_id, version, _ = datos
+        # El Accept elige la representación (JSON por fila o columnar)
+        clave = f"{usuario_id}:{version}:{request.get_full_path()}:{request.headers.get('Accept', '')}"
+        if extra:
+            clave += f':{extra(request)}'
+        return hashlib.sha256(clave.encode()).hexdigest()[:32]
+
+    def _etag(request, *args, **kwargs):
+        if not hasattr(request, '_etag_condicional'):
+            request._etag_condicional = _calcular(request)
+        return request._etag_condicional
+    return _etag
+
+
+def _last_modified(request, *args, **kwargs):
+    datos = _version_request(request)
+    return datos[2] if datos else None
+
+
+def respuesta_condicional(view=None, *, extra=None):
+    """
+    Decorador para GETs de la API que dependen solo de los datos del usuario.
+    Usar con ninja.decorators.decorate_view.
+
+    Agrega ETag y Last-Modified, responde 304 a If-None-Match / If-Modified-Since
+    sin ejecutar el endpoint y marca la respuesta como privada y revalidable.
+
+    Si la respuesta depende además de otros datos (p. ej. tasas de cambio),
+    `extra(request)` devuelve un string que se suma al ETag; en ese caso no se
+    usa Last-Modified. Uso: decorate_view(respuesta_condicional(extra=f)).
+
+    Acepta también rutas async: el ETag y la versión se calculan en un thread.
+    """
+    if view is None:
+        return lambda view: respuesta_condicional(view, extra=extra)
+
+    etag_func = _etag_func(extra)
+    condicional = condition(
+        etag_func=etag_func,
+        last_modified_func=None if extra else _last_modified,
+    )(view)
+
+    def _cabeceras(response):
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Cookie', 'Authorization', 'Accept'))
+        return response
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper_async(request, *args, **kwargs):
+            # condition() calcula el ETag de forma sync: se calcula antes en un
+            # thread (sesión, token, versión y extra) y queda guardado en el request
+            await sync_to_async(etag_func)(request)
+            return _cabeceras(await condicional(request, *args, **kwargs))
+        return wrapper_async
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return _cabeceras(condicional(request, *args, **kwargs))
+
+    return wrapper
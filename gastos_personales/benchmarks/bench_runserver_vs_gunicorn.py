@@ -0,0 +1,77 @@
+"""
+Benchmark: runserver (modo dev) vs gunicorn con gunicorn.conf.py y master.settings_production.
+
+Mide una ruta de API y una página HTML completa con distintos niveles de
+concurrencia contra una base SQLite propia.
+
+Uso (desde gastos_personales/):
+    python benchmarks/bench_runserver_vs_gunicorn.py --gastos 200 --requests 300
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from carga import preparar_django, crear_datos, cookie_sesion, levantar_servidor, medir, imprimir_tabla
+
+PUERTO_RUNSERVER = 8201
+PUERTO_GUNICORN = 8202
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--gastos', type=int, default=200, help='Gastos del usuario de prueba')
+    parser.add_argument('--requests', type=int, default=300, help='Requests por escenario')
+    parser.add_argument('--concurrencia', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--workers', type=int, default=None, help='WEB_CONCURRENCY para gunicorn')
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.gettempdir(), 'bench_runserver_vs_gunicorn.sqlite3')
+    database_url = f'sqlite:///{db_path}'
+    preparar_django(database_url)
+    usuario = crear_datos(args.gastos)
+    headers = {'Cookie': cookie_sesion(usuario)}
+    gasto_id = usuario.gasto_set.values_list('id', flat=True).first()
+
+    env = {'DATABASE_URL': database_url}
+    runserver = levantar_servidor(
+        [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{PUERTO_RUNSERVER}'],
+        PUERTO_RUNSERVER, env,
+    )
+    env_gunicorn = {
+        **env,
+        'DJANGO_SETTINGS_MODULE': 'master.settings_production',
+        'GUNICORN_BIND': f'127.0.0.1:{PUERTO_GUNICORN}',
+        'GUNICORN_ACCESSLOG': '',
+    }
+    if args.workers:
+        env_gunicorn['WEB_CONCURRENCY'] = str(args.workers)
+    gunicorn = levantar_servidor(
+        ['gunicorn', 'master.wsgi:application', '-c', 'gunicorn.conf.py'],
+        PUERTO_GUNICORN, env_gunicorn,
+    )
+
+    escenarios = [
+        ('api detail', f'/api/gastos/{gasto_id}'),
+        ('api list', '/api/gastos/?year=2025'),
+        ('html /gastos/', '/gastos/'),
+    ]
+
+    filas = []
+    try:
+        for nombre, ruta in escenarios:
+            for concurrencia in args.concurrencia:
+                for modo, puerto in (('runserver', PUERTO_RUNSERVER), ('gunicorn', PUERTO_GUNICORN)):
+                    resultado = medir(f'http://127.0.0.1:{puerto}{ruta}', concurrencia, args.requests, headers)
+                    filas.append({'ruta': nombre, 'modo': modo, 'clientes': concurrencia, **resultado})
+    finally:
+        runserver.terminate()
+        gunicorn.terminate()
+
+    imprimir_tabla(filas, ['ruta', 'modo', 'clientes', 'rps', 'p50_ms', 'p99_ms', 'errores'])
+
+
+if __name__ == '__main__':
+    main()
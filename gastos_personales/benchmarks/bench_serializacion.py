@@ -0,0 +1,98 @@
+"""
+Benchmark: GET /api/gastos/ con 10k filas por los distintos caminos de
+serialización.
+
+- schema + json:   instancias del ORM, resolve_* y validación pydantic por
+                   fila, renderizado con el JSONRenderer estándar de Ninja
+- schema + orjson: igual, con el ORJSONRenderer (api/renderers.py)
+- values + orjson: API_VALUES_FAST_PATH (apps/utils/serializacion.py)
+- columnar:        Accept: application/vnd.spendwise.columnar+json
+- msgpack:         Accept: application/x-msgpack (si msgpack está instalado)
+
+Corre en proceso con el Client de Django (sin red ni servidor), así la
+diferencia medida es solo consulta + serialización.
+
+Uso (desde gastos_personales/):
+    python benchmarks/bench_serializacion.py --filas 10000 --repeticiones 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from carga import cookie_sesion, crear_datos, imprimir_tabla, preparar_django
+
+
+def medir_variante(client, repeticiones, accept):
+    client.get('/api/gastos/', HTTP_ACCEPT=accept)  # calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        response = client.get('/api/gastos/', HTTP_ACCEPT=accept)
+        tiempos.append(time.perf_counter() - inicio)
+        assert response.status_code == 200, response.status_code
+    return statistics.median(tiempos), response.content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=10000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        preparar_django(f'sqlite:///{os.path.join(tmp, "bench.sqlite3")}')
+
+        from django.conf import settings
+        from django.test import Client
+        from ninja.renderers import JSONRenderer
+        from api.api import api
+        from api.renderers import ORJSONRenderer
+        from apps.utils import serializacion
+
+        usuario = crear_datos(args.filas)
+        client = Client()
+        nombre, valor = cookie_sesion(usuario).split('=', 1)
+        client.cookies[nombre] = valor
+
+        json_ = serializacion.MEDIA_JSON
+        variantes = [
+            ('schema + json', JSONRenderer(), False, json_),
+            ('schema + orjson', ORJSONRenderer(), False, json_),
+            ('values + orjson', ORJSONRenderer(), True, json_),
+            ('columnar', ORJSONRenderer(), False, serializacion.MEDIA_COLUMNAR),
+        ]
+        if serializacion.msgpack:
+            variantes.append(('msgpack', ORJSONRenderer(), False, serializacion.MEDIA_MSGPACK))
+        renderer_original = api.renderer
+        filas, base, contenido_base = [], None, None
+        try:
+            for nombre_variante, renderer, fast_path, accept in variantes:
+                api.renderer = renderer
+                settings.API_VALUES_FAST_PATH = fast_path
+                mediana, contenido = medir_variante(client, args.repeticiones, accept)
+                base = base or mediana
+                # Los formatos columnares tienen otra forma: no se comparan
+                datos = json.loads(contenido) if accept == json_ else None
+                contenido_base = contenido_base or datos
+                filas.append({
+                    'variante': nombre_variante,
+                    'p50_ms': round(mediana * 1000, 1),
+                    'speedup': f'{base / mediana:.2f}x',
+                    'bytes': len(contenido),
+                    'mismos_datos': datos == contenido_base if datos else '-',
+                })
+        finally:
+            api.renderer = renderer_original
+
+    print(f'GET /api/gastos/ con {args.filas} filas, mediana de {args.repeticiones} requests\n')
+    imprimir_tabla(filas, ['variante', 'p50_ms', 'speedup', 'bytes', 'mismos_datos'])
+
+
+if __name__ == '__main__':
+    main()
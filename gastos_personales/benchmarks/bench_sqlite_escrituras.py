@@ -0,0 +1,116 @@
+"""
+Benchmark: N hilos escritores creando Gastos en SQLite, con y sin el perfil
+de performance (WAL + synchronous=NORMAL + busy_timeout + BEGIN IMMEDIATE).
+
+Cada perfil corre en un subproceso propio (los settings se leen al iniciar
+Django) contra un archivo SQLite nuevo. Cada escritura imita una request:
+una transacción que verifica duplicados y crea el gasto.
+
+Uso (desde gastos_personales/):
+    python benchmarks/bench_sqlite_escrituras.py --hilos 8 --escrituras 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from carga import imprimir_tabla
+
+PERFILES = {
+    'default': {'SQLITE_TUNING': 'False'},
+    'optimizado': {'SQLITE_TUNING': 'True'},
+}
+
+
+def escritor(usuario, categoria, n, resultados):
+    from django.db import connection, transaction, OperationalError
+    from apps.gasto.models import Gasto
+
+    ok = errores = 0
+    for i in range(n):
+        try:
+            with transaction.atomic():
+                monto = threading.get_ident() % 1000 + i
+                if not Gasto.objects.filter(usuario=usuario, categoria=categoria, monto=monto).exists():
+                    Gasto.objects.create(
+                        usuario=usuario, categoria=categoria, moneda=usuario.moneda,
+                        fecha='2024-01-01', monto=monto, descripcion='bench'
+                    )
+            ok += 1
+        except OperationalError:
+            errores += 1
+    connection.close()
+    resultados.append((ok, errores))
+
+
+def correr_perfil(hilos, escrituras):
+    """Se ejecuta dentro del subproceso: Django ya configurado con el perfil elegido."""
+    from carga import preparar_django, crear_datos
+    preparar_django(os.environ['DATABASE_URL'])
+    from apps.categoria.models import Categoria
+
+    usuario = crear_datos(0)
+    categoria = Categoria.objects.get(usuario=usuario)
+    from django.db import connection
+    connection.close()
+
+    resultados = []
+    threads = [
+        threading.Thread(target=escritor, args=(usuario, categoria, escrituras, resultados))
+        for _ in range(hilos)
+    ]
+    inicio = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    transcurrido = time.perf_counter() - inicio
+
+    ok = sum(r[0] for r in resultados)
+    errores = sum(r[1] for r in resultados)
+    print(json.dumps({
+        'escrituras_ok': ok,
+        'locked': errores,
+        'escrituras_s': round(ok / transcurrido, 1),
+        'segundos': round(transcurrido, 2),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hilos', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--escrituras', type=int, default=200, help='Escrituras por hilo')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        correr_perfil(args.hilos[0], args.escrituras)
+        return
+
+    filas = []
+    for hilos in args.hilos:
+        for perfil, env in PERFILES.items():
+            db_path = os.path.join(tempfile.gettempdir(), f'bench_sqlite_{perfil}.sqlite3')
+            for sufijo in ('', '-wal', '-shm'):
+                if os.path.exists(db_path + sufijo):
+                    os.remove(db_path + sufijo)
+
+            salida = subprocess.run(
+                [sys.executable, __file__, '--worker', '--hilos', str(hilos), '--escrituras', str(args.escrituras)],
+                env={**os.environ, **env, 'DATABASE_URL': f'sqlite:///{db_path}'},
+                capture_output=True, text=True, check=True,
+            )
+            resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+            filas.append({'perfil': perfil, 'hilos': hilos, **resultado})
+
+    imprimir_tabla(filas, ['perfil', 'hilos', 'escrituras_ok', 'locked', 'escrituras_s', 'segundos'])
+
+
+if __name__ == '__main__':
+    main()
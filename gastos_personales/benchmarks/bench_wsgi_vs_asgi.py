@@ -0,0 +1,72 @@
+"""
+Benchmark: lecturas sync bajo WSGI (gunicorn) vs lecturas async bajo ASGI (uvicorn).
+
+Levanta los dos servidores con la misma cantidad de workers contra una base
+SQLite propia y mide throughput y latencia de las rutas de lectura con
+distintos niveles de concurrencia.
+
+Uso (desde gastos_personales/):
+    python benchmarks/bench_wsgi_vs_asgi.py --workers 2 --gastos 200 --requests 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from carga import preparar_django, crear_datos, cookie_sesion, levantar_servidor, medir, imprimir_tabla
+
+PUERTO_WSGI = 8101
+PUERTO_ASGI = 8102
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--gastos', type=int, default=200, help='Gastos del usuario de prueba')
+    parser.add_argument('--requests', type=int, default=500, help='Requests por escenario')
+    parser.add_argument('--concurrencia', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.gettempdir(), 'bench_wsgi_vs_asgi.sqlite3')
+    database_url = f'sqlite:///{db_path}'
+    preparar_django(database_url)
+    usuario = crear_datos(args.gastos)
+    headers = {'Cookie': cookie_sesion(usuario)}
+    gasto_id = usuario.gasto_set.values_list('id', flat=True).first()
+
+    env = {'DATABASE_URL': database_url}
+    wsgi = levantar_servidor(
+        ['gunicorn', 'master.wsgi:application', '--workers', str(args.workers),
+         '--bind', f'127.0.0.1:{PUERTO_WSGI}', '--log-level', 'warning'],
+        PUERTO_WSGI, env,
+    )
+    asgi = levantar_servidor(
+        ['uvicorn', 'master.asgi:application', '--workers', str(args.workers),
+         '--port', str(PUERTO_ASGI), '--lifespan', 'off', '--no-access-log', '--log-level', 'warning'],
+        PUERTO_ASGI, env,
+    )
+
+    escenarios = [
+        ('list', '/api/gastos/?year=2025', '/api/async/gastos/?year=2025'),
+        ('detail', f'/api/gastos/{gasto_id}', f'/api/async/gastos/{gasto_id}'),
+        ('categorias', '/api/categorias/', '/api/async/categorias/'),
+    ]
+
+    filas = []
+    try:
+        for nombre, ruta_sync, ruta_async in escenarios:
+            for concurrencia in args.concurrencia:
+                for modo, puerto, ruta in (('wsgi-sync', PUERTO_WSGI, ruta_sync), ('asgi-async', PUERTO_ASGI, ruta_async)):
+                    resultado = medir(f'http://127.0.0.1:{puerto}{ruta}', concurrencia, args.requests, headers)
+                    filas.append({'ruta': nombre, 'modo': modo, 'clientes': concurrencia, **resultado})
+    finally:
+        wsgi.terminate()
+        asgi.terminate()
+
+    imprimir_tabla(filas, ['ruta', 'modo', 'clientes', 'rps', 'p50_ms', 'p99_ms', 'errores'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Utilidades compartidas por los benchmarks.
+Ubicación: benchmarks/carga.py
+
+- preparar_django: configura Django contra una base de datos propia del benchmark
+- crear_datos: usuario, categoría y N gastos de prueba
+- cookie_sesion: cookie de sesión válida para ese usuario (sin pasar por el login)
+- levantar_servidor: arranca un servidor (runserver, gunicorn, uvicorn) y espera a que escuche
+- medir: genera carga HTTP concurrente y devuelve throughput y latencias
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import requests
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def preparar_django(database_url, settings_module='master.settings'):
+    """Configura Django para usar `database_url` y aplica las migraciones."""
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+
+    import django
+    from django.core.management import call_command
+    django.setup()
+    call_command('migrate', verbosity=0)
+
+
+def crear_datos(n_gastos, username='bench'):
+    """Crea (o reutiliza) el usuario del benchmark con `n_gastos` gastos."""
+    from django.contrib.auth import get_user_model
+    from apps.usuario.models import Moneda
+    from apps.categoria.models import Categoria
+    from apps.gasto.models import Gasto
+
+    User = get_user_model()
+    usuario, creado = User.objects.get_or_create(
+        username=username, defaults={'email': f'{username}@bench.local'}
+    )
+    if creado:
+        usuario.moneda = Moneda.objects.create(usuario=usuario, moneda='Peso Argentino', abreviatura='ARS')
+        usuario.save()
+
+    categoria, _ = Categoria.objects.get_or_create(usuario=usuario, nombre='Bench')
+    faltantes = n_gastos - Gasto.objects.filter(usuario=usuario).count()
+    hoy = date.today()
+    Gasto.objects.bulk_create(
+        [
+            Gasto(
+                usuario=usuario,
+                categoria=categoria,
+                moneda=usuario.moneda,
+                fecha=hoy - timedelta(days=i % 730),
+                monto=Decimal(i % 5000) + Decimal('0.50'),
+                descripcion=f'Gasto de prueba {i}',
+            )
+            for i in range(max(faltantes, 0))
+        ],
+        batch_size=1000,
+    )
+    return usuario
+
+
+def cookie_sesion(usuario):
+    """Crea una sesión autenticada para `usuario` y devuelve el header Cookie."""
+    from django.conf import settings
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+    from django.contrib.sessions.backends.db import SessionStore
+
+    session = SessionStore()
+    session[SESSION_KEY] = str(usuario.pk)
+    session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+    session[HASH_SESSION_KEY] = usuario.get_session_auth_hash()
+    session.create()
+    return f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+
+
+def levantar_servidor(cmd, puerto, env=None, timeout=30):
+    """Arranca `cmd` desde el directorio del proyecto y espera a que acepte conexiones."""
+    proceso = subprocess.Popen(
+        cmd,
+        cwd=PROJECT_DIR,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            with socket.create_connection(('127.0.0.1', puerto), timeout=0.5):
+                return proceso
+        except OSError:
+            if proceso.poll() is not None:
+                raise RuntimeError(f'El servidor terminó al arrancar: {" ".join(cmd)}')
+            time.sleep(0.2)
+    proceso.terminate()
+    raise RuntimeError(f'El servidor no respondió en {timeout}s: {" ".join(cmd)}')
+
+
+def medir(url, concurrencia, total, headers=None, metodo='GET', cuerpo=None):
+    """
+    Envía `total` requests a `url` con `concurrencia` clientes en paralelo.
+
+    Returns:
+        dict: {'rps', 'p50_ms', 'p99_ms', 'errores'}
+    """
+    locales = threading.local()
+    latencias = []
+    errores = 0
+    lock = threading.Lock()
+
+    def una_request(_):
+        nonlocal errores
+        if not hasattr(locales, 'session'):
+            locales.session = requests.Session()
+        inicio = time.perf_counter()
+        try:
+            r = locales.session.request(metodo, url, headers=headers, json=cuerpo, timeout=60)
+            ok = r.status_code < 400
+        except requests.RequestException:
+            ok = False
+        duracion = time.perf_counter() - inicio
+        with lock:
+            latencias.append(duracion)
+            if not ok:
+                errores += 1
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        list(pool.map(una_request, range(total)))
+    transcurrido = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'rps': round(total / transcurrido, 1),
+        'p50_ms': round(statistics.median(latencias) * 1000, 2),
+        'p99_ms': round(latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))] * 1000, 2),
+        'errores': errores,
+    }
+
+
+def imprimir_tabla(filas, columnas):
+    """Imprime una lista de dicts como tabla de texto alineada."""
+    anchos = {c: max(len(c), *(len(str(f[c])) for f in filas)) for c in columnas}
+    print('  '.join(c.ljust(anchos[c]) for c in columnas))
+    print('  '.join('-' * anchos[c] for c in columnas))
+    for fila in filas:
+        print('  '.join(str(fila[c]).ljust(anchos[c]) for c in columnas))
@@ -0,0 +1,32 @@
+"""
+Configuración de gunicorn para producción (SERVER_MODE=production en entrypoint.sh).
+
+Todas las opciones se pueden ajustar con variables de entorno sin tocar este archivo.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Workers: (2 x núcleos) + 1 salvo que se indique WEB_CONCURRENCY
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+# Importa Django una sola vez en el master: los workers comparten ese código
+# vía copy-on-write y arrancan más rápido
+preload_app = True
+
+# Reciclado de workers para acotar fugas de memoria; el jitter evita que se
+# reinicien todos a la vez
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Timeouts
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Logs a stdout/stderr para que los recoja Docker (GUNICORN_ACCESSLOG vacío lo desactiva)
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
@@ -68,13 +68,16 @@ AUTH_USER_MODEL = 'usuario.Usuario'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # WhiteNoise responde los estáticos (ya precomprimidos) antes del resto
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # gzip/brotli de respuestas dinámicas (ver apps/utils/compresion.py)
+    'apps.utils.compresion.CompresionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
 ROOT_URLCONF = 'master.urls'
@@ -106,12 +109,72 @@ WSGI_APPLICATION = 'master.wsgi.application'
 #         'NAME': BASE_DIR / 'db.sqlite3',
 #     }
 # }
+# Conexiones persistentes: cada proceso reutiliza su conexión durante
+# DB_CONN_MAX_AGE segundos y la valida antes de reutilizarla (health checks)
 DATABASES = {
     'default': dj_database_url.config(
-        default='sqlite:///db.sqlite3'
+        default='sqlite:///db.sqlite3',
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        conn_health_checks=os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     )
 }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # Pool de conexiones en proceso (psycopg 3 + psycopg-pool, ver requirements.txt)
+    if os.environ.get('DB_POOL', 'False') == 'True':
+        # El pool reemplaza a las conexiones persistentes
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        }
+
+    # Detrás de pgbouncer en modo transaction no hay cursores del lado del servidor
+    # (QuerySet.iterator() los usa por defecto en Postgres)
+    if os.environ.get('DB_PGBOUNCER', 'False') == 'True':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Particionado por fecha de Gasto/Ingreso: '' (desactivado), 'year' o 'month'.
+# Solo aplica en Postgres (ver apps/utils/particiones.py)
+DB_PARTITIONING = os.environ.get('DB_PARTITIONING', '')
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3' and os.environ.get('SQLITE_TUNING', 'True') == 'True':
+    # BEGIN IMMEDIATE: las transacciones toman el lock de escritura al empezar y,
+    # si está ocupado, esperan hasta `timeout` en lugar de fallar con
+    # "database is locked" a mitad de la transacción
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000')) / 1000,
+    })
+
+# Réplica de lectura opcional: las requests GET leen de 'replica' salvo que el
+# cliente haya escrito hace menos de REPLICA_PIN_SECONDS (ver apps/utils/replicas.py)
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '5'))
+REPLICA_RETRY_SECONDS = int(os.environ.get('REPLICA_RETRY_SECONDS', '10'))
+
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DATABASES['default']['CONN_MAX_AGE'],
+        conn_health_checks=DATABASES['default']['CONN_HEALTH_CHECKS'],
+    )
+    # En tests la réplica apunta a la misma base de test que el primario
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['apps.utils.replicas.ReplicaRouter']
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.contrib.auth.middleware.AuthenticationMiddleware') + 1, 'apps.utils.replicas.ReplicaMiddleware')
+
+# PRAGMAs aplicados a cada conexión SQLite nueva (ver apps/utils/sqlite.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',        # lectores y un escritor en paralelo
+    'synchronous': 'NORMAL',      # en WAL es seguro y evita un fsync por commit
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000')),
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_KB', '65536')),  # negativo = KiB
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    'temp_store': 'MEMORY',
+} if os.environ.get('SQLITE_TUNING', 'True') == 'True' else {}
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -120,6 +183,44 @@ CACHES = {
     }
 }
 
+# Tokens de la API: LRU en proceso + cache compartida (ver apps/utils/api_tokens.py).
+# Con varios workers conviene una cache compartida (Redis/Memcached) en CACHES
+API_TOKEN_LRU_SIZE = int(os.environ.get('API_TOKEN_LRU_SIZE', '1024'))
+API_TOKEN_LRU_TTL = int(os.environ.get('API_TOKEN_LRU_TTL', '30'))
+API_TOKEN_CACHE_TIMEOUT = int(os.environ.get('API_TOKEN_CACHE_TIMEOUT', '300'))
+
+# Listados de la API proyectados con values() y sin validación por fila
+# (ver apps/utils/serializacion.py)
+API_VALUES_FAST_PATH = os.environ.get('API_VALUES_FAST_PATH', 'False') == 'True'
+
+# Compresión de respuestas dinámicas (ver apps/utils/compresion.py)
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4'))
+
+# Días que se conservan los registros de bajas para GET /api/sync; un cursor
+# más viejo recibe un snapshot completo (ver apps/utils/sincronizacion.py)
+SYNC_RETENCION_DIAS = int(os.environ.get('SYNC_RETENCION_DIAS', '90'))
+
+# Límite de requests por cliente (token bucket en CACHES, ver apps/utils/limites.py).
+# alcance: (capacidad de la ráfaga, segundos para recuperarla completa)
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True') == 'True'
+RATE_LIMITS = {
+    'api': (int(os.environ.get('RATE_LIMIT_API', '120')), 60),
+    'api_pesada': (int(os.environ.get('RATE_LIMIT_API_PESADA', '10')), 60),
+    'login': (int(os.environ.get('RATE_LIMIT_LOGIN', '10')), 300),
+    'reenvio_verificacion': (3, 600),
+}
+# Detrás de un proxy confiable: encabezado con la IP del cliente (p. ej. HTTP_X_FORWARDED_FOR)
+RATE_LIMIT_IP_HEADER = os.environ.get('RATE_LIMIT_IP_HEADER') or None
+
+# Respuestas guardadas para reintentos con Idempotency-Key (ver apps/utils/idempotencia.py)
+IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', str(24 * 3600)))
+IDEMPOTENCY_ESPERA = int(os.environ.get('IDEMPOTENCY_ESPERA', '10'))
+
+# Búsqueda de texto: 'auto' usa el índice del motor (FTS5 en SQLite, tsvector
+# en Postgres); 'icontains' lo ignora (ver apps/utils/busqueda.py)
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,64 @@
+"""
+Settings de producción.
+
+Extiende master/settings.py y se activa con
+DJANGO_SETTINGS_MODULE=master.settings_production (lo hace entrypoint.sh
+cuando SERVER_MODE=production).
+
+SECRET_KEY y ALLOWED_HOSTS son obligatorias: sin ellas el proceso no arranca
+(nada de caer en la clave de desarrollo ni en ALLOWED_HOSTS = '*').
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, SECRET_KEY as SECRET_KEY_DESARROLLO, TEMPLATES
+
+
+def _requerida(nombre):
+    valor = os.environ.get(nombre, '').strip()
+    if not valor:
+        raise ImproperlyConfigured(f'Falta la variable de entorno {nombre} (obligatoria en producción)')
+    return valor
+
+
+DEBUG = False
+
+SECRET_KEY = _requerida('SECRET_KEY')
+if SECRET_KEY == SECRET_KEY_DESARROLLO or SECRET_KEY.startswith('django-insecure'):
+    raise ImproperlyConfigured('SECRET_KEY de producción no puede ser la clave de desarrollo')
+
+# Lista separada por comas, p. ej. "gastos.example.com,www.gastos.example.com"
+ALLOWED_HOSTS = [host.strip() for host in _requerida('ALLOWED_HOSTS').split(',') if host.strip()]
+
+# Las conexiones persistentes / el pool se configuran en settings.py (DB_CONN_MAX_AGE, DB_POOL)
+
+# Templates compilados una sola vez por proceso (el loader cacheado requiere APP_DIRS=False)
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# Con DEBUG apagado WhiteNoise sirve los estáticos desde STATIC_ROOT (collectstatic)
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic genera nombres con hash del contenido (output.3f2a9c.css) y
+# versiones .gz y .br (brotli requiere el paquete `brotli`). WhiteNoise sirve
+# la variante comprimida según Accept-Encoding y, como el nombre cambia con el
+# contenido, responde los archivos con hash con Cache-Control de un año e immutable
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
@@ -0,0 +1,141 @@
+/*
+ * Filtros y paginación de los listados sin recargar la página.
+ * Ubicación: static/js/fragmentos.js
+ *
+ * El contenedor marcado con data-fragmento se reemplaza con la respuesta de
+ * la misma URL con ?fragmento=tabla (solo la tabla y la paginación; ver
+ * apps/utils/fragmentos.py). Lo usan el form indicado en data-fragmento-form
+ * y los links con data-fragmento-link. La URL visible se actualiza con
+ * history.pushState, así que atrás/adelante y recargar siguen funcionando.
+ *
+ * Scroll infinito: el link data-fragmento-mas (ver layout/cargar_mas.html)
+ * pide la página siguiente por cursor; sus filas se agregan al [data-filas]
+ * actual y su bloque [data-paginacion] reemplaza al anterior. El link se
+ * activa solo cuando entra en pantalla.
+ */
+(function () {
+  function urlVisible(url) {
+    var u = new URL(url, window.location.href);
+    u.searchParams.delete('fragmento');
+    return u.href;
+  }
+
+  function cargarFragmento(contenedor, url, agregarAlHistorial) {
+    var u = new URL(url, window.location.href);
+    u.searchParams.set('fragmento', 'tabla');
+    contenedor.setAttribute('aria-busy', 'true');
+    contenedor.classList.add('opacity-60');
+
+    return fetch(u.href, {
+      headers: { 'X-Requested-With': 'XMLHttpRequest' },
+      credentials: 'same-origin'
+    })
+    .then(function (r) {
+      if (!r.ok) throw new Error(r.status);
+      return r.text();
+    })
+    .then(function (html) {
+      contenedor.innerHTML = html;
+      if (agregarAlHistorial) history.pushState({ fragmento: true }, '', urlVisible(url));
+      contenedor.dispatchEvent(new CustomEvent('fragmento:cargado', { bubbles: true }));
+    })
+    .catch(function () {
+      // Sin fragmento (sesión vencida, error): navegación normal
+      window.location.href = urlVisible(url);
+    })
+    .finally(function () {
+      contenedor.removeAttribute('aria-busy');
+      contenedor.classList.remove('opacity-60');
+    });
+  }
+
+  function cargarMas(contenedor, link) {
+    if (link.dataset.cargando) return;
+    link.dataset.cargando = 'true';
+    var u = new URL(link.href, window.location.href);
+    u.searchParams.set('fragmento', 'tabla');
+
+    return fetch(u.href, {
+      headers: { 'X-Requested-With': 'XMLHttpRequest' },
+      credentials: 'same-origin'
+    })
+    .then(function (r) {
+      if (!r.ok) throw new Error(r.status);
+      return r.text();
+    })
+    .then(function (html) {
+      var plantilla = document.createElement('template');
+      plantilla.innerHTML = html;
+
+      var filas = contenedor.querySelector('[data-filas]');
+      var nuevas = plantilla.content.querySelector('[data-filas]');
+      while (filas && nuevas && nuevas.firstElementChild) {
+        filas.appendChild(nuevas.firstElementChild);
+      }
+
+      var paginacion = contenedor.querySelector('[data-paginacion]');
+      var siguiente = plantilla.content.querySelector('[data-paginacion]');
+      if (paginacion && siguiente) paginacion.replaceWith(siguiente);
+      contenedor.dispatchEvent(new CustomEvent('fragmento:cargado', { bubbles: true }));
+    })
+    .catch(function () {
+      window.location.href = link.href;
+    });
+  }
+
+  function observarSiguiente(contenedor, observador) {
+    observador.disconnect();
+    var link = contenedor.querySelector('a[data-fragmento-mas]');
+    if (link) observador.observe(link);
+  }
+
+  window.cargarFragmento = cargarFragmento;
+
+  document.addEventListener('DOMContentLoaded', function () {
+    var contenedor = document.querySelector('[data-fragmento]');
+    if (!contenedor) return;
+
+    var form = document.getElementById(contenedor.dataset.fragmentoForm);
+    if (form) {
+      form.addEventListener('submit', function (e) {
+        e.preventDefault();
+        var url = new URL(form.action, window.location.href);
+        var params = new URLSearchParams();
+        new FormData(form).forEach(function (valor, nombre) {
+          if (valor !== '') params.append(nombre, valor);
+        });
+        url.search = params.toString();
+        cargarFragmento(contenedor, url.href, true);
+      });
+    }
+
+    contenedor.addEventListener('click', function (e) {
+      var mas = e.target.closest('a[data-fragmento-mas]');
+      if (mas) {
+        e.preventDefault();
+        cargarMas(contenedor, mas);
+        return;
+      }
+      var link = e.target.closest('a[data-fragmento-link]');
+      if (!link) return;
+      e.preventDefault();
+      cargarFragmento(contenedor, link.href, true);
+    });
+
+    if ('IntersectionObserver' in window) {
+      var observador = new IntersectionObserver(function (entradas) {
+        entradas.forEach(function (entrada) {
+          if (entrada.isIntersecting) cargarMas(contenedor, entrada.target);
+        });
+      }, { rootMargin: '200px' });
+      contenedor.addEventListener('fragmento:cargado', function () {
+        observarSiguiente(contenedor, observador);
+      });
+      observarSiguiente(contenedor, observador);
+    }
+
+    window.addEventListener('popstate', function () {
+      cargarFragmento(contenedor, window.location.href, false);
+    });
+  });
+})();